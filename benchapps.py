@@ -6,7 +6,7 @@
 
 	Execution function for each algorithm must be named "exec<Algname>" and have the following signature:
 
-	def execAlgorithm(execpool, netfile, asym, timeout, pathid='', selfexec=False):
+	def execAlgorithm(execpool, netfile, asym, timeout, pathid='', selfexec=False, apptask=None):
 		Execute the algorithm (stub)
 
 		execpool  - execution pool to perform execution of current task
@@ -16,6 +16,8 @@
 		pathid  - path id of the net to distinguish nets with the same name located in different dirs.
 			Note: pathid is prepended with the separator symbol
 		selfexec  - current execution is the external or internal self call
+		apptask  - task of the algorithm execution on the network embracing all the jobs, which
+			constrains them by its time budget (see Task), or None
 
 		return  - number of executions (jobs) made
 
@@ -31,10 +33,13 @@ import glob
 import sys
 import inspect  # To automatically fetch algorithm name
 import traceback  # Stacktrace
+import platform  # Python implementation to execute the Python algorithms in the forked pool process
+import math  # Fitting of the execution time models of the algorithms
 
 from datetime import datetime
 
 from contrib.mpepool import *
+from contrib.mpepool import _RCPOWNRSS
 from benchutils import *
 
 from sys import executable as PYEXEC  # Full path to the current Python interpreter
@@ -51,6 +56,457 @@ from benchevals import _EXTAGGRESEXT
 _EXTLOG = '.log'
 _EXTCLNODES = '.cnl'  # Clusters (Communities) Nodes Lists
 _APREFIX = 'exec'  # Prefix of the executing application / algorithm
+# Max data segment (heap) limit of each app in Mb to not exhaust the memory of the other workers,
+# 75% of the physical memory, which is applied to the apps having unknown memory consumption
+_DATALIM = 0.75 * os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 1024. ** 2
+_DATALIMMUL = 4  # Multiple of the expected peak RSS of the app to be its data segment limit
+# Min data segment limit in Mb, which absorbs the reserved but not touched memory (allocation arenas of the threads)
+_DATALIMMIN = 1024
+
+# Execution time per link in sec of the algorithms on the networks having unknown execution time,
+# which is used only to order the jobs having no history by the size of the networks
+_LINKCOST = 1E-5
+# Min adaptive timeout in sec of each job, which absorbs the startup overhead and timing noise of the tiny jobs
+_TIMEOUTMIN = 60
+# Min multiple of the execution time of the former execution of the task terminated by the timeout to be its timeout
+_TIMEOUTKILLMUL = 2
+
+_rcps = {}  # Resources consumption profiles of the former executions of the algorithms:  algname: rcp
+_rcpbasemems = {}  # Max RSS of the algorithms on the base networks:  algname: {basename: rssmem}
+_rcpbasetimes = {}  # Max execution time of the algorithms on the base networks:  algname: {basename: exectime}
+# Execution time of the latest executions of the tasks terminated by the timeout:  algname: {taskname: exectime}
+_rcptimeouts = {}
+_netsizes = {}  # Sizes of the networks:  netfile: (nodes, links)
+_baselinks = {}  # Max number of links of the base networks:  basename: links
+_timemodels = {}  # Execution time models of the algorithms:  algname: (sizesnum, model), see timeModel()
+_timeoutmul = 0  # Multiple of the expected execution time to be the timeout of the job, 0 means the global timeout
+
+# Note: igraph-python is a Cython wrapper around C igraph lib. Calls are much faster on CPython than on PyPy,
+# so the Python algorithms are executed in the forked pool process only when it is CPython
+_PYFORK = platform.python_implementation() == 'CPython'
+# Modules of the Python algorithms to be preloaded by the execution pool:  algname: module
+PYMODULES = {'louvain_igraph': 'algorithms.louvain_igraph', 'randcommuns': 'algorithms.randcommuns'} if _PYFORK else {}
+
+
+def loadRcp(algname):
+	"""Load resources consumption profile of the algorithm from the former executions
+
+	algname  - name of the algorithm
+
+	return  - dict of the latest measures of each task (see parseRcp()), the execution
+		time of the tasks terminated by the timeout is loaded to _rcptimeouts
+	"""
+	rcp = _rcps.get(algname)
+	if rcp is not None:
+		return rcp
+	algesfile = ''.join((_RESDIR, algname, _EXTEXECTIME))
+	timeouts = {}
+	try:
+		with open(algesfile, 'r') as aest:
+			rcp = parseRcp(aest, algesfile, timeouts)
+	except IOError:
+		rcp = {}  # The algorithm has not been executed yet
+	_rcps[algname] = rcp
+	_rcptimeouts[algname] = timeouts
+	return rcp
+
+
+def parseRcp(rows, rcpfile='', timeouts=None):
+	"""Parse resources consumption profile of the algorithm
+
+	rows  - rows of the resources consumption profile (.rcp file)
+	rcpfile  - name of the resources consumption profile to report the invalid rows
+	timeouts  - dict to be filled with the execution time of the tasks, which latest
+		execution is terminated by the timeout:  taskname: exectime
+
+	return  - dict of the latest measures of each task:  taskname: (exectime, cputime, rssmem),
+		rssmem is 0 (unknown) for the rows preceding _RCPOWNRSS, which include the RSS of the pool
+
+	>>> timeouts = {}
+	>>> rcp = parseRcp(('# ExecTime(sec)	CPU_time(sec)	CPU_usr(sec)	CPU_kern(sec)	RSS_RAM_peak(Mb)	TaskName\\n'
+	... , '2.5	2.1	2.0	0.1	309.0	1K10^1!k7.1#1\\n', _RCPOWNRSS
+	... , '# timeout	60.5	60.1	60.0	0.1	9.0	5K20^1\\n', '0.7	0.6	0.5	0.1	9.5	2K5\\n'
+	... , '# timeout	60.2	60.1	60.0	0.1	9.0	2K5\\n', '1.5	1.2	1.1	0.1	7.25	1K10^1!k7.1#1\\n'
+	... , '# timeout	60.5	60.1	60.0	0.1	9.0	1K10^1!k7.1#1\\n', '9.5	9.2	9.1	0.1	7.25	1K10^1!k7.1#1\\n')
+	... , timeouts=timeouts)
+	>>> rcp['1K10^1!k7.1#1'], rcp['2K5'], sorted(timeouts.items())
+	((9.5, 9.2, 7.25), (0.7, 0.6, 9.5), [('2K5', 60.2), ('5K20^1', 60.5)])
+	>>> parseRcp(('2.5	2.1	2.0	0.1	309.0	2K5\\n',))['2K5']
+	(2.5, 2.1, 0)
+	>>> '5K20^1' in rcp, parseRcp(('', '  \\n'))
+	(False, {})
+	"""
+	rcp = {}
+	ownrss = False  # The rows have the own RSS peak of the algorithm
+	for ln in rows:
+		if ln == _RCPOWNRSS:
+			ownrss = True
+		ln = ln.lstrip()
+		# Skip comments, including the jobs terminated by the execution pool
+		if not ln or ln[0] == '#':
+			if timeouts is not None and ln.startswith('# timeout'):
+				fields = ln[1:].split(None, 6)
+				if len(fields) == 7:
+					timeouts[fields[6].rstrip()] = float(fields[1])
+			continue
+		fields = ln.split(None, 5)
+		if len(fields) != 6:
+			print('WARNING, invalid format of the resource consumption file "{}": {}'
+				.format(rcpfile, ln), file=sys.stderr)
+			continue
+		name = fields[5].rstrip()
+		rcp[name] = (float(fields[0]), float(fields[1]), float(fields[4]) if ownrss else 0)
+		if timeouts is not None:
+			timeouts.pop(name, None)
+	return rcp
+
+
+def expectedMem(algname, taskname):
+	"""Expected peak RSS of the algorithm on the task according to the former executions
+
+	algname  - name of the algorithm
+	taskname  - name of the task in the resources consumption profile, which includes
+		instance, shuffle, parameters and pathid suffixes
+
+	return  - RSS in Mb: the former value for this task if exists, otherwise the max value
+		among the tasks having the same base network, or 0 if unknown. The former values
+		including the RSS of the pool are unknown (see loadRcp())
+	"""
+	rcp = loadRcp(algname)
+	task = rcp.get(taskname)
+	if task and task[2]:
+		return task[2]
+	basemems = _rcpbasemems.get(algname)
+	if basemems is None:
+		basemems = {}
+		for name, task in rcp.iteritems():
+			basename = delPathSuffix(name, True)
+			if basemems.get(basename, 0) < task[2]:
+				basemems[basename] = task[2]
+		_rcpbasemems[algname] = basemems
+	return basemems.get(delPathSuffix(taskname, True), 0)
+
+
+def netSize(netfile):
+	"""Size of the network
+
+	The size is taken from the header of the network file ("# Nodes: <N> Links: <M>",
+	where Edges or Arcs can be used instead of Links) if exists, otherwise links are
+	counted as the non-empty lines of the file body.
+
+	netfile  - the network file
+
+	return  - nodes, links of the network; nodes are 0 if unknown, (0, 0) if the file is absent
+
+	>>> import tempfile
+	>>> with tempfile.NamedTemporaryFile(suffix='.nsa') as fnet:
+	... 	fnet.write('# Nodes: 4, Edges: 3\\n0 1\\n1 2\\n2 3\\n')
+	... 	fnet.flush()
+	... 	netSize(fnet.name)
+	(4, 3)
+	>>> with tempfile.NamedTemporaryFile(suffix='.nsa') as fnet:
+	... 	fnet.write('# Unweighted network\\n\\n0 1\\n1 2 0.5\\n\\n2 0\\n')
+	... 	fnet.flush()
+	... 	netSize(fnet.name)
+	(0, 3)
+	>>> netSize('/nonexistent/1K10.nsa')
+	(0, 0)
+	"""
+	size = _netsizes.get(netfile)
+	if size is not None:
+		return size
+	nodes = 0
+	links = 0
+	try:
+		with open(netfile, 'r') as fnet:
+			body = False  # Whether the body of the network should be counted
+			# Parse the header
+			for ln in fnet:
+				ln = ln.strip()
+				if not ln:
+					continue
+				if ln[0] != '#':
+					body = not links
+					links = links or 1
+					break
+				ln = ln.replace(':', ': ').replace(',', ' ').split()
+				for i, mark in enumerate(ln[:-1]):
+					if mark not in ('Nodes:', 'Links:', 'Edges:', 'Arcs:'):
+						continue
+					try:
+						val = int(ln[i + 1])
+					except ValueError:
+						continue
+					if mark == 'Nodes:':
+						nodes = val
+					else:
+						links = val
+			# Count the links
+			if body:
+				for ln in fnet:
+					if ln.strip():
+						links += 1
+	except IOError:
+		pass  # The network is formed later
+	size = nodes, links
+	_netsizes[netfile] = size
+	basename = delPathSuffix(os.path.splitext(os.path.split(netfile)[1])[0], True)
+	if _baselinks.get(basename, 0) < links:
+		_baselinks[basename] = links
+	return size
+
+
+def expectedCost(algname, taskname, netfile):
+	"""Expected execution time of the algorithm on the task to start the longest jobs first
+
+	algname  - name of the algorithm
+	taskname  - name of the task in the resources consumption profile, which includes
+		instance, shuffle, parameters and pathid suffixes
+	netfile  - the input network of the task
+
+	return  - execution time in sec: the former value for this task if exists, otherwise
+		the max value among the tasks having the same base network, otherwise the value
+		estimated by the number of links in the network
+
+	>>> _rcps['_algtest'] = {'1K10^1': (4., 3., 0), '1K10^2': (6., 5., 0)}
+	>>> expectedCost('_algtest', '1K10^1', '1K10^1.nsa')
+	4.0
+	>>> expectedCost('_algtest', '1K10^3!k5', '1K10^3.nsa')
+	6.0
+	>>> _netsizes['_test/2K5.nsa'] = (2000, 150000)
+	>>> round(expectedCost('_algtest', '2K5', '_test/2K5.nsa'), 6)
+	1.5
+	>>> expectedCost('_algtest', '2K5', '/nonexistent/2K5.nsa')
+	0.0
+	>>> del _rcps['_algtest'], _rcpbasetimes['_algtest'], _netsizes['_test/2K5.nsa']
+	"""
+	rcp = loadRcp(algname)
+	task = rcp.get(taskname)
+	if task:
+		return task[0]
+	exectime = baseTimes(algname).get(delPathSuffix(taskname, True))
+	if exectime:
+		return exectime
+	return netSize(netfile)[1] * _LINKCOST
+
+
+def baseTimes(algname):
+	"""Max execution time of the algorithm on each base network according to the former executions
+
+	algname  - name of the algorithm
+
+	return  - dict:  basename: exectime
+	"""
+	basetimes = _rcpbasetimes.get(algname)
+	if basetimes is None:
+		basetimes = {}
+		for name, task in loadRcp(algname).iteritems():
+			basename = delPathSuffix(name, True)
+			if basetimes.get(basename, 0) < task[0]:
+				basetimes[basename] = task[0]
+		_rcpbasetimes[algname] = basetimes
+	return basetimes
+
+
+def timeModel(algname):
+	"""Execution time model of the algorithm as a function of the network links: time = a * links^b
+
+	The model is fitted by the least squares in the log-log scale on the max execution times
+	of the former executions on the base networks of the known size (see netSize()).
+	The exponent is at least 1, since the algorithms are at least linear by the links and
+	the underestimated time of the large networks would terminate them before the completion.
+
+	algname  - name of the algorithm
+
+	return  - (a, b) or None if there are no former executions on the networks of the known size
+
+	>>> _rcps['_algtest'] = {'1K5': (2., 2., 0), '1K5^1': (3., 3., 0), '4K5': (12., 12., 0), '9K5': (5., 5., 0)}
+	>>> _baselinks.update({'1K5': 1000, '4K5': 4000})
+	>>> ['{:.3f}'.format(v) for v in timeModel('_algtest')]  # 9K5 has unknown size
+	['0.003', '1.000']
+	>>> _baselinks['9K5'] = 9000
+	>>> ['{:.3f}'.format(v) for v in timeModel('_algtest')]  # Refitted on the new sizes, the exponent is at least 1
+	['0.002', '1.000']
+	>>> del _rcps['_algtest'], _rcpbasetimes['_algtest'], _timemodels['_algtest']
+	>>> for basename in ('1K5', '4K5', '9K5'): del _baselinks[basename]
+	>>> timeModel('_algtest') is None
+	True
+	>>> del _rcps['_algtest'], _rcpbasetimes['_algtest'], _timemodels['_algtest']
+	"""
+	model = _timemodels.get(algname)
+	if model is not None and model[0] == len(_baselinks):
+		return model[1]
+	model = fitTimeModel([(_baselinks[basename], exectime) for basename, exectime
+		in baseTimes(algname).iteritems() if _baselinks.get(basename)])
+	_timemodels[algname] = (len(_baselinks), model)
+	return model
+
+
+def fitTimeModel(points):
+	"""Fit the execution time model time = a * links^b by the least squares in the log-log scale
+
+	points  - measured execution times on the networks: [(links, exectime)], the non-positive
+		values are omitted
+
+	return  - (a, b), where b is at least 1, or None if there are no points
+
+	>>> a, b = fitTimeModel([(1000, 0.5), (4000, 8.), (2000, 2.)])  # time = 5E-7 * links^2
+	>>> '{:.2E} {:.3f}'.format(a, b)
+	'5.00E-07 2.000'
+	>>> a, b = fitTimeModel([(1000, 4.), (10000, 4.)])  # Sublinear time is fitted by the linear model
+	>>> '{:.2E} {}'.format(a, b)
+	'1.26E-03 1'
+	>>> a, b = fitTimeModel([(1000, 2.), (1000, 3.)])  # Single size, the geometric mean of the times
+	>>> '{:.3f} {}'.format(a * 1000, b)
+	'2.449 1'
+	>>> fitTimeModel([(0, 1.), (1000, 0)]) is None
+	True
+	"""
+	points = [(math.log(links), math.log(exectime)) for links, exectime in points if links > 0 and exectime > 0]
+	if not points:
+		return None
+	xavg = sum(x for x, y in points) / len(points)
+	yavg = sum(y for x, y in points) / len(points)
+	xvar = sum((x - xavg) ** 2 for x, y in points)
+	b = max(sum((x - xavg) * (y - yavg) for x, y in points) / xvar if xvar else 1, 1)
+	return math.exp(yavg - b * xavg), b
+
+
+def expectedTimeout(algname, taskname, netfile, timeout):
+	"""Timeout of the job adapted to the expected execution time of the algorithm on the task
+
+	The execution time is expected to be the former value for this task if exists, otherwise
+	the max value among the tasks having the same base network, otherwise the value
+	predicted by the execution time model of the algorithm (see timeModel()).
+
+	algname  - name of the algorithm
+	taskname  - name of the task in the resources consumption profile, which includes
+		instance, shuffle, parameters and pathid suffixes
+	netfile  - the input network of the task
+	timeout  - global timeout of the job in sec, 0 means no timeout
+
+	return  - timeout in sec: _timeoutmul times the expected execution time but at least
+		_TIMEOUTMIN and _TIMEOUTKILLMUL times the execution time of the former execution
+		of the task terminated by the timeout, clamped by the global timeout; the global
+		timeout if the adaptive timeouts are disabled (see adaptTimeouts()) or the execution
+		time can not be predicted
+
+	>>> _rcps['_algtest'] = {'1K5': (10., 9., 0), '2K5': (100., 90., 0), '2K5^1': (120., 110., 0)}
+	>>> expectedTimeout('_algtest', '2K5', '2K5.nsa', 3600)  # The adaptive timeouts are disabled
+	3600
+	>>> adaptTimeouts(3)
+	>>> expectedTimeout('_algtest', '1K5', '1K5.nsa', 3600), expectedTimeout('_algtest', '2K5', '2K5.nsa', 3600)
+	(60, 300.0)
+	>>> expectedTimeout('_algtest', '2K5', '2K5.nsa', 200), expectedTimeout('_algtest', '2K5', '2K5.nsa', 0)
+	(200, 300.0)
+	>>> expectedTimeout('_algtest', '2K5^2!k3', '2K5^2.nsa', 3600)  # Max time on the base network
+	360.0
+	>>> _baselinks.update({'1K5': 1000, '2K5': 10000})
+	>>> _netsizes['_test/5K5.nsa'] = (5000, 50000)
+	>>> '{:.0f}'.format(expectedTimeout('_algtest', '5K5', '_test/5K5.nsa', 3600))  # Predicted by the model
+	'2045'
+	>>> expectedTimeout('_algtest', '7K5', '/nonexistent/7K5.nsa', 3600)  # Unknown size
+	3600
+	>>> _rcptimeouts['_algtest'] = {'1K5': 45., '2K5': 80.}  # The tasks terminated by the former timeouts
+	>>> expectedTimeout('_algtest', '1K5', '1K5.nsa', 3600), expectedTimeout('_algtest', '2K5', '2K5.nsa', 3600)
+	(90.0, 300.0)
+	>>> adaptTimeouts(0)
+	>>> del _rcps['_algtest'], _rcpbasetimes['_algtest'], _timemodels['_algtest'], _netsizes['_test/5K5.nsa']
+	>>> del _rcptimeouts['_algtest']
+	>>> del _baselinks['1K5'], _baselinks['2K5']
+	"""
+	if not _timeoutmul:
+		return timeout
+	task = loadRcp(algname).get(taskname)
+	exectime = task[0] if task else baseTimes(algname).get(delPathSuffix(taskname, True))
+	if not exectime:
+		model = timeModel(algname)
+		links = netSize(netfile)[1]
+		if not model or not links:
+			return timeout
+		exectime = model[0] * links ** model[1]
+	# Note: the task terminated by the timeout is executed longer than the killed execution
+	exectime = max(exectime * _timeoutmul, _TIMEOUTMIN
+		, _rcptimeouts.get(algname, {}).get(taskname, 0) * _TIMEOUTKILLMUL)
+	return min(exectime, timeout) if timeout else exectime
+
+
+def adaptTimeouts(multiple, netfiles=()):
+	"""Adapt the timeouts of the jobs to the expected execution time of the algorithms
+
+	multiple  - multiple of the expected execution time to be the timeout of the job,
+		0 means the global timeout
+	netfiles  - networks to be processed, which sizes are taken to fit the execution
+		time models of the algorithms on the former executions
+
+	>>> import tempfile
+	>>> netdir = tempfile.mkdtemp()
+	>>> with open(netdir + '/3K5^1.nsa', 'w') as fnet:
+	... 	fnet.write('# Nodes: 3000 Links: 15000\\n')
+	>>> adaptTimeouts(2, [netdir + '/3K5^1.nsa'])
+	>>> _baselinks['3K5']
+	15000
+	>>> _rcps['_algtest'] = {'3K5': (100., 90., 0)}
+	>>> expectedTimeout('_algtest', '3K5', '3K5.nsa', 3600)
+	200.0
+	>>> adaptTimeouts(-1)
+	Traceback (most recent call last):
+	AssertionError: Invalid multiple of the expected execution time: -1
+	>>> adaptTimeouts(0)
+	>>> shutil.rmtree(netdir)
+	>>> del _rcps['_algtest'], _baselinks['3K5']
+	"""
+	global _timeoutmul
+
+	assert multiple >= 0, 'Invalid multiple of the expected execution time: ' + str(multiple)
+	_timeoutmul = multiple
+	if multiple:
+		for netfile in netfiles:
+			netSize(netfile)
+
+
+def appJob(algname, task, pathid, netfile, timeout, apptask, taskpath, **kwargs):
+	"""Job of the algorithm on the network
+
+	The job is scheduled with the memory, cost and timeout expected from the former executions
+	of the algorithm and its resources consumption is appended to the profile of the algorithm.
+
+	algname  - name of the algorithm
+	task  - name of the task, base name of the network including the instance, shuffle
+		and parameters suffixes
+	pathid  - path id of the network
+	netfile  - the input network, which defines the expected cost and fingerprints the job
+	timeout  - global timeout of the job in sec, 0 means no timeout
+	apptask  - task of the algorithm on the network or None
+	taskpath  - path of the results of the job
+	kwargs  - other parameters of the Job (args, stdout, stderr, ondone, ...) overriding the defaults:
+		workdir=_ALGSDIR, inputs=(netfile,), outputs=(taskpath,) and the data segment limit,
+		which is _DATALIMMUL times the expected RSS (see expectedMem()) within [_DATALIMMIN, _DATALIM]
+		or _DATALIM if the RSS is unknown. The apps reserving the memory beforehand (JVM) should
+		disable the limit: datalim=0
+
+	return  - the job
+
+	>>> _rcps['_algtest'] = {'1K5': (10., 9., 500.)}
+	>>> job = appJob('_algtest', '1K5', '', '1K5.nsa', 3600, None, 'results/_algtest/1K5', args=('true',))
+	>>> job.name, job.mem, job.datalim, job.inputs, job.outputs
+	('_algtest/1K5', 500.0, 2000.0, ('1K5.nsa',), ('results/_algtest/1K5',))
+	>>> appJob('_algtest', '1K5', '', '1K5.nsa', 3600, None, '', args=('java',), datalim=0).datalim
+	0
+	>>> appJob('_algtest', '2K20', '', '2K20.nsa', 3600, None, '', args=('true',)).datalim == _DATALIM
+	True
+	>>> del _rcps['_algtest'], _rcpbasemems['_algtest'], _rcpbasetimes['_algtest']
+	"""
+	rcpname = task + pathid  # Name of the task in the resources consumption profile
+	mem = expectedMem(algname, rcpname)
+	params = {'name': _SEPNAMEPART.join((algname, task)), 'task': apptask, 'workdir': _ALGSDIR, 'group': algname
+		, 'timeout': expectedTimeout(algname, rcpname, netfile, timeout)
+		, 'rcpoutp': ''.join((_RESDIR, algname, _EXTEXECTIME)), 'rcpname': rcpname, 'mem': mem
+		, 'datalim': min(max(mem * _DATALIMMUL, _DATALIMMIN), _DATALIM) if mem else _DATALIM
+		, 'cost': expectedCost(algname, rcpname, netfile)
+		, 'inputs': (netfile,), 'outputs': (taskpath,)}
+	params.update(kwargs)
+	return Job(**params)
 
 
 def aggexec(algs):
@@ -149,18 +605,20 @@ def aggexec(algs):
 				.format(measure, err, traceback.format_exc()), file=sys.stderr)
 
 
-def	preparePath(taskpath):
+def	preparePath(taskpath, keep=False):
 	"""Create the path if required, otherwise move existent data to backup.
 	All itnstances and shuffles of each network are handled all together and only once,
 	even on calling this function for each shuffle.
 	NOTE: To process files starting with taskpath, it should not contain '/' in the end
 
 	taskpath  - the path to be prepared
+	keep  - keep the existent data, which is required on the resumed execution
+		to retain the results of the completed jobs
 	"""
 	# Backup existent files & dirs with such base only if this path exists and is not empty
 	# ATTENTION: do not use only basePathExists(taskpath) here to avoid movement to the backup
 	# processing paths when xxx.mod.net is processed before the xxx.net (have the same base)
-	if os.path.exists(taskpath) and not dirempty(taskpath):
+	if not keep and os.path.exists(taskpath) and not dirempty(taskpath):
 		mainpath = delPathSuffix(taskpath)
 		backupPath(mainpath, True)
 	# Create target path if not exists
@@ -227,7 +685,13 @@ def funcToAppName(funcname):
 #	return
 
 
-def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=False):
+def _louvain_igraph(*args):
+	"""Louvain (igraph) clustering in the forked process of the execution pool"""
+	from algorithms.louvain_igraph import louvain
+	return louvain(*args)
+
+
+def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=False, apptask=None):
 	"""Execute Louvain
 	Results are not stable => multiple execution is desirable.
 
@@ -248,7 +712,7 @@ def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=Fal
 	# ./louvain_igraph.py -i=../syntnets/1K5.nsa -ol=louvain_igoutp/1K5/1K5.cnl
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, execpool.resume)
 
 	## Louvain accumulated statistics over shuffled modification of the network or total statistics for all networks
 	#extres = '.acs'
@@ -269,11 +733,9 @@ def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=Fal
 	#		# TODO: Evaluate the average
 	#		subprocess.call(('tail', '-n 1', taskpath + _EXTLOG), stdout=accres)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		# Note: igraph-python is a Cython wrapper around C igraph lib. Calls are much faster on CPython than on PyPy
-		, 'python', ''.join(('./', algname, '.py')), ''.join(('-i=../', netfile, netext))
-		, ''.join(('-ol=../', taskpath, _EXTCLNODES)))
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args, timeout=timeout
+	args = (''.join(('-i=../', netfile, netext)), ''.join(('-ol=../', taskpath, _EXTCLNODES)))
+	args = ((_louvain_igraph,) if _PYFORK else ('python', ''.join(('./', algname, '.py')))) + args
+	execpool.execute(appJob(algname, task, pathid, netfile + netext, timeout, apptask, taskpath, args=args
 		#, ondone=postexec
 		, stdout=os.devnull, stderr=''.join((taskpath, _EXTLOG))))
 
@@ -291,7 +753,7 @@ def execLouvain_igraph(execpool, netfile, asym, timeout, pathid='', selfexec=Fal
 
 
 # SCP (Sequential algorithm for fast clique percolation)
-def execScp(execpool, netfile, asym, timeout, pathid=''):
+def execScp(execpool, netfile, asym, timeout, pathid='', apptask=None):
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
 		.format(execpool, netfile, asym, timeout))
@@ -313,14 +775,13 @@ def execScp(execpool, netfile, asym, timeout, pathid=''):
 		# Backup previous results if exist
 		taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, ktask, pathid))
 
-		preparePath(taskpath)
+		preparePath(taskpath, execpool.resume)
 
 		# ATTENTION: a single argument is k-clique size, specified later
 		steps = '10'  # Use 10 levels in the hierarchy Ganxis
 		resbase = ''.join(('../', taskpath, '/', ktask))  # Base name of the result
 		# scp.py netname k [start_linksnum end__linksnum numberofevaluations] [weight]
-		args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', ktask, pathid)), '-s=/etime_' + algname
-			, PYEXEC, ''.join(('./', algname, '.py')), '../' + netfile, kstr, steps, resbase + _EXTCLNODES)
+		args = (PYEXEC, ''.join(('./', algname, '.py')), '../' + netfile, kstr, steps, resbase + _EXTCLNODES)
 
 		def tidy(job):
 			"""Remove empty resulting folders"""
@@ -330,13 +791,19 @@ def execScp(execpool, netfile, asym, timeout, pathid=''):
 				os.rmdir(path)
 
 		#print('> Starting job {} with args: {}'.format('_'.join((ktask, algname, kstrex)), args + [kstr]))
-		execpool.execute(Job(name=_SEPNAMEPART.join((algname, ktask)), workdir=_ALGSDIR, args=args, timeout=timeout
+		execpool.execute(appJob(algname, ktask, pathid, netfile, timeout, apptask, taskpath, args=args
 			, ondone=tidy, stderr=taskpath + _EXTLOG))
 
 	return kmax + 1 - kmin
 
 
-def execRandcommuns(execpool, netfile, asym, timeout, pathid='', instances=5):  # _netshuffles + 1
+def _randcommuns(*args):
+	"""Random disjoint clustering in the forked process of the execution pool"""
+	from algorithms.randcommuns import randcommuns
+	return randcommuns(*args)
+
+
+def execRandcommuns(execpool, netfile, asym, timeout, pathid='', instances=5, apptask=None):  # _netshuffles + 1
 	"""Execute Randcommuns, Random Disjoint Clustering
 	Results are not stable => multiple execution is desirable.
 
@@ -353,25 +820,25 @@ def execRandcommuns(execpool, netfile, asym, timeout, pathid='', instances=5):
 	# Backup previous results if exist
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, execpool.resume)
 
 	# ./randcommuns.py -g=../syntnets/1K5.cnl -i=../syntnets/1K5.nsa -n=10
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		# Note: igraph-python is a Cython wrapper around C igraph lib. Calls are much faster on CPython than on PyPy
-		, 'python', ''.join(('./', algname, '.py')), ''.join(('-g=../', os.path.splitext(netfile)[0], _EXTCLNODES))
+	args = (''.join(('-g=../', os.path.splitext(netfile)[0], _EXTCLNODES))
 		, ''.join(('-i=../', netfile, netext)), ''.join(('-o=../', taskpath))
 		, ''.join(('-n=', str(instances))))
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args, timeout=timeout
+	args = ((_randcommuns,) if _PYFORK else ('python', ''.join(('./', algname, '.py')))) + args
+	execpool.execute(appJob(algname, task, pathid, netfile + netext, timeout, apptask, taskpath, args=args
 		, stdout=os.devnull, stderr=taskpath + _EXTLOG))
 	return 1
 
 
 # HiReCS
-def execHirecs(execpool, netfile, asym, timeout, pathid=''):
+def execHirecs(execpool, netfile, asym, timeout, pathid='', apptask=None):
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
 		.format(execpool, netfile, asym, timeout))
 	# Fetch the task name and chose correct network filename
+	netinp = netfile  # Original network to estimate the execution cost and fingerprint the job
 	netfile = os.path.splitext(netfile)[0]  # Remove the extension
 	task = os.path.split(netfile)[1]  # Base name of the network
 	assert task, 'The network name should exists'
@@ -379,23 +846,23 @@ def execHirecs(execpool, netfile, asym, timeout, pathid=''):
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'hirecs'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, execpool.resume)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './hirecs', '-oc', ''.join(('-cls=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
+	args = ('./hirecs', '-oc', ''.join(('-cls=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
 		, '../' + netfile)
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args
-		, timeout=timeout, stdout=os.devnull, stderr=taskpath + _EXTLOG))
+	execpool.execute(appJob(algname, task, pathid, netinp, timeout, apptask, taskpath, args=args
+		, stdout=os.devnull, stderr=taskpath + _EXTLOG))
 	return 1
 
 
-def execHirecsOtl(execpool, netfile, asym, timeout, pathid=''):
+def execHirecsOtl(execpool, netfile, asym, timeout, pathid='', apptask=None):
 	"""Hirecs which performs the clustering, but does not unwrappes the hierarchy into levels,
 	just outputs the folded hierarchy"""
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
 		.format(execpool, netfile, asym, timeout))
 	# Fetch the task name and chose correct network filename
+	netinp = netfile  # Original network to estimate the execution cost and fingerprint the job
 	netfile = os.path.splitext(netfile)[0]  # Remove the extension
 	task = os.path.split(netfile)[1]  # Base name of the network
 	assert task, 'The network name should exists'
@@ -403,23 +870,23 @@ def execHirecsOtl(execpool, netfile, asym, timeout, pathid=''):
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'hirecsotl'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, execpool.resume)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './hirecs', '-oc', ''.join(('-cols=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
+	args = ('./hirecs', '-oc', ''.join(('-cols=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
 		, '../' + netfile)
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args
-		, timeout=timeout, stdout=os.devnull, stderr=taskpath + _EXTLOG))
+	execpool.execute(appJob(algname, task, pathid, netinp, timeout, apptask, taskpath, args=args
+		, stdout=os.devnull, stderr=taskpath + _EXTLOG))
 	return 1
 
 
-def execHirecsAhOtl(execpool, netfile, asym, timeout, pathid=''):
+def execHirecsAhOtl(execpool, netfile, asym, timeout, pathid='', apptask=None):
 	"""Hirecs which performs the clustering, but does not unwrappes the hierarchy into levels,
 	just outputs the folded hierarchy"""
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
 		.format(execpool, netfile, asym, timeout))
 	# Fetch the task name and chose correct network filename
+	netinp = netfile  # Original network to estimate the execution cost and fingerprint the job
 	netfile = os.path.splitext(netfile)[0]  # Remove the extension
 	task = os.path.split(netfile)[1]  # Base name of the network
 	assert task, 'The network name should exists'
@@ -427,23 +894,23 @@ def execHirecsAhOtl(execpool, netfile, asym, timeout, pathid=''):
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'hirecsahotl'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, execpool.resume)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './hirecs', '-oc', ''.join(('-coas=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
+	args = ('./hirecs', '-oc', ''.join(('-coas=../', taskpath, '/', task, '_', algname, _EXTCLNODES))
 		, '../' + netfile)
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args
-		, timeout=timeout, stdout=os.devnull, stderr=taskpath + _EXTLOG))
+	execpool.execute(appJob(algname, task, pathid, netinp, timeout, apptask, taskpath, args=args
+		, stdout=os.devnull, stderr=taskpath + _EXTLOG))
 	return 1
 
 
-def execHirecsNounwrap(execpool, netfile, asym, timeout, pathid=''):
+def execHirecsNounwrap(execpool, netfile, asym, timeout, pathid='', apptask=None):
 	"""Hirecs which performs the clustering, but does not unwrappes the hierarchy into levels,
 	just outputs the folded hierarchy"""
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
 		.format(execpool, netfile, asym, timeout))
 	# Fetch the task name and chose correct network filename
+	netinp = netfile  # Original network to estimate the execution cost and fingerprint the job
 	netfile = os.path.splitext(netfile)[0]  # Remove the extension
 	task = os.path.split(netfile)[1]  # Base name of the network
 	assert task, 'The network name should exists'
@@ -451,18 +918,16 @@ def execHirecsNounwrap(execpool, netfile, asym, timeout, pathid=''):
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # Or 'hirecshfold'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 
-	preparePath(taskpath)
+	preparePath(taskpath, execpool.resume)
 
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './hirecs', '-oc', '../' + netfile)
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args
-		, timeout=timeout, stdout=''.join((taskpath, '.hoc'))
-		, stderr=taskpath + _EXTLOG))
+	args = ('./hirecs', '-oc', '../' + netfile)
+	execpool.execute(appJob(algname, task, pathid, netinp, timeout, apptask, taskpath, args=args
+		, stdout=''.join((taskpath, '.hoc')), stderr=taskpath + _EXTLOG))
 	return 1
 
 
 # Oslom2
-def execOslom2(execpool, netfile, asym, timeout, pathid=''):
+def execOslom2(execpool, netfile, asym, timeout, pathid='', apptask=None):
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
 		'Invalid input parameters:\n\texecpool: {},\n\tnet: {},\n\tasym: {},\n\ttimeout: {}'
 		.format(execpool, netfile, asym, timeout))
@@ -475,10 +940,9 @@ def execOslom2(execpool, netfile, asym, timeout, pathid=''):
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
 	# Note: wighted networks (-w) stands for the used null model, not for the input file format.
 	# Link weight is set to 1 if not specified in the file for weighted network.
-	args = ('../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, './oslom_undir' if not asym else './oslom_dir', '-f', '../' + netfile, '-w')
+	args = ('./oslom_undir' if not asym else './oslom_dir', '-f', '../' + netfile, '-w')
 
-	preparePath(taskpath)
+	preparePath(taskpath, execpool.resume)
 
 	netdir = os.path.split(netfile)[0] + '/'
 	# Copy results to the required dir on postprocessing
@@ -502,13 +966,14 @@ def execOslom2(execpool, netfile, asym, timeout, pathid=''):
 		if os.path.exists(fname):
 			os.remove(fname)
 
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args, timeout=timeout, ondone=postexec
-		, stdout=taskpath + _EXTLOG, stderr=taskpath + _EXTERR))
+	execpool.execute(appJob(algname, task, pathid, netfile, timeout, apptask, taskpath, args=args, ondone=postexec
+		, stdout=taskpath + _EXTLOG, stderr=taskpath + _EXTERR
+		, outputs=(taskpath, ''.join((netdir, task, netext, '_oslo_files')))))
 	return 1
 
 
 # Ganxis (SLPA)
-def execGanxis(execpool, netfile, asym, timeout, pathid=''):
+def execGanxis(execpool, netfile, asym, timeout, pathid='', apptask=None):
 	#print('> exec params:\n\texecpool: {}\n\tnetfile: {}\n\tasym: {}\n\ttimeout: {}'
 	#	.format(execpool, netfile, asym, timeout))
 	assert execpool and netfile and (asym is None or isinstance(asym, bool)) and timeout + 0 >= 0, (
@@ -520,12 +985,12 @@ def execGanxis(execpool, netfile, asym, timeout, pathid=''):
 
 	algname = funcToAppName(inspect.currentframe().f_code.co_name)  # 'ganxis'
 	taskpath = ''.join((_RESDIR, algname, '/', _CLSDIR, task, pathid))
-	args = ['../exectime', ''.join(('-o=../', _RESDIR, algname, _EXTEXECTIME)), ''.join(('-n=', task, pathid)), '-s=/etime_' + algname
-		, 'java', '-jar', './GANXiSw.jar', '-i', '../' + netfile, '-d', '../' + taskpath]
+	slots = 2  # Cores occupied by the JVM: the algorithm and the garbage collector
+	args = ['java', '-XX:ParallelGCThreads={}'.format(slots), '-jar', './GANXiSw.jar', '-i', '../' + netfile, '-d', '../' + taskpath]
 	if not asym:
 		args.append('-Sym 1')  # Check existance of the back links and generate them if requried
 
-	preparePath(taskpath)
+	preparePath(taskpath, execpool.resume)
 
 	def tidy(job):
 		# Note: GANXiS leaves empty ./output dir in the _ALGSDIR, which should be deleted
@@ -534,12 +999,19 @@ def execGanxis(execpool, netfile, asym, timeout, pathid=''):
 			#os.rmdir(tmp)
 			shutil.rmtree(tmp)
 
-	execpool.execute(Job(name=_SEPNAMEPART.join((algname, task)), workdir=_ALGSDIR, args=args, timeout=timeout, ondone=tidy
-		, stdout=taskpath + _EXTLOG, stderr=taskpath + _EXTERR))
+	# Note: the data segment of the JVM includes its reserved heap, so it is not limited
+	execpool.execute(appJob(algname, task, pathid, netfile, timeout, apptask, taskpath, args=args, ondone=tidy
+		, stdout=taskpath + _EXTLOG, stderr=taskpath + _EXTERR, datalim=0, slots=slots))
 	return 1
 
 
-#if __name__ == "__main__":
-#	"""Doc tests execution"""
-#	import doctest
-#	doctest.testmod()  # Detailed tests output
+if __name__ == "__main__":
+	"""Doc tests execution"""
+	import doctest
+	#doctest.testmod()  # Detailed tests output
+	flags = doctest.REPORT_NDIFF | doctest.REPORT_ONLY_FIRST_FAILURE
+	failed, total = doctest.testmod(optionflags=flags)
+	if failed:
+		print("Doctest FAILED: {} failures out of {} tests".format(failed, total))
+	else:
+		print('Doctest PASSED')
@@ -38,6 +38,7 @@ _EXTERR = '.err'
 _EXTEXECTIME = '.rcp'  # Resource Consumption Profile
 _EXTAGGRES = '.res'  # Aggregated results
 _EXTAGGRESEXT = '.resx'  # Extended aggregated results
+_GECMISLOTS = 2  # Number of cores (worker slots) occupied by gecmi, which is multithreaded (TBB)
 _SEPNAMEPART = '/'  # Job/Task name parts separator ('/' is the best choice, because it can not apear in a file name, which can be part of job name)
 
 
@@ -347,7 +348,8 @@ def aggEvaluations(respaths):
 	print('Evaluation results aggregation is finished.')
 
 
-def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob, resagg, pathid='', tidy=True):
+def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob, resagg, pathid='', tidy=True
+, apptask=None):
 	"""Generic evaluation on the specidied file
 	NOTE: all paths are given relative to the root benchmark directory.
 
@@ -364,6 +366,8 @@ def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob,
 	pathid  - path id of the basefile to distinguish files with the same name located in different dirs.
 		Note: pathid includes pathid separator
 	tidy  - delete previously existent resutls. Must be False if a few apps output results into the same dir
+	apptask  - super-task of the evaluation tasks of the algorithm on the base file, which constrains
+		them by its time budget (see Task), or None
 	"""
 	assert execpool and basefile and measure and algname, "Parameters must be defined"
 	assert not pathid or pathid[0] == _SEPPATHID, 'pathid must include pathid separator'
@@ -449,7 +453,7 @@ def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob,
 		#shuffagg = ShufflesAgg(resagg, name=_SEPNAMEPART.join((measure, algname, taskcapt, pathid)))  # Note: taskcapt here without alg params
 		taskname = os.path.splitext(os.path.split(taskoutp)[1])[0]
 		shagg = ShufflesAgg(resagg, _SEPNAMEPART.join((measure, algname, taskname)))
-		task = Task(name=taskname, params=shagg, ondone=shagg.fix)  # , params=EvalState(taskcapt, )
+		task = Task(name=taskname, params=shagg, ondone=shagg.fix, task=apptask)  # , params=EvalState(taskcapt, )
 		# Traverse over all resulting communities for each ground truth, log results
 		for cfile in glob.iglob(escapePathWildcards(clsbase) + '/*'):
 			if os.path.isdir(cfile):  # Skip dirs among the resulting clusters (extra/, generated by OSLOM)
@@ -490,7 +494,7 @@ def evalGeneric(execpool, measure, algname, basefile, measdir, timeout, evaljob,
 			.format(algname, basefile), file=sys.stderr)
 
 
-def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=''):
+def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid='', apptask=None):
 	"""Evaluate the algorithm by the specified measure.
 	NOTE: all paths are given relative to the root benchmark directory.
 
@@ -502,6 +506,7 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 	resagg  - results aggregator
 	pathid  - path id of the basefile to distinguish files with the same name located in different dirs
 		Note: pathid includes pathid separator
+	apptask  - super-task of the evaluations constraining them by its time budget (see Task), or None
 	"""
 	assert not pathid or pathid[0] == _SEPPATHID, 'pathid must include pathid separator'
 	if DEBUG_TRACE:
@@ -532,7 +537,7 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 		# Job postprocessing
 		def aggLevs(job):
 			"""Aggregate results over all levels, appending final value for each level to the dedicated file"""
-			result = job.proc.communicate()[0]  # Read buffered stdout
+			result = job.outp.read()  # Read buffered stdout
 			# Find require value to be aggregated
 			targpref = 'mod: '
 			# Match float number
@@ -557,10 +562,10 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 					clslev = _SEPNAMEPART.join((clslev, shuffle))
 				tmod.write('{}\t{}\n'.format(mod, clslev))
 
-		return Job(name='.'.join((task.name, shuffle)), workdir=_ALGSDIR, args=args, timeout=timeout
+		return Job(name='.'.join((task.name, shuffle)), task=task, workdir=_ALGSDIR, args=args, timeout=timeout
 			, ondone=aggLevs, params={'taskoutp': taskoutp, 'clslev': clslev, 'shuffle': shuffle}
-			# Output modularity to the proc PIPE buffer to be aggregated on postexec to avoid redundant files
-			, stdout=PIPE, stderr=logsbase + _EXTERR)
+			# Capture modularity from the proc PIPE to be aggregated on postexec to avoid redundant files
+			, stdout=PIPE, stderr=logsbase + _EXTERR, batchkey=(args[0], basefile), inputs=(cfile, basefile))
 
 
 	def evaljobNmi(cfile, task, taskoutp, clslev, shuffle, rcpoutp, logsbase):
@@ -602,13 +607,13 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 
 		# Processing is performed from the algorithms dir
 		jobname = '.'.join((task.name, shuffle))  # Name of the creating job
-		args = ('../exectime', '-o=../' + rcpoutp, '-n=' + jobname, './gecmi', '../' + basefile, '../' + cfile)
+		args = ('./gecmi', '../' + basefile, '../' + cfile)
 
 		# Job postprocessing
 		def aggLevs(job):
 			"""Aggregate results over all levels, appending final value for each level to the dedicated file"""
 			try:
-				result = job.proc.communicate()[0]
+				result = job.outp.read()
 				nmi = float(result)  # Read buffered stdout
 			except ValueError:
 				print('ERROR, nmi evaluation failed for the job "{}": {}'
@@ -631,7 +636,8 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 
 		return Job(name=jobname, task=task, workdir=_ALGSDIR, args=args, timeout=timeout
 			, ondone=aggLevs, params={'taskoutp': taskoutp, 'clslev': clslev, 'shuffle': shuffle}
-			, stdout=PIPE, stderr=logsbase + _EXTERR)
+			, stdout=PIPE, stderr=logsbase + _EXTERR, rcpoutp=rcpoutp, slots=_GECMISLOTS
+			, batchkey=(args[0], basefile), inputs=(basefile, cfile))
 
 
 	def evaljobNmiS(cfile, task, taskoutp, clslev, shuffle, rcpoutp, logsbase):
@@ -650,13 +656,13 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 		"""
 		# Processing is performed from the algorithms dir
 		jobname = '.'.join((task.name, shuffle))  # Name of the creating job
-		args = ('../exectime', '-o=../' + rcpoutp, '-n=' + jobname, './onmi_sum', '../' + basefile, '../' + cfile)
+		args = ('./onmi_sum', '../' + basefile, '../' + cfile)
 
 		# Job postprocessing
 		def aggLevs(job):
 			"""Aggregate results over all levels, appending final value for each level to the dedicated file"""
 			try:
-				result = job.proc.communicate()[0]
+				result = job.outp.read()
 				nmi = float(result)  # Read buffered stdout
 			except ValueError:
 				print('ERROR, nmi_s evaluation failed for the job "{}": {}'
@@ -679,14 +685,18 @@ def evalAlgorithm(execpool, algname, basefile, measure, timeout, resagg, pathid=
 
 		return Job(name=jobname, task=task, workdir=_ALGSDIR, args=args, timeout=timeout
 			, ondone=aggLevs, params={'taskoutp': taskoutp, 'clslev': clslev, 'shuffle': shuffle}
-			, stdout=PIPE, stderr=logsbase + _EXTERR)
+			, stdout=PIPE, stderr=logsbase + _EXTERR, rcpoutp=rcpoutp, batchkey=(args[0], basefile)
+			, inputs=(basefile, cfile))
 
 
 	if measure == 'mod':
-		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobMod, resagg, pathid)
+		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobMod, resagg, pathid
+			, apptask=apptask)
 	elif measure == 'nmi':
-		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobNmi, resagg, pathid)
+		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobNmi, resagg, pathid
+			, apptask=apptask)
 	elif measure == 'nmi_s':
-		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobNmiS, resagg, pathid, tidy=False)
+		evalGeneric(execpool, measure, algname, basefile, measure + '/', timeout, evaljobNmiS, resagg, pathid
+			, tidy=False, apptask=apptask)
 	else:
 		raise ValueError('Unexpected measure: ' + measure)
@@ -26,7 +26,8 @@
 			by Alcides Viamontes Esquivel, Martin Rosvall),
 		* onmi (https://github.com/aaronmcdaid/Overlapping-NMI, "Normalized Mutual Information to evaluate overlapping
 			community finding algorithms" by  Aaron F. McDaid, Derek Greene, Neil Hurley);
-	- resources consumption is evaluated using exectime profiler (https://bitbucket.org/lumais/exectime/).
+	- resources consumption is traced by the execution pool in the format of exectime profiler
+		(https://bitbucket.org/lumais/exectime/).
 
 \author: (c) Artem Lutov <artem@exascale.info>
 \organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>, ScienceWise <http://sciencewise.info/>
@@ -43,12 +44,16 @@ import shutil
 import signal  # Intercept kill signals
 from math import sqrt
 import glob
+import fnmatch  # Match the generating networks
 from datetime import datetime
 import traceback  # Stacktrace
+from contextlib import contextmanager
 
 import benchapps  # Benchmarking apps (clustering algs)
 
 from contrib.mpepool import *
+from contrib.mpepool import _AGENTPORT
+from contrib.mpepool import _AGENTTOKEN
 from benchutils import *
 
 from benchutils import _SEPPARS
@@ -58,12 +63,16 @@ from benchutils import _SEPPATHID
 from benchapps import PYEXEC
 from benchapps import aggexec
 from benchapps import _EXTCLNODES
+from benchapps import funcToAppName
 
 from benchevals import evalAlgorithm
 from benchevals import aggEvaluations
 from benchevals import EvalsAgg
 from benchevals import _RESDIR
 from benchevals import _EXTEXECTIME
+from benchevals import _SEPNAMEPART
+
+from contrib.tohig import tohig  # Conversion of the networks in the forked process of the execution pool
 
 
 # Note: '/' is required in the end of the dir to evaluate whether it is already exist and distinguish it from the file
@@ -73,8 +82,23 @@ _SYNTINUM = 5  # Default number of instances of each synthetic network
 _EXTNETFILE = '.nsa'  # Extension of the network files to be executed by the algorithms; Network specified by tab/space separated arcs
 #_algseeds = 9  # TODO: Implement
 _PREFEXEC = 'exec'  # Execution prefix for the apps functions in benchapps
+# Memory budget of the concurrently executing apps in Mb, 90% of the physical memory
+_MEMLIMIT = 0.9 * os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / 1024. ** 2
+_JOURNAL = _RESDIR + 'apps.jnl'  # Journal of the apps jobs states to resume the interrupted execution
+_CACHEDIR = _RESDIR + 'cache/'  # Content-addressed cache of the apps and evaluations results
+_EVALBATCH = 16  # Max number of the evaluation jobs on the same base file executed by a single worker
+_NETGENATTEMPTS = 3  # Max number of the attempts of the network generation restarted on timeout or crash
+_STATUS = _RESDIR + 'status.json'  # Live metrics of the executing apps and evaluations, rewritten periodically
+_METRICSPORT = 9466  # Default port of the HTTP endpoint on the localhost serving the live metrics
+_SAMPLING = 1  # Default interval in sec of the sampling of the apps resources consumption time series
+_TRACE = _RESDIR + 'trace.json'  # Default timeline of the benchmarking in the Chrome trace-event format
+_TIMEOUTMUL = 3  # Default multiple of the expected execution time of the apps to be their adaptive timeouts
 
 _execpool = None  # Pool of executors to process jobs
+_tracer = None  # Tracer of the benchmarking timeline shared by the pools
+_adaptive = 0  # Min number of the workers of the pools adapting to the load of the host, 0 means the fixed workers
+_agents = ()  # Addresses of the remote worker agents executing the apps
+_staging = False  # Stage the inputs and outputs of the apps to the agents instead of the shared file system
 
 
 def parseParams(args):
@@ -95,6 +119,18 @@ def parseParams(args):
 				0b11 - force conversion (overwrite all)
 			0b100 - resolve duplicated links on conversion
 		runalgs  - execute algorithm or not
+		resume  - resume the interrupted execution of the algorithms skipping the completed jobs
+		cache  - restore cached results of the apps and evaluations having the same executable,
+			args and inputs instead of their execution
+		metrics  - port of the HTTP endpoint on the localhost serving the live metrics of the
+			apps and evaluations in the Prometheus text format or None
+		sampling  - interval in sec of the sampling of the resources consumption time series
+			of the apps, 0 means no sampling
+		trace  - the timeline file of the stages and jobs in the Chrome trace-event format or None
+		adaptive  - adapt the number of the workers to the load of the host
+		agents  - addresses of the remote worker agents executing the apps: 'host[:port]'
+		staging  - stage the inputs of the apps to the agents and fetch their outputs back
+			instead of the shared file system
 		evalres  - resulting measures to be evaluated:
 			Note: all the employed measures are applicable for overlapping clusters
 			0  - nothing
@@ -104,6 +140,10 @@ def parseParams(args):
 		datas  - list of datasets to be run with asym flag (asymmetric / symmetric links weights):
 			[(<asym>, <path>, <gendir>), ...] , where path is either dir or file
 		timeout  - execution timeout in sec per each algorithm
+		timeoutmul  - multiple of the expected execution time of each algorithm on each network
+			to be its timeout clamped by the global timeout, 0 means the global timeout
+		budgets  - time budgets in sec of the jobs of all the algorithms (evaluations) on each network
+			and of each algorithm on each network: (netbudget, algbudget), 0 means no budget
 		algorithms  - algorithms to be executed (just names as in the code)
 	"""
 	assert isinstance(args, (tuple, list)) and args, 'Input arguments must be specified'
@@ -113,10 +153,20 @@ def parseParams(args):
 	syntdir = _SYNTDIR  # Base directory for synthetic datasets
 	convnets = 0
 	runalgs = False
+	resume = False
+	cache = False
+	metrics = None
+	sampling = 0
+	trace = None
+	adaptive = False
+	agents = []
+	staging = False
 	evalres = 0  # 1 - NMI, 2 - NMI_s, 4 - Q, 7 - all measures
 	datas = []  # list of pairs: (<asym>, <path>), where path is either dir or file
 	timeout = 36 * 60*60  # 36 hours
 	timemul = 1  # Time multiplier, sec by default
+	timeoutmul = 0  # Multiple of the expected execution time to be the adaptive timeout of each app
+	budgets = [0, 0]  # Time budgets per network and per algorithm on each network, 0 means no budget
 	algorithms = []
 	aggrespaths = []  # Paths for the evaluated resutls aggregation (to be done for already existent evaluations)
 
@@ -125,7 +175,51 @@ def parseParams(args):
 		if arg[0] != '-':
 			raise ValueError('Unexpected argument: ' + arg)
 
-		if arg[1] == 'g':
+		if arg == '--resume':
+			resume = True
+		elif arg == '--cache':
+			cache = True
+		elif arg.startswith('--metrics'):
+			if arg == '--metrics':
+				metrics = _METRICSPORT
+			elif arg[len('--metrics')] == '=':
+				metrics = int(arg[len('--metrics='):])
+			else:
+				raise ValueError('Unexpected argument: ' + arg)
+		elif arg.startswith('--sample'):
+			if arg == '--sample':
+				sampling = _SAMPLING
+			elif arg[len('--sample')] == '=':
+				sampling = float(arg[len('--sample='):])
+				if sampling <= 0:
+					raise ValueError('Invalid sampling interval: ' + arg)
+			else:
+				raise ValueError('Unexpected argument: ' + arg)
+		elif arg == '--adaptive':
+			adaptive = True
+		elif arg.startswith('--adapt-timeouts'):
+			if arg == '--adapt-timeouts':
+				timeoutmul = _TIMEOUTMUL
+			elif arg[len('--adapt-timeouts')] == '=':
+				timeoutmul = float(arg[len('--adapt-timeouts='):])
+				if timeoutmul <= 0:
+					raise ValueError('Invalid multiple of the expected execution time: ' + arg)
+			else:
+				raise ValueError('Unexpected argument: ' + arg)
+		elif arg.startswith('--agents='):
+			agents = [agent for agent in arg[len('--agents='):].split(',') if agent]
+			if not agents:
+				raise ValueError('Unexpected argument: ' + arg)
+		elif arg == '--staging':
+			staging = True
+		elif arg.startswith('--trace'):
+			if arg == '--trace':
+				trace = _TRACE
+			elif arg[len('--trace')] == '=' and len(arg) > len('--trace='):
+				trace = arg[len('--trace='):]
+			else:
+				raise ValueError('Unexpected argument: ' + arg)
+		elif arg[1] == 'g':
 			gensynt = 1  # Generate if not exists
 			alen = len(arg)
 			if alen == 2:
@@ -225,10 +319,21 @@ def parseParams(args):
 			elif arg[2] == 'h':
 				timemul = 3600  # Hours
 			timeout = float(arg[pos:]) * timemul
+		elif arg[1] == 'b':
+			pos = arg.find('=', 2)
+			if pos not in (3, 4) or arg[pos - 1] not in 'na' or (pos == 4 and arg[2] not in 'smh') or len(arg) == pos + 1:
+				raise ValueError('Unexpected argument: ' + arg)
+			budgetmul = 1  # Seconds
+			if arg[2] == 'm':
+				budgetmul = 60  # Minutes
+			elif arg[2] == 'h':
+				budgetmul = 3600  # Hours
+			budgets[arg[pos - 1] == 'a'] = float(arg[pos + 1:]) * budgetmul
 		else:
 			raise ValueError('Unexpected argument: ' + arg)
 
-	return gensynt, netins, shufnum, syntdir, convnets, runalgs, evalres, datas, timeout, algorithms, aggrespaths
+	return (gensynt, netins, shufnum, syntdir, convnets, runalgs, resume, cache, metrics, sampling, trace, adaptive
+		, tuple(agents), staging, evalres, datas, timeout, timeoutmul, tuple(budgets), algorithms, aggrespaths)
 
 
 def prepareInput(datas):
@@ -295,7 +400,7 @@ def prepareInput(datas):
 	return datadirs, datafiles
 
 
-def generateNets(genbin, basedir, overwrite=False, count=_SYNTINUM, gentimeout=2*60*60):  # 2 hour
+def generateNets(genbin, basedir, overwrite=False, count=_SYNTINUM, gentimeout=2*60*60, join=True):  # 2 hour
 	"""Generate synthetic networks with ground-truth communities and save generation params.
 	Previously existed paths with the same name are backuped.
 
@@ -303,6 +408,12 @@ def generateNets(genbin, basedir, overwrite=False, count=_SYNTINUM, gentimeout=2
 	basedir  - base directory where data will be generated
 	overwrite  - whether to overwrite existing networks or use them
 	count  - number of insances of each network to be generated, >= 1
+	join  - wait for the generation, otherwise the generating jobs are left in the execution
+		pool to pipeline them with the subsequent jobs
+
+	return
+		netjobs  - jobs generating the networks: {netfile: job}
+		jobstimeout  - execution timeout of the generating jobs
 	"""
 	paramsdir = 'params/'  # Contains networks generation parameters per each network type
 	seedsdir = 'seeds/'  # Contains network generation seeds per each network instance
@@ -347,12 +458,14 @@ def generateNets(genbin, basedir, overwrite=False, count=_SYNTINUM, gentimeout=2
 	global _execpool
 
 	if not _execpool:
-		_execpool = ExecPool(max(cpu_count() - 1, 1))
+		_execpool = ExecPool(max(cpu_count() - 1, 1), trace=_tracer, adaptive=_adaptive)
 	netgenTimeout = 15 * 60  # 15 min
 	#shuftimeout = 1 * 60  # 1 min per each shuffling
 	bmname =  os.path.split(genbin)[1]  # Benchmark name
 	bmbin = './' + bmname  # Benchmark binary
 	timeseed = basedir + 'time_seed.dat'
+	rcpoutp = ''.join((basedir, bmname, _EXTEXECTIME))  # Resources consumption of the generation
+	netjobs = {}  # Jobs generating the networks
 
 	# Check whether time seed exists and create it if required
 	if not os.path.exists(timeseed):  # Note: overwrite is not relevant here
@@ -388,35 +501,71 @@ def generateNets(genbin, basedir, overwrite=False, count=_SYNTINUM, gentimeout=2
 					startdelay = 0.1  # Required to start execution of the LFR benchmark before copying the time_seed for the following process
 					netfile = netpath + name
 					if count and overwrite or not os.path.exists(netfile.join((basedir, _EXTNETFILE))):
-						args = ('../exectime', '-n=' + name, ''.join(('-o=', bmname, _EXTEXECTIME))  # Output .rcp in the current dir, basedir
-							, bmbin, '-f', netparams, '-name', netfile)
+						args = (bmbin, '-f', netparams, '-name', netfile)
 						#Job(name, workdir, args, timeout=0, ontimeout=False, onstart=None, ondone=None, tstart=None)
-						_execpool.execute(Job(name=name, workdir=basedir, args=args, timeout=netgenTimeout, ontimeout=True
+						job = Job(name=name, workdir=basedir, args=args, timeout=netgenTimeout, ontimeout=True
+							, attempts=_NETGENATTEMPTS
 							, onstart=lambda job: shutil.copy2(timeseed, job.name.join((seedsdirfull, '.ngs')))  # Network generation seed
 							#, ondone=shuffle if shufnum > 0 else None
-							, startdelay=startdelay))
+							, startdelay=startdelay, rcpoutp=rcpoutp)
+						netjobs[netfile.join((basedir, _EXTNETFILE))] = job
+						_execpool.execute(job)
 					for i in range(1, count):
 						namext = ''.join((name, _SEPINST, str(i)))
 						netfile = netpath + namext
 						if overwrite or not os.path.exists(netfile.join((basedir, _EXTNETFILE))):
-							args = ('../exectime', '-n=' + namext, ''.join(('-o=', bmname, _EXTEXECTIME))
-								, bmbin, '-f', netparams, '-name', netfile)
+							args = (bmbin, '-f', netparams, '-name', netfile)
 							#Job(name, workdir, args, timeout=0, ontimeout=False, onstart=None, ondone=None, tstart=None)
-							_execpool.execute(Job(name=namext, workdir=basedir, args=args, timeout=netgenTimeout, ontimeout=True
+							job = Job(name=namext, workdir=basedir, args=args, timeout=netgenTimeout, ontimeout=True
+								, attempts=_NETGENATTEMPTS
 								, onstart=lambda job: shutil.copy2(timeseed, job.name.join((seedsdirfull, '.ngs')))  # Network generation seed
 								#, ondone=shuffle if shufnum > 0 else None
-								, startdelay=startdelay))
+								, startdelay=startdelay, rcpoutp=rcpoutp)
+							netjobs[netfile.join((basedir, _EXTNETFILE))] = job
+							_execpool.execute(job)
 			else:
 				print('ERROR: network parameters file "{}" is not exist'.format(fnamex), file=sys.stderr)
 	print('Parameter files generation is completed')
+	jobstimeout = max(gentimeout, count * (netgenTimeout  #+ (shufnum * shuftimeout)
+		))  # 2 hours
+	if not join:
+		print('Synthetic networks files generation is scheduled')
+		return netjobs, jobstimeout
 	if _execpool:
-		_execpool.join(max(gentimeout, count * (netgenTimeout  #+ (shufnum * shuftimeout)
-			)))  # 2 hours
+		_execpool.join(jobstimeout)
 		_execpool = None
 	print('Synthetic networks files generation is completed')
+	return netjobs, jobstimeout
+
 
+def joinPool(timeout):
+	"""Wait for the completion of the jobs scheduled in the execution pool and release the pool
 
-def shuffleNets(datadirs, datafiles, shufnum, overwrite=False, shuftimeout=30*60):  # 30 min
+	timeout  - execution timeout of the scheduled jobs
+	"""
+	global _execpool
+
+	if _execpool:
+		_execpool.join(timeout)
+		_execpool = None
+
+
+def shuffleNet(basename, shufnum, overwrite=False):
+	"""Shuffle the network in the current dir, executed by the forked process of the execution pool
+
+	basename  - base name of the network file without the extension
+	shufnum  - number of the shuffles to be generated
+	overwrite  - whether to renew existent shuffles
+	"""
+	basenet = basename + _EXTNETFILE
+	for i in range(1, shufnum + 1):
+		# sort -R pgp_udir.net -o pgp_udir_rand3.net
+		netfile = ''.join((basename, '.', str(i), _EXTNETFILE))
+		if overwrite or not os.path.exists(netfile):
+			subprocess.call(('sort', '-R', basenet, '-o', netfile))
+
+
+def shuffleNets(datadirs, datafiles, shufnum, overwrite=False, shuftimeout=30*60, netjobs=None, jobstimeout=0):  # 30 min
 	"""Shuffle specified networks
 
 	datadirs  - directories with target networks to be processed
@@ -425,45 +574,31 @@ def shuffleNets(datadirs, datafiles, shufnum, overwrite=False, shuftimeout=30*60
 	overwrite  - whether to renew existent shuffles (delete former and generate new).
 		ATTENTION: Anyway redundant shuffles are deleted.
 	shuftimeout  - global shuffling timeout
+	netjobs  - jobs forming the networks in the execution pool (generation or conversion): {netfile: job},
+		the forming networks are shuffled on their completion
+	jobstimeout  - execution timeout of the jobs already scheduled in the execution pool
+		(networks generation and conversion), which extends the shuffling timeout
 	"""
 	# Note: backup is performe on paths extraction, see prepareInput()
 	assert shufnum >= 1, 'Number of the network shuffles to be generated must be positive'
 	global _execpool
 
 	if not _execpool:
-		_execpool = ExecPool(max(cpu_count() - 1, 1))
+		_execpool = ExecPool(max(cpu_count() - 1, 1), trace=_tracer, adaptive=_adaptive)
 
 	timeout = 3 * 60  # 3 min per each shuffling
 
-	def shuffle(job):
-		"""Shufle network specified by the job"""
+	def shuffle(job, depends=()):
+		"""Shufle network specified by the job
+
+		depends  - jobs forming the network, the shuffling is started on their completion
+		"""
 		if shufnum < 1:
 			return
-		args = (PYEXEC, '-c',
-# Shuffling procedure
-"""import os
-import subprocess
-
-basenet = '{jobname}' + '{_EXTNETFILE}'
-#print('basenet: ' + basenet, file=sys.stderr)
-for i in range(1, {shufnum} + 1):
-	# sort -R pgp_udir.net -o pgp_udir_rand3.net
-	netfile = ''.join(('{jobname}', '.', str(i), '{_EXTNETFILE}'))
-	if {overwrite} or not os.path.exists(netfile):
-		subprocess.call(('sort', '-R', basenet, '-o', netfile))
-# Remove existent redundant shuffles if any
-#i = {shufnum} + 1
-#while i < 100:  # Max number of shuffles
-#	netfile = ''.join(('{jobname}', '.', str(i), '{_EXTNETFILE}'))
-#	if not os.path.exists(netfile):
-#		break
-#	else:
-#		os.remove(netfile)
-""".format(jobname=job.name, _EXTNETFILE=_EXTNETFILE, shufnum=shufnum, overwrite=overwrite))
 		_execpool.execute(Job(name=job.name + '_shf', workdir=job.workdir
-			, args=args, timeout=timeout * shufnum))
+			, args=(shuffleNet, job.name, shufnum, overwrite), timeout=timeout * shufnum, depends=depends))
 
-	def shuffleNet(netfile):
+	def shuffleNetFile(netfile):
 		"""Shuffle specified network
 
 		return
@@ -479,23 +614,28 @@ for i in range(1, {shufnum} + 1):
 			if int(ext2[1:]) > shufnum:
 				os.remove(netfile)
 			return 0
-		shuffle(Job(name=name, workdir=path + '/'))
+		job = netjobs.get(netfile) if netjobs else None
+		shuffle(Job(name=name, workdir=path + '/'), (job,) if job else ())
 		return shufnum
 
 	count = 0
 	for asym, ddir in datadirs:
-		for dfile in glob.iglob('*'.join((ddir, _EXTNETFILE))):  # Allow wildcards
-			count += shuffleNet(dfile)
+		netspat = '*'.join((ddir, _EXTNETFILE))
+		nets = set(glob.iglob(netspat))  # Allow wildcards
+		if netjobs:
+			nets.update(net for net in netjobs if fnmatch.fnmatch(net, netspat))
+		for dfile in sorted(nets):
+			count += shuffleNetFile(dfile)
 	for asym, dfile in datafiles:
-		count += shuffleNet(dfile)
+		count += shuffleNetFile(dfile)
 
 	if _execpool:
-		_execpool.join(max(shuftimeout, count * shufnum * timeout))  # 30 min
+		_execpool.join(max(shuftimeout, count * shufnum * timeout) + jobstimeout)  # 30 min
 		_execpool = None
 	print('Synthetic networks files generation is completed')
 
 
-def convertNet(inpnet, asym, overwrite=False, resdub=False, timeout=3*60):  # 3 min
+def convertNet(inpnet, asym, overwrite=False, resdub=False, timeout=3*60, depends=()):  # 3 min
 	"""Convert input networks to another formats
 
 	datadir  - directory of the networks to be converted
@@ -503,12 +643,21 @@ def convertNet(inpnet, asym, overwrite=False, resdub=False, timeout=3*60):  # 3
 	overwrite  - whether to overwrite existing networks or use them
 	resdub  - resolve duplicated links
 	timeout  - network conversion timeout
+	depends  - jobs forming the input network, the conversion is started on their completion
+
+	return  - the converting job or None on the failed scheduling
 	"""
+	global _execpool
+
+	if not _execpool:
+		_execpool = ExecPool(max(cpu_count() - 1, 1), trace=_tracer, adaptive=_adaptive)
 	try:
-		args = [PYEXEC, 'contrib/tohig.py', inpnet, '-f=ns' + ('a' if asym else 'e'), '-o' + ('f' if overwrite else 's')]
+		args = [tohig, inpnet, '-f=ns' + ('a' if asym else 'e'), '-o' + ('f' if overwrite else 's')]
 		if resdub:
 			args.append('-r')
-		_execpool.execute(Job(name=os.path.splitext(os.path.split(inpnet)[1])[0], args=args, timeout=timeout))
+		job = Job(name=os.path.splitext(os.path.split(inpnet)[1])[0], args=args, timeout=timeout, depends=depends)
+		_execpool.execute(job)
+		return job
 	except StandardError as err:
 		print('ERROR on "{}" conversion into .hig, the network is skipped: {}. {}'
 			.format(inpnet, err, traceback.format_exc()), file=sys.stderr)
@@ -525,13 +674,24 @@ def convertNet(inpnet, asym, overwrite=False, resdub=False, timeout=3*60):  # 3
 	#	print('ERROR on "{}" conversion into .lig, the network is skipped: {}'.format(net), err, file=sys.stderr)
 
 
-def convertNets(datadir, asym, overwrite=False, resdub=False, convtimeout=30*60):  # 30 min
+def convertNets(datadir, asym, overwrite=False, resdub=False, convtimeout=30*60, netjobs=None, jobstimeout=0, join=True):  # 30 min
 	"""Convert input networks to another formats
 
 	datadir  - directory of the networks to be converted
 	asym  - network links weights are asymmetric (in/outbound weights can be different)
 	overwrite  - whether to overwrite existing networks or use them
 	resdub  - resolve duplicated links
+	netjobs  - jobs generating the networks in the execution pool: {netfile: job},
+		the generating networks are converted on their generation
+	jobstimeout  - execution timeout of the jobs already scheduled in the execution pool
+		(networks generation), which extends the conversion timeout
+	join  - wait for the conversion, otherwise the converting jobs are left in the execution
+		pool to pipeline them with the shuffling
+
+	return
+		netjobs  - jobs forming the networks: {netfile: job}, where the converting jobs
+			replace the generating ones
+		jobstimeout  - execution timeout of the forming jobs, 0 if they are completed
 	"""
 	print('Converting networks from {} into the required formats (.hig, .lig, etc.)...'
 		.format(datadir))
@@ -539,24 +699,38 @@ def convertNets(datadir, asym, overwrite=False, resdub=False, convtimeout=30*60)
 	global _execpool
 
 	if not _execpool:
-		_execpool = ExecPool(max(cpu_count() - 1, 1))
+		_execpool = ExecPool(max(cpu_count() - 1, 1), trace=_tracer, adaptive=_adaptive)
 
 	convTimeMax = 3 * 60  # 3 min
 	netsnum = 0  # Number of converted networks
+	netspat = '*'.join((datadir, _EXTNETFILE))
+	nets = set(glob.iglob(netspat))  # Allow wildcards
+	if netjobs:
+		nets.update(net for net in netjobs if fnmatch.fnmatch(net, netspat))
+	netjobs = dict(netjobs) if netjobs else {}
 	# Convert network files to .hig format and .lig (Louvain Input Format)
-	for net in glob.iglob('*'.join((datadir, _EXTNETFILE))):  # Allow wildcards
+	for net in sorted(nets):
 		# Skip shuffles
 		if not os.path.splitext(os.path.splitext(net)[0])[1]:
-			convertNet(net, asym, overwrite, resdub, convTimeMax)
+			job = netjobs.get(net)
+			job = convertNet(net, asym, overwrite, resdub, convTimeMax, (job,) if job else ())
+			if job:
+				netjobs[net] = job
 			netsnum += 1
+	jobstimeout += max(convtimeout, netsnum * convTimeMax)  # 2 hours
 
+	if not join:
+		print('Networks conversion is scheduled for {} networks'.format(netsnum))
+		return netjobs, jobstimeout
 	if _execpool:
-		_execpool.join(max(convtimeout, netsnum * convTimeMax))  # 2 hours
+		_execpool.join(jobstimeout)
 		_execpool = None
 	print('Networks conversion is completed, converted {} networks'.format(netsnum))
+	return netjobs, 0
 
 
-def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
+def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout, resume=False, cache=False, metrics=None
+, sampling=0, budgets=(0, 0), timeoutmul=0):
 	"""Run specified applications (clustering algorithms) on the specified datasets
 
 	appsmodule  - module with algorithms definitions to be run; sys.modules[__name__]
@@ -565,15 +739,24 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 	datafiles  - target networks to be processed
 	exectime  - elapsed time since the benchmarking started
 	timeout  - timeout per each algorithm execution
+	resume  - resume the interrupted execution according to the journal skipping the completed jobs
+		and retaining their results, otherwise the former results are backed up
+	cache  - restore the cached results of the apps instead of their execution on the same inputs
+	metrics  - port of the HTTP endpoint on the localhost serving the live metrics of the execution
+	sampling  - interval in sec of the sampling of the resources consumption time series of the apps
+		written to the .rts files next to their logs, 0 means no sampling
+	budgets  - time budgets in sec of the jobs of all the apps on each network and of each app
+		on each network: (netbudget, algbudget), 0 means no budget
+	timeoutmul  - multiple of the expected execution time of each app on each network to be its
+		timeout clamped by the timeout, the execution time is predicted by the models of the apps
+		fitted on their former executions (.rcp); 0 means the timeout for all the apps
 	"""
-	assert appsmodule and (datadirs or datafiles) and exectime >= 0 and timeout >= 0, 'Invalid input arguments'
+	assert appsmodule and (datadirs or datafiles) and exectime >= 0 and timeout >= 0 and timeoutmul >= 0, 'Invalid input arguments'
 
 	global _execpool
 
 	assert not _execpool, '_execpool should be clear on algs execution'
 	starttime = time.time()  # Procedure start time
-	if not _execpool:
-		_execpool = ExecPool(max(min(4, cpu_count() - 1), 1))
 
 	def unknownApp(name):
 		"""A stub for the unknown / not implemented apps (algorithms) to be benchmaked
@@ -596,6 +779,19 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 		#algorithms = [alg.lower() for alg in algorithms]
 	execalgs = tuple(execalgs)
 
+	if not _execpool:
+		# Note: each algorithm is bound to a physical core with NUMA-local memory
+		# to have reproducible timings without the migrations between the sockets.
+		# Modules of the Python algorithms are loaded once by the pool for all their jobs.
+		# The adaptive pool is bounded by the physical cores instead of the fixed 4 workers.
+		# The algorithms share the workers equally, so the fast ones are completed early on all networks
+		workers = max(len(cpuTopology()) - 1, 1) if _adaptive else max(min(4, cpu_count() - 1), 1)
+		_execpool = ExecPool(workers, _MEMLIMIT, affinity='core', numa=True
+			, journal=_JOURNAL, resume=resume, preload=[appsmodule.PYMODULES[alg.lower()]
+			for alg in algorithms if alg.lower() in getattr(appsmodule, 'PYMODULES', {})]
+			, cache=_CACHEDIR if cache else None, status=_STATUS, metrics=metrics, sampling=sampling
+			, trace=_tracer, adaptive=_adaptive, shares={}, agents=_agents, staging=_staging)
+
 	def execute(net, asym, pathid=''):
 		"""Execute algorithms on the specified network counting number of ran jobs
 
@@ -606,9 +802,16 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 		return
 			jobsnum  - number of scheduled jobs
 		"""
+		# Note: the jobs of each app on the network are constrained by the time budgets of the app
+		# and of all the apps on the network, their remained jobs are dropped on the expiration
+		netname = os.path.splitext(os.path.split(net)[1])[0] + pathid
+		nettask = Task(netname, timeout=budgets[0]) if budgets[0] else None
 		for ealg in execalgs:
+			apptask = None
+			if budgets[1] or nettask:
+				apptask = Task(_SEPNAMEPART.join((funcToAppName(ealg.__name__), netname)), timeout=budgets[1], task=nettask)
 			try:
-				jobsnum = ealg(_execpool, net, asym, timeout, pathid)
+				jobsnum = ealg(_execpool, net, asym, timeout, pathid, apptask=apptask)
 			except StandardError as err:
 				jobsnum = 0
 				errexectime = time.time() - exectime
@@ -632,8 +835,11 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 		if not os.path.getsize(pathidsMap):
 			fpid.write('# ID(#)\tPath\n')  # Note: buffer flushing is not nesessary here, beause the execution is not concurrent
 		fpid.write('# --- {} ---\n'.format(datetime.utcnow()))  # Write timestamp
-	jobsnum = 0  # Number of the processed network jobs (can be a few per each algorithm per each network)
-	netcount = 0  # Number of networks to be processed
+	jobscnt = [0, 0]  # Number of the scheduled jobs and processed networks
+
+	# Note: the networks are listed beforehand to schedule the apps on the largest networks first,
+	# since the pool orders the jobs by their expected cost only within its scheduling window
+	nets = []  # Networks to be processed: (net, asym, pathid)
 	# Track processed file names to resolve cases when files with the same name present in different input dirs
 	filenames = set()
 	for pathid, (asym, ddir) in enumerate(datadirs):
@@ -647,9 +853,7 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 			else:
 				ambiguous = True
 				tracePath = True
-			tnum = execute(net, asym, pathid if ambiguous else '')
-			jobsnum += tnum
-			netcount += tnum != 0
+			nets.append((net, asym, pathid if ambiguous else ''))
 		if tracePath:
 			fpid.write('{}\t{}\n'.format(pathid[1:], ddir))  # Skip the separator symbol
 	for pathid, (asym, net) in enumerate(datafiles):
@@ -661,23 +865,38 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 		else:
 			ambiguous = True
 			fpid.write('{}\t{}\n'.format(pathid[1:], net))  # Skip the separator symbol
-		tnum = execute(net, asym, pathid if ambiguous else '')
-		jobsnum += tnum
-		netcount += tnum != 0
+		nets.append((net, asym, pathid if ambiguous else ''))
+	# Note: the size of the network file is used to not parse the networks before their processing,
+	# the sorting is stable, so the networks of the same size retain their order
+	nets.sort(key=lambda netinf: os.path.getsize(netinf[0]) if os.path.exists(netinf[0]) else 0, reverse=True)
+
+	def schedule():
+		"""Schedule the apps on each network lazily on demand of the execution pool"""
+		for net, asym, pathid in nets:
+			tnum = execute(net, asym, pathid)
+			jobscnt[0] += tnum
+			jobscnt[1] += tnum != 0
+			yield None
+
+	# Note: the jobs are scheduled by the pool when the workers become free to bound the memory consumption
+	netcount = len(nets)
+	if timeoutmul and hasattr(appsmodule, 'adaptTimeouts'):
+		# Note: the sizes of all the networks are required to fit the execution time models of the apps
+		appsmodule.adaptTimeouts(timeoutmul, (net for net, asym, pathid in nets))
+	if _execpool:
+		_execpool.feed(schedule())
+		timelim = min(timeout * netcount * len(execalgs), 5 * 24*60*60)  # Global timeout, up to N days
+		print('Waiting for the apps execution on {} networks'
+			' with {} sec ({} h {} m {:.4f} s) timeout ...'.format(netcount, timelim, *secondsToHms(timelim)))
+		_execpool.join(timelim)
+		_execpool = None
+		print('{} jobs are executed on {} networks'.format(*jobscnt))
 	# Flush resulting buffer
 	if fpid:
 		if fpid is not sys.stdout:
 			fpid.close()
 		else:
 			fpid.flush()
-	filenames = None  # Free memory from filenames
-
-	if _execpool:
-		timelim = min(timeout * jobsnum, 5 * 24*60*60)  # Global timeout, up to N days
-		print('Waiting for the apps execution on {} jobs from {} networks'
-			' with {} sec ({} h {} m {:.4f} s) timeout ...'.format(jobsnum, netcount, timelim, *secondsToHms(timelim)))
-		_execpool.join(timelim)
-		_execpool = None
 	starttime = time.time() - starttime
 	print('The apps execution is successfully completed in {:.4f} sec ({} h {} m {:.4f} s)'
 		.format(starttime, *secondsToHms(starttime)))
@@ -686,7 +905,8 @@ def runApps(appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
 	print('Execution statistics aggregated')
 
 
-def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime, timeout):
+def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime, timeout, cache=False, metrics=None
+, budgets=(0, 0)):
 	"""Run specified applications (clustering algorithms) on the specified datasets
 
 	evalres  - evaluation flags: 0 - Skip evaluations, 1 - NMI, 2 - NMI_s, 4 - Q (modularity), 7 - all measures
@@ -696,6 +916,10 @@ def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime,
 	datafiles  - target networks to be processed
 	exectime  - elapsed time since the benchmarking started
 	timeout  - timeout per each evaluation run
+	cache  - restore the cached evaluations instead of their execution on the same inputs
+	metrics  - port of the HTTP endpoint on the localhost serving the live metrics of the evaluations
+	budgets  - time budgets in sec of the evaluations of all the algorithms on each base file
+		and of each algorithm on each base file: (netbudget, algbudget), 0 means no budget
 	"""
 	assert (evalres and appsmodule and (datadirs or datafiles) and exectime >= 0
 		and timeout >= 0), 'Invalid input arguments'
@@ -705,75 +929,99 @@ def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime,
 	assert not _execpool, '_execpool should be clear on algs evaluation'
 	starttime = time.time()  # Procedure start time
 	if not _execpool:
-		_execpool = ExecPool(max(cpu_count() - 1, 1))
+		# Note: the affinity bounds the threads of the multithreaded evaluation apps by their slots.
+		# Tiny evaluations of the clusterings on the same base file are batched
+		_execpool = ExecPool(max(cpu_count() - 1, 1), affinity='cpu', batch=_EVALBATCH
+			, cache=_CACHEDIR if cache else None, status=_STATUS, metrics=metrics, trace=_tracer
+			, adaptive=_adaptive)
 
 	# Measures is a dict with the Array values: <evalcallback_prefix>, <grounttruthnet_extension>, <measure_name>
 	measures = {3: ['nmi', _EXTCLNODES, 'NMIs'], 4: ['mod', '.hig', 'Q']}
 	evaggs = []  # Evaluation results aggregators
-	for im, msr in measures.items():
-		# Evaluate only required measures
-		if evalres & im == 0:
-			continue
-		if im == 3:
-			# Exclude NMI if it is aplied, but evalres & 1 == 0
-			if evalres & 1 == 0:
-				msr[0] = 'nmi_s'
-				msr[2] = 'NMI_s'
-			elif evalres & 2 == 0:
-				msr[2] = 'NMI'
-			else:
-				evagg_s = EvalsAgg('nmi_s')  # Reserve also second results aggregator for nmi_s
-				evaggs.append(evagg_s)
-		evagg = EvalsAgg(msr[0])  # Evaluation results aggregator
-		evaggs.append(evagg)
-
-		if not algorithms:
-			# Fetch available algorithms
-			ianame = len(_PREFEXEC)  # Index of the algorithm name start
-			evalalgs = [funcname[ianame:].lower() for funcname in dir(appsmodule) if func.startswith(_PREFEXEC)]
-		else:
-			evalalgs = [alg.lower() for alg in algorithms]
-		evalalgs = tuple(evalalgs)
 
-		def evaluate(measure, basefile, asym, jobsnum, pathid=''):
-			"""Evaluate algorithms on the specified network
-
-			measure  - target measure to be evaluated: {nmi, mod}
-			basefile  - ground truth result, or initial network file or another measure-related file
-			asym  - network links weights are asymmetric (in/outbound weights can be different)
-			jobsnum  - accumulated number of scheduled jobs
-			pathid  - path id of the basefile to distinguish files with the same name located in different dirs
-				Note: pathid includes pathid separator
-
-			return
-				jobsnum  - updated accumulated number of scheduled jobs
-			"""
-			assert not pathid or pathid[0] == _SEPPATHID, 'pathid must include pathid separator'
-
-			for algname in evalalgs:
-				try:
-					evalAlgorithm(_execpool, algname, basefile, measure, timeout, evagg, pathid)
-					## Evaluate also nmi_s besides nmi if required
-					if evalres & im == 3:
-					#if measure == 'nmi':
-						evalAlgorithm(_execpool, algname, basefile, 'nmi_s', timeout, evagg_s, pathid)
-				except StandardError as err:
-					print('WARNING, "{}" evaluation of "{}" is interrupted by the exception: {}. {}'
-						.format(measure, algname, err, traceback.format_exc()), file=sys.stderr)
+	def schedule():
+		"""Schedule the evaluations of each base file lazily on demand of the execution pool"""
+		for im, msr in measures.items():
+			# Evaluate only required measures
+			if evalres & im == 0:
+				continue
+			if im == 3:
+				# Exclude NMI if it is aplied, but evalres & 1 == 0
+				if evalres & 1 == 0:
+					msr[0] = 'nmi_s'
+					msr[2] = 'NMI_s'
+				elif evalres & 2 == 0:
+					msr[2] = 'NMI'
 				else:
-					jobsnum += 1
-			return jobsnum
-
-		print('Starting {} evaluation...'.format(msr[2]))
-		jobsnum = 0
-		measure = msr[0]
-		fileext = msr[1]  # Initial networks in .hig formatare required for mod, clusters for NMIs
-		# Track processed file names to resolve cases when files with the same name present in different input dirs
-		filenames = set()
-		for pathid, (asym, ddir) in enumerate(datadirs):
-			pathid = _SEPPATHID + str(pathid)
-			# Read ground truth
-			for basefile in glob.iglob('*'.join((ddir, fileext))):  # Allow wildcards in the names
+					evagg_s = EvalsAgg('nmi_s')  # Reserve also second results aggregator for nmi_s
+					evaggs.append(evagg_s)
+			evagg = EvalsAgg(msr[0])  # Evaluation results aggregator
+			evaggs.append(evagg)
+
+			if not algorithms:
+				# Fetch available algorithms
+				ianame = len(_PREFEXEC)  # Index of the algorithm name start
+				evalalgs = [funcname[ianame:].lower() for funcname in dir(appsmodule) if func.startswith(_PREFEXEC)]
+			else:
+				evalalgs = [alg.lower() for alg in algorithms]
+			evalalgs = tuple(evalalgs)
+
+			def evaluate(measure, basefile, asym, jobsnum, pathid=''):
+				"""Evaluate algorithms on the specified network
+
+				measure  - target measure to be evaluated: {nmi, mod}
+				basefile  - ground truth result, or initial network file or another measure-related file
+				asym  - network links weights are asymmetric (in/outbound weights can be different)
+				jobsnum  - accumulated number of scheduled jobs
+				pathid  - path id of the basefile to distinguish files with the same name located in different dirs
+					Note: pathid includes pathid separator
+
+				return
+					jobsnum  - updated accumulated number of scheduled jobs
+				"""
+				assert not pathid or pathid[0] == _SEPPATHID, 'pathid must include pathid separator'
+
+				netname = os.path.splitext(os.path.split(basefile)[1])[0] + pathid
+				nettask = Task(netname, timeout=budgets[0]) if budgets[0] else None
+				for algname in evalalgs:
+					apptask = None
+					if budgets[1] or nettask:
+						apptask = Task(_SEPNAMEPART.join((algname, netname)), timeout=budgets[1], task=nettask)
+					try:
+						evalAlgorithm(_execpool, algname, basefile, measure, timeout, evagg, pathid, apptask)
+						## Evaluate also nmi_s besides nmi if required
+						if evalres & im == 3:
+						#if measure == 'nmi':
+							evalAlgorithm(_execpool, algname, basefile, 'nmi_s', timeout, evagg_s, pathid, apptask)
+					except StandardError as err:
+						print('WARNING, "{}" evaluation of "{}" is interrupted by the exception: {}. {}'
+							.format(measure, algname, err, traceback.format_exc()), file=sys.stderr)
+					else:
+						jobsnum += 1
+				return jobsnum
+
+			print('Starting {} evaluation...'.format(msr[2]))
+			jobsnum = 0
+			measure = msr[0]
+			fileext = msr[1]  # Initial networks in .hig formatare required for mod, clusters for NMIs
+			# Track processed file names to resolve cases when files with the same name present in different input dirs
+			filenames = set()
+			for pathid, (asym, ddir) in enumerate(datadirs):
+				pathid = _SEPPATHID + str(pathid)
+				# Read ground truth
+				for basefile in glob.iglob('*'.join((ddir, fileext))):  # Allow wildcards in the names
+					netname = os.path.split(basefile)[1]
+					ambiguous = False  # Net name is unambigues even without the dir
+					if netname not in filenames:
+						filenames.add(netname)
+					else:
+						ambiguous = True
+					evaluate(measure, basefile, asym, jobsnum, pathid if ambiguous else '')
+					yield None
+			for pathid, (asym, basefile) in enumerate(datafiles):
+				pathid = ''.join((_SEPPATHID, _PATHID_FILE, str(pathid)))
+				# Use files with required extension
+				basefile = os.path.splitext(basefile)[0] + fileext
 				netname = os.path.split(basefile)[1]
 				ambiguous = False  # Net name is unambigues even without the dir
 				if netname not in filenames:
@@ -781,22 +1029,22 @@ def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime,
 				else:
 					ambiguous = True
 				evaluate(measure, basefile, asym, jobsnum, pathid if ambiguous else '')
-		for pathid, (asym, basefile) in enumerate(datafiles):
-			pathid = ''.join((_SEPPATHID, _PATHID_FILE, str(pathid)))
-			# Use files with required extension
-			basefile = os.path.splitext(basefile)[0] + fileext
-			netname = os.path.split(basefile)[1]
-			ambiguous = False  # Net name is unambigues even without the dir
-			if netname not in filenames:
-				filenames.add(netname)
-			else:
-				ambiguous = True
-			evaluate(basefile, asym, jobsnum, pathid if ambiguous else '')
-		print('{} evaluation is scheduled'.format(msr[2]))
-		filenames = None  # Free memory from filenames
+				yield None
+			print('{} evaluation is scheduled'.format(msr[2]))
+			filenames = None  # Free memory from filenames
 
 	if _execpool:
-		timelim = min(timeout * jobsnum, 5 * 24*60*60)  # Global timeout, up to N days
+		# Note: the evaluations are scheduled by the pool when the workers become free to bound the memory consumption
+		_execpool.feed(schedule())
+		# Evaluations of each algorithm on each base file of each measure, nmi and nmi_s are evaluated separately
+		evalsnum = 0
+		for im, msr in measures.items():
+			if evalres & im:
+				evalsnum += (sum(1 for asym, ddir in datadirs for basefile in glob.iglob('*'.join((ddir, msr[1]))))
+					+ len(datafiles)) * (2 if evalres & im == 3 else 1)
+		algsnum = len(algorithms) if algorithms else sum(1 for funcname in dir(appsmodule)
+			if funcname.startswith(_PREFEXEC))
+		timelim = min(timeout * evalsnum * algsnum, 5 * 24*60*60)  # Global timeout, up to N days
 		try:
 			_execpool.join(max(timelim, exectime * 2))  # Twice the time of algorithms execution
 		except StandardError as err:
@@ -817,21 +1065,47 @@ def evalResults(evalres, appsmodule, algorithms, datadirs, datafiles, exectime,
 		.format(starttime, *secondsToHms(starttime)))
 
 
+@contextmanager
+def stage(name):
+	"""Trace the span of the benchmarking stage if the tracing is enabled
+
+	name  - name of the stage
+	"""
+	if _tracer:
+		with _tracer.span(name):
+			yield
+	else:
+		yield
+
+
 def benchmark(*args):
 	"""Execute the benchmark
 
 	Run the algorithms on the specified datasets respecting the parameters.
 	"""
+	global _tracer
+	global _adaptive
+	global _agents
+	global _staging
+
 	exectime = time.time()  # Benchmarking start time
 
-	gensynt, netins, shufnum, syntdir, convnets, runalgs, evalres, datas, timeout, algorithms, aggrespaths = parseParams(args)
+	(gensynt, netins, shufnum, syntdir, convnets, runalgs, resume, cache, metrics, sampling, trace, adaptive, agents
+		, staging, evalres, datas, timeout, timeoutmul, budgets, algorithms, aggrespaths) = parseParams(args)
 	print('The benchmark is started, parsed params:\n\tgensynt: {}\n\tsyntdir: {}\n\tconvnets: 0b{:b}'
-		'\n\trunalgs: {}\n\tevalres: 0b{:b}\n\tdatas: {}\n\ttimeout (h, min, sec): {}\n\talgorithms: {},\n\taggrespaths: {}'
-		.format(gensynt, syntdir, convnets, runalgs, evalres
-			, ', '.join(['{}{}{}'.format('' if not asym else 'asym: ', path, ' (gendir)' if gen else '')
+		'\n\trunalgs: {}\n\tresume: {}\n\tcache: {}\n\tmetrics: {}\n\tsampling: {}\n\ttrace: {}\n\tadaptive: {}'
+		'\n\tagents: {}\n\tstaging: {}\n\tevalres: 0b{:b}\n\tdatas: {}\n\ttimeout (h, min, sec): {}\n\ttimeoutmul: {}\n\tbudgets (network, algorithm): {}'
+		'\n\talgorithms: {},\n\taggrespaths: {}'
+		.format(gensynt, syntdir, convnets, runalgs, resume, cache, metrics, sampling, trace, adaptive
+			, ', '.join(agents), staging, evalres, ', '.join(['{}{}{}'.format('' if not asym else 'asym: ', path, ' (gendir)' if gen else '')
 				for asym, path, gen in datas])
-			, secondsToHms(timeout), ', '.join(algorithms) if algorithms else ''
+			, secondsToHms(timeout), timeoutmul, budgets, ', '.join(algorithms) if algorithms else ''
 			, ', '.join(aggrespaths) if aggrespaths else ''))
+	if trace:
+		_tracer = Tracer(trace)
+	_adaptive = 1 if adaptive else 0
+	_agents = agents
+	_staging = staging
 	# Make syntdir and link there lfr benchmark bin if required
 	bmname = 'lfrbench_udwov'  # Benchmark name
 	benchpath = syntdir + bmname  # Benchmark path
@@ -845,9 +1119,13 @@ def benchmark(*args):
 	datas = None
 	#print('Datadirs: ', datadirs)
 
+	netjobs = None  # Jobs generating the networks
+	jobstimeout = 0  # Timeout of the generating jobs
 	if gensynt and netins >= 1:
 		# gensynt:  0 - do not generate, 1 - only if not exists, 2 - forced generation
-		generateNets(benchpath, syntdir, gensynt == 2, netins)
+		# Note: the generated networks are converted on their generation without waiting for the others
+		with stage('generateNets'):
+			netjobs, jobstimeout = generateNets(benchpath, syntdir, gensynt == 2, netins, join=not (convnets or shufnum))
 
 	# Update datasets with sythetic generated
 	# Note: should be done only after the genertion, because new directories can be created
@@ -856,26 +1134,43 @@ def benchmark(*args):
 
 	# convnets: 0 - do not convert, 0b01 - only if not exists, 0b11 - forced conversion, 0b100 - resolve duplicated links
 	if convnets:
-		for asym, ddir in datadirs:
-			convertNets(ddir, asym, convnets&0b11 == 0b11, convnets&0b100)
-		for asym, dfile in datafiles:
-			convertNet(dfile, asym, convnets&0b11 == 0b11, convnets&0b100)
-
-	# Conversion should be performed after the shuffling because there is no need to convert shuffles
+		with stage('convertNets'):
+			# Note: the converted networks are shuffled on their conversion without waiting for the others
+			for asym, ddir in datadirs:
+				netjobs, jobstimeout = convertNets(ddir, asym, convnets&0b11 == 0b11, convnets&0b100
+					, netjobs=netjobs, jobstimeout=jobstimeout, join=False)
+			for asym, dfile in datafiles:
+				job = convertNet(dfile, asym, convnets&0b11 == 0b11, convnets&0b100)
+				if job:
+					netjobs = netjobs or {}
+					netjobs[dfile] = job
+			jobstimeout += 3 * 60 * len(datafiles)  # Conversion timeout of each network file
+			if not shufnum:
+				joinPool(jobstimeout)
+
+	# Note: the shuffles are not converted, the shuffling is chained with the conversion of its network
 	if shufnum:
-		shuffleNets(datadirs, datafiles, shufnum, gensynt == 2)
+		with stage('shuffleNets'):
+			shuffleNets(datadirs, datafiles, shufnum, gensynt == 2, netjobs=netjobs, jobstimeout=jobstimeout)
 
 	# Run the algorithms and measure their resource consumption
 	if runalgs:
-		runApps(benchapps, algorithms, datadirs, datafiles, exectime, timeout)
+		with stage('runApps'):
+			runApps(benchapps, algorithms, datadirs, datafiles, exectime, timeout, resume, cache, metrics, sampling
+				, budgets, timeoutmul)
 
 	# Evaluate results
 	if evalres:
-		evalResults(evalres, benchapps, algorithms, datadirs, datafiles, exectime, timeout)
+		with stage('evalResults'):
+			evalResults(evalres, benchapps, algorithms, datadirs, datafiles, exectime, timeout, cache, metrics, budgets)
 
 	if aggrespaths:
-		aggEvaluations(aggrespaths)
+		with stage('aggEvaluations'):
+			aggEvaluations(aggrespaths)
 
+	if _tracer:
+		_tracer.close()
+		_tracer = None
 	exectime = time.time() - exectime
 	print('The benchmark is completed in{:.4f} sec ({} h {} m {:.4f} s)'
 		.format(exectime, *secondsToHms(exectime)))
@@ -905,7 +1200,7 @@ if __name__ == '__main__':
 		benchmark(*sys.argv[1:])
 	else:
 		print('\n'.join(('Usage: {0} [-g[f][=[<number>][.<shuffles_number>][=<outpdir>]] [-c[f][r]] [-a="app1 app2 ..."]'
-			' [-r] [-e[n][s][e][m]] [-d[g]{{a,s}}=<datasets_dir>] [-f[g]{{a,s}}=<dataset>] [-s=<eval_path>] [-t[{{s,m,h}}]=<timeout>]',
+			' [-r [--resume]] [--cache] [--metrics[=<port>]] [--sample[=<interval>]] [--trace[=<file>]] [--adaptive] [--agents=<host[:port]>[,...] [--staging]] [-e[n][s][e][m]] [-d[g]{{a,s}}=<datasets_dir>] [-f[g]{{a,s}}=<dataset>] [-s=<eval_path>] [-t[{{s,m,h}}]=<timeout> [--adapt-timeouts[=<multiple>]]] [-b[{{s,m,h}}]{{n,a}}=<budget>]',
 			'Parameters:',
 			'  -g[f][=[<number>][.<shuffles_number>][=<outpdir>]]  - generate <number> ({synetsnum} by default) >= 0'
 			' synthetic datasets in the <outpdir> ("{syntdir}" by default), shuffling each <shuffles_number>'
@@ -925,6 +1220,28 @@ if __name__ == '__main__':
 			' Impacts {{r, e}} options. Optional, all apps are executed by default.',
 			'  NOTE: output results are stored in the "algorithms/<algname>outp/" directory',
 			'  -r  - run the benchmarking apps on the prepared data',
+			'  --resume  - resume the interrupted execution of the apps skipping the completed jobs according to'
+			' the journal "{journal}" and retaining their results instead of the backup',
+			'  --cache  - restore the cached results of the apps and evaluations having the same executable, args'
+			' and content of the input files instead of their execution, the cache is stored in "{cachedir}"',
+			'  --metrics[=<port>]  - serve the live metrics of the apps and evaluations (queue, running jobs,'
+			' utilization, completion rate, ETA) in the Prometheus text format on the localhost:<port>'
+			' ({metricsport} by default), the JSON snapshot is served on the /status path and is always'
+			' written to "{status}"',
+			'  --sample[=<interval>]  - sample the resources consumption time series of the apps (CPU utilization, RSS,'
+			' storage IO, threads including their child processes) each <interval> sec ({sampling} by default) into the'
+			' .rts files next to their logs',
+			'  --trace[=<file>]  - trace the timeline of the benchmarking stages and jobs (queuing, execution on the worker'
+			' slots, timeouts) into the <file> ("{trace}" by default) in the Chrome trace-event format to be viewed'
+			' by chrome://tracing or Perfetto',
+			'  --adaptive  - adapt the number of the workers to the load of the host (load average, CPU, memory and IO'
+			' pressure, available memory trend) up to all the cores, otherwise the number of the workers is fixed',
+			'  --agents=<host[:port]>[,<host[:port]>...]  - execute the apps also by the remote worker agents'
+			' (contrib/mpeagent.py, port {agentport} by default) started on the cluster nodes in the benchmark'
+			' directory, which is shared or replicated with the same executables. The agents are authenticated by'
+			' the shared secret token specified by the {agenttoken} environment variable',
+			'    --staging  - transfer the input networks to the agents and fetch the resulting clusterings back'
+			' instead of the shared file system',
 			#'    Xf  - force execution even when the results already exists (existent datasets are moved to backup)',
 			'  -e[X]  - evaluate quality of the results. Default: apply all measurements',
 			#'    Xf  - force execution even when the results already exists (existent datasets are moved to backup)',
@@ -957,5 +1274,19 @@ if __name__ == '__main__':
 			'    Xs  - time in seconds. Default option',
 			'    Xm  - time in minutes',
 			'    Xh  - time in hours',
+			'    --adapt-timeouts[=<multiple>]  - set the timeout of each app on each network to the <multiple>'
+			' ({timeoutmul} by default) of its execution time, which is predicted by the models of the apps (time as a'
+			' function of the network links) fitted on their former executions ({resdir}<app>{extexectime}), clamped by'
+			' the timeout above and at least {timeoutmin} sec. The timeout above is used for the unpredictable executions',
+			'  -b[X]{{n,a}}=<float_number>  - specifies the time budget of all the jobs of the benchmarking applications'
+			' (evaluations) on each network (n) or of each application on each network (a) in sec, min or hours.'
+			' The remained jobs are dropped and the executing ones are terminated on the budget expiration.'
+			' Default: 0 sec  - no budget',
+			'    Xs  - time in seconds. Default option',
+			'    Xm  - time in minutes',
+			'    Xh  - time in hours',
 			)).format(sys.argv[0], syntdir=_SYNTDIR, synetsnum=_SYNTINUM, netsdir=_NETSDIR, sepinst=_SEPINST
-				, seppars=_SEPPARS, extnetfile=_EXTNETFILE))
+				, seppars=_SEPPARS, extnetfile=_EXTNETFILE, journal=_JOURNAL, cachedir=_CACHEDIR
+				, metricsport=_METRICSPORT, status=_STATUS, sampling=_SAMPLING
+				, trace=_TRACE, agentport=_AGENTPORT, agenttoken=_AGENTTOKEN, timeoutmul=_TIMEOUTMUL, resdir=_RESDIR
+				, extexectime=_EXTEXECTIME, timeoutmin=benchapps._TIMEOUTMIN))
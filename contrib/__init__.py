@@ -1 +1 @@
-__all__ = ['mpepool.py', 'tohig.py']
+__all__ = ['mpepool.py', 'mpeagent.py', 'tohig.py']
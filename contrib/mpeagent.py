@@ -0,0 +1,459 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+\descr:  Worker agent of the Multi-Process Execution Pool (mpepool.py) executing the jobs
+	of the remote pools on its host, extending the worker slots of the pools with the slots
+	of the agents started on the cluster nodes:
+	- the jobs are executed in the root directory of the agent, which is either the working
+		directory of the pool on the shared file system or its replica, where the inputs of
+		the jobs are staged by the pool and their outputs are fetched back on the completion
+	- timeout and resources limits of the jobs are enforced by the agent, the jobs are terminated
+		on the signals of the pool and killed on the disconnection of the pool
+	- output channels and resources consumption of the jobs are transferred to the pool,
+		which writes the .rcp of the jobs
+
+	The pool and the agent exchange the JSON messages one per line over TCP, authenticating each other
+	by the HMAC-SHA256 of the challenges (nonce) with the shared secret token on the connection:
+	agent: {op: 'hello', nonce}
+	pool: {op: 'auth', digest, nonce}
+	agent: {op: 'ready', slots, digest}
+	pool: {op: 'start', id, name, workdir, args, timeout, slots, vmemlim, datalim, cpulim, channels
+		[, inputs, dirs, fetch]}, {op: 'signal', id, sig}
+	agent: {op: 'started', id, pid}, {op: 'output', id, chnl, data}
+		, {op: 'done', id, returncode, exectime, rusage, termcause[, outputs]}
+
+\author: (c) Artem Lutov <artem@exascale.info>
+\organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>, ScienceWise <http://sciencewise.info/>
+\date: 2015-07
+"""
+
+from __future__ import print_function  # Required for stderr output, must be the first import
+import sys
+import time
+import subprocess
+import os
+import signal
+import select
+import fcntl
+import errno
+import socket
+import traceback
+import base64
+import tarfile
+import hmac
+
+from multiprocessing import cpu_count
+from subprocess import PIPE
+from subprocess import STDOUT
+
+from mpepool import Job
+from mpepool import _Channel
+from mpepool import _packPaths
+from mpepool import _unpackPaths
+from mpepool import _AGENTPORT
+from mpepool import _AGENTTIMEOUT
+from mpepool import _AGENTTOKEN
+from mpepool import _AGENTMSGMAX
+from mpepool import _authDigest
+from mpepool import _ownMaxRss
+from mpepool import procRss
+from mpepool import procHwm
+
+
+_KILLGRACE = 3  # Time in sec given to the job process terminated by the timeout before killing it
+_LATENCY = 1  # Max interval in sec between the observations of the RSS peak of the executing jobs
+
+
+class _AgentJob(object):
+	"""Job of the pool executed by the agent"""
+	def __init__(self, chan, msg):
+		"""Start the job process
+
+		chan  - channel of the pool, _Channel
+		msg  - the 'start' message of the pool
+		"""
+		self.chan = chan
+		self.id = msg['id']
+		self.fetch = [str(path) for path in msg.get('fetch', ())]  # Outputs to be transferred to the pool
+		self.termcause = None
+		self.pipes = {}  # Output pipes of the process: fd: (chnl, pipe)
+		# Note: the Job is used only for the resources limits of the process
+		self.job = Job(name=str(msg['name']), workdir=msg['workdir'] and str(msg['workdir'])
+			, args=[str(arg) for arg in msg['args']], timeout=msg['timeout'] or 0
+			, vmemlim=msg['vmemlim'], datalim=msg['datalim'], cpulim=msg['cpulim'])
+		if msg.get('inputs') or self.fetch:
+			# Replace the former outputs of the job by the empty dirs
+			_unpackPaths(msg.get('inputs'), self.fetch)
+			for outp in msg.get('dirs', ()):
+				if not os.path.exists(outp):
+					os.makedirs(outp)
+		outputs = []
+		for chnl in msg['channels']:
+			if chnl == 'send':
+				outputs.append(PIPE)
+			elif chnl == 'merge':
+				outputs.append(STDOUT)
+			else:
+				outputs.append(open(os.devnull, 'w'))
+		env = os.environ.copy()
+		env['OMP_NUM_THREADS'] = str(msg['slots'])
+		self.tstart = time.time()
+		self.deadline = self.tstart + self.job.timeout if self.job.timeout else None
+		self.forkrss = procRss(os.getpid())  # RSS of the agent on the fork of the job process in Mb
+		try:
+			self.proc = subprocess.Popen(self.job.args, bufsize=-1, cwd=self.job.workdir, stdout=outputs[0]
+				, stderr=outputs[1], preexec_fn=self.job._preexec if self.job.vmemlim or self.job.datalim
+				or self.job.cpulim else None, env=env)
+		finally:
+			for outp in outputs:
+				if hasattr(outp, 'close'):
+					outp.close()
+		self.hwm = procHwm(self.proc.pid)  # Max observed VmHWM of the job process after the exec() in Mb
+		for chnl, pipe in ((1, self.proc.stdout), (2, self.proc.stderr)):
+			if not pipe:
+				continue
+			fd = pipe.fileno()
+			fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+			self.pipes[fd] = (chnl, pipe)
+
+
+	def capture(self, fd):
+		"""Transfer the available output of the pipe to the pool
+
+		fd  - file descriptor of the pipe
+
+		return  - whether the pipe is still open
+		"""
+		chnl, pipe = self.pipes[fd]
+		while True:
+			try:
+				data = os.read(fd, 64 * 1024)
+			except OSError as err:
+				if err.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+					return True
+				if err.errno == errno.EINTR:
+					continue
+				data = ''
+			if not data:
+				pipe.close()
+				del self.pipes[fd]
+				return False
+			self.send({'op': 'output', 'id': self.id, 'chnl': chnl, 'data': base64.b64encode(data)})
+
+
+	def send(self, msg):
+		"""Send the message to the pool if it is connected"""
+		if self.chan.closed:
+			return
+		try:
+			self.chan.send(msg)
+		except socket.error as err:
+			print('WARNING, the message of "{}" can not be sent to the pool: {}'.format(self.job.name, err)
+				, file=sys.stderr)
+
+
+class Agent(object):
+	"""Worker agent serving the remote execution pools"""
+	def __init__(self, workers=cpu_count(), port=_AGENTPORT, host='127.0.0.1', token=None):
+		"""Agent constructor
+
+		workers  - number of the worker slots provided to each pool
+		port  - TCP port to listen for the pools
+		host  - interface to listen for the pools, the loopback interface by default,
+			'0.0.0.0' for all the interfaces
+		token  - shared secret token authenticating the pools, the value of the MPEAGENT_TOKEN
+			environment variable by default
+		"""
+		assert workers >= 1, 'At least one worker should be provided by the agent'
+		self._token = token or os.environ.get(_AGENTTOKEN)
+		if not self._token:
+			raise ValueError('the shared secret token of the pools is not specified ({})'.format(_AGENTTOKEN))
+		self.workers = workers
+		self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+		self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+		self._listener.bind((host, port))
+		self._listener.listen(8)
+		self.address = self._listener.getsockname()
+		self._chans = {}  # Connected pools: fd: _Channel
+		self._pending = {}  # Unauthenticated pools: fd: (nonce, deadline)
+		self._jobs = {}  # Executing jobs: pid: _AgentJob
+		self._pipes = {}  # Output pipes of the executing jobs: fd: _AgentJob
+		# Self-pipe to wake up the serving cycle on the job termination (SIGCHLD)
+		self._wakerd, self._wakewr = os.pipe()
+		for fd in (self._wakerd, self._wakewr):
+			fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+			fcntl.fcntl(fd, fcntl.F_SETFD, fcntl.fcntl(fd, fcntl.F_GETFD) | fcntl.FD_CLOEXEC)
+		fcntl.fcntl(self._listener.fileno(), fcntl.F_SETFD
+			, fcntl.fcntl(self._listener.fileno(), fcntl.F_GETFD) | fcntl.FD_CLOEXEC)
+
+
+	def serve(self):
+		"""Serve the pools until the termination of the agent"""
+		signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+		signal.siginterrupt(signal.SIGCHLD, False)
+		signal.set_wakeup_fd(self._wakewr)
+		print('The agent is listening on {}:{} providing {} worker slots'.format(
+			self.address[0], self.address[1], self.workers))
+		try:
+			while True:
+				self.__cycle()
+		finally:
+			for ajob in self._jobs.itervalues():
+				ajob.proc.kill()
+			for chan in self._chans.itervalues():
+				chan.close()
+			self._listener.close()
+
+
+	def __cycle(self):
+		"""Single cycle of the agent: accept the pools, process their messages and the jobs output,
+		complete and terminate the jobs"""
+		deadlines = [ajob.deadline for ajob in self._jobs.itervalues() if ajob.deadline]
+		deadlines.extend(deadline for nonce, deadline in self._pending.itervalues())
+		wait = max(min(deadlines) - time.time(), 0) if deadlines else None
+		if self._jobs and (wait is None or wait > _LATENCY):
+			wait = _LATENCY
+		try:
+			ready = select.select([self._listener, self._wakerd] + self._chans.keys() + self._pipes.keys()
+				, (), (), wait)[0]
+		except select.error as err:
+			if err.args[0] != errno.EINTR:
+				raise
+			ready = ()
+		for fd in ready:
+			if fd is self._listener:
+				self.__accept()
+			elif fd in self._chans:
+				self.__receive(self._chans[fd])
+			elif fd in self._pipes:
+				if not self._pipes[fd].capture(fd):
+					del self._pipes[fd]
+		try:
+			while os.read(self._wakerd, 512):
+				pass
+		except OSError as err:
+			if err.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+				raise
+		for ajob in self._jobs.itervalues():
+			ajob.hwm = max(ajob.hwm, procHwm(ajob.proc.pid))
+		self.__reap()
+		now = time.time()
+		# Reject the pools not authenticated in time
+		for fd, (nonce, deadline) in self._pending.items():
+			if deadline <= now:
+				print('WARNING, the pool is rejected not being authenticated in time', file=sys.stderr)
+				self._chans[fd].close()
+				self.__disconnect(fd)
+		# Terminate the jobs with expired timeouts giving them a grace time before killing
+		for ajob in self._jobs.itervalues():
+			if not ajob.deadline or ajob.deadline > now:
+				continue
+			if ajob.termcause is None:
+				ajob.termcause = 'timeout'
+				ajob.proc.terminate()
+				ajob.deadline = now + _KILLGRACE
+			else:
+				ajob.proc.kill()
+				ajob.deadline = None
+
+
+	def __accept(self):
+		"""Accept the connection of the pool"""
+		try:
+			sock, address = self._listener.accept()
+		except socket.error as err:
+			print('WARNING, the connection of the pool is failed: {}'.format(err), file=sys.stderr)
+			return
+		fcntl.fcntl(sock.fileno(), fcntl.F_SETFD, fcntl.fcntl(sock.fileno(), fcntl.F_GETFD) | fcntl.FD_CLOEXEC)
+		chan = _Channel(sock)
+		chan.limit = _AGENTMSGMAX
+		nonce = base64.b16encode(os.urandom(16))
+		try:
+			chan.send({'op': 'hello', 'nonce': nonce})
+		except socket.error as err:
+			print('WARNING, the connection of the pool is failed: {}'.format(err), file=sys.stderr)
+			chan.close()
+			return
+		self._chans[sock.fileno()] = chan
+		self._pending[sock.fileno()] = (nonce, time.time() + _AGENTTIMEOUT)
+		print('The pool {}:{} is connected'.format(*address))
+
+
+	def __authenticate(self, chan, nonce, msg):
+		"""Authenticate the pool by its 'auth' message replying with the 'ready' message
+
+		chan  - channel of the pool
+		nonce  - the challenge sent to the pool
+		msg  - the message of the pool
+
+		return  - whether the pool is authenticated
+		"""
+		digest = msg.get('digest') if isinstance(msg, dict) and msg.get('op') == 'auth' else None
+		pnonce = msg.get('nonce') if digest else None
+		if not isinstance(digest, basestring) or not isinstance(pnonce, basestring) or not hmac.compare_digest(
+		_authDigest(self._token, nonce), digest.encode('ascii', 'replace')):
+			return False
+		chan.limit = 0
+		chan.send({'op': 'ready', 'slots': self.workers
+			, 'digest': _authDigest(self._token, pnonce.encode('ascii', 'replace'))})
+		print('The pool is authenticated')
+		return True
+
+
+	def __receive(self, chan):
+		"""Process the messages of the pool
+
+		chan  - channel of the pool
+		"""
+		fd = chan.fileno()
+		try:
+			msgs = chan.receive()
+		except ValueError as err:
+			print('WARNING, the pool is rejected sending the invalid message: {}'.format(err), file=sys.stderr)
+			chan.close()
+			msgs = ()
+		for msg in msgs:
+			if fd in self._pending:
+				try:
+					authenticated = self.__authenticate(chan, self._pending.pop(fd)[0], msg)
+				except socket.error:
+					authenticated = False
+				if not authenticated:
+					print('WARNING, the pool is rejected failing the authentication', file=sys.stderr)
+					chan.close()
+					break
+			elif msg['op'] == 'start':
+				self.__start(chan, msg)
+			elif msg['op'] == 'signal':
+				for ajob in self._jobs.itervalues():
+					if ajob.chan is chan and ajob.id == msg['id']:
+						ajob.proc.send_signal(msg['sig'])
+						break
+		if chan.closed:
+			chan.close()
+			self.__disconnect(fd)
+
+
+	def __disconnect(self, fd):
+		"""Forget the closed channel of the pool killing its jobs
+
+		fd  - file descriptor of the channel
+		"""
+		chan = self._chans.pop(fd)
+		self._pending.pop(fd, None)
+		# Kill the jobs of the disconnected pool, they are reaped on the completion
+		for ajob in self._jobs.itervalues():
+			if ajob.chan is chan:
+				ajob.termcause = 'disconnected'
+				ajob.proc.kill()
+		print('The pool is disconnected')
+
+
+	def __start(self, chan, msg):
+		"""Start the job of the pool
+
+		chan  - channel of the pool
+		msg  - the 'start' message
+		"""
+		try:
+			ajob = _AgentJob(chan, msg)
+		except (StandardError, tarfile.TarError) as err:
+			print('ERROR on "{}" execution occurred: {}, skipping the job. {}'.format(
+				msg.get('name'), err, traceback.format_exc()), file=sys.stderr)
+			chan.send({'op': 'done', 'id': msg['id'], 'returncode': -1, 'exectime': 0
+				, 'rusage': (0, 0, 0), 'termcause': 'error'})
+			return
+		self._jobs[ajob.proc.pid] = ajob
+		for fd in ajob.pipes:
+			self._pipes[fd] = ajob
+		ajob.send({'op': 'started', 'id': ajob.id, 'pid': ajob.proc.pid})
+
+
+	def __reap(self):
+		"""Complete the terminated jobs reporting their results to the pools"""
+		while self._jobs:
+			try:
+				pid, status, rusage = os.wait4(-1, os.WNOHANG)
+			except OSError as err:
+				if err.errno == errno.EINTR:
+					continue
+				if err.errno != errno.ECHILD:
+					raise
+				break
+			if not pid:
+				break
+			ajob = self._jobs.pop(pid, None)
+			if not ajob:
+				continue
+			ajob.proc.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+			exectime = time.time() - ajob.tstart
+			# Transfer the remained output
+			for fd in ajob.pipes.keys():
+				ajob.capture(fd)
+				if fd in ajob.pipes:
+					# Note: the pipe can be held by the detached descendants of the job
+					ajob.pipes.pop(fd)[1].close()
+				del self._pipes[fd]
+			rusage = _ownMaxRss(rusage, ajob.forkrss, ajob.hwm)
+			msg = {'op': 'done', 'id': ajob.id, 'returncode': ajob.proc.returncode, 'exectime': exectime
+				, 'rusage': (rusage.ru_utime, rusage.ru_stime, rusage.ru_maxrss), 'termcause': ajob.termcause}
+			if ajob.fetch and not ajob.chan.closed:
+				try:
+					msg['outputs'] = _packPaths(ajob.fetch)
+				except (tarfile.TarError, IOError, OSError) as err:
+					print('ERROR, outputs of "{}" can not be packed: {}'.format(ajob.job.name, err)
+						, file=sys.stderr)
+			ajob.send(msg)
+
+
+def parseArgs(args):
+	"""Parse the arguments of the agent
+
+	return  - workers, port, host, rootdir, token
+	"""
+	workers = cpu_count()
+	port = _AGENTPORT
+	host = '127.0.0.1'
+	rootdir = None
+	token = None
+	for arg in args:
+		if len(arg) < 4 or arg[0] != '-' or arg[2] != '=':
+			raise ValueError('Unexpected argument: ' + arg)
+		if arg[1] == 'w':
+			workers = int(arg[3:])
+		elif arg[1] == 'p':
+			port = int(arg[3:])
+		elif arg[1] == 'b':
+			host = arg[3:]
+		elif arg[1] == 'r':
+			rootdir = arg[3:]
+		elif arg[1] == 'k':
+			# Note: the token is not passed by the argument itself to not expose it in the processes list
+			with open(arg[3:], 'r') as ftoken:
+				token = ftoken.read().strip()
+		else:
+			raise ValueError('Unexpected argument: ' + arg)
+	return workers, port, host, rootdir, token
+
+
+if __name__ == '__main__':
+	if len(sys.argv) >= 2 and sys.argv[1] in ('-h', '--help'):
+		print('\n'.join(('Usage: {0} [-w=<workers>] [-p=<port>] [-b=<host>] [-r=<rootdir>] [-k=<keyfile>]',
+			'Worker agent executing the jobs of the remote execution pools (ExecPool(agents=...)).',
+			'Parameters:',
+			'  -w=<workers>  - number of the worker slots provided to each pool, all the CPUs ({workers}) by default',
+			'  -p=<port>  - TCP port to listen for the pools, {port} by default',
+			'  -b=<host>  - interface to listen for the pools, {host} by default, 0.0.0.0 for all the interfaces',
+			'  -r=<rootdir>  - root directory of the jobs: the working directory of the pools on the shared'
+			' file system or its replica having the same executables, the current directory by default',
+			'  -k=<keyfile>  - file of the shared secret token authenticating the pools, the {token}'
+			' environment variable by default. The token is required and should be the same for the pools',
+			)).format(sys.argv[0], workers=cpu_count(), port=_AGENTPORT, host='127.0.0.1', token=_AGENTTOKEN))
+	else:
+		workers, port, host, rootdir, token = parseArgs(sys.argv[1:])
+		agent = Agent(workers, port, host, token)
+		if rootdir:
+			os.chdir(rootdir)
+		signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+		agent.serve()
@@ -21,11 +21,31 @@ from __future__ import print_function  # Required for stderr output, must be the
 import sys
 import time
 import subprocess
-import collections
 import os
 import ctypes  # Required for the multiprocessing Value definition
 import types  # Required for instance methods definition
 import traceback  # Stacktrace
+import signal  # Wake up the execution cycle on the workers termination (SIGCHLD)
+import select  # Wait for the workers termination events
+import fcntl  # Non-blocking self-pipe
+import errno
+import heapq  # Heap of the jobs deadlines
+import itertools
+import resource  # Limits of the workers resources
+import glob  # CPU topology enumeration
+import ctypes.util  # CPU affinity of the workers
+import distutils.spawn  # Lookup of the numactl utility
+import hashlib  # Fingerprints of the jobs in the journal
+import tempfile  # Capturing of the jobs output
+import importlib  # Preloading of the modules for the Python callable jobs
+import tarfile  # Entries of the results cache
+import json  # Metadata of the cached results
+import shutil
+import io
+import socket  # HTTP endpoint of the live metrics, connections to the worker agents
+import contextlib
+import base64  # Transfer of the files and output of the jobs executed by the worker agents
+import hmac  # Authentication of the pools and the worker agents
 
 from multiprocessing import cpu_count
 from multiprocessing import Value
@@ -33,7 +53,316 @@ from subprocess import PIPE
 from subprocess import STDOUT
 
 
+# Public API of the execution pool, the modules and the helpers imported by the pool are not exported
+__all__ = ['ExecPool', 'Job', 'Task', 'Journal', 'Cache', 'Status', 'Tracer', 'PIPE', 'STDOUT', 'DEBUG_TRACE'
+	, 'procRss', 'procHwm', 'procVmPeak', 'procStats', 'procIo', 'procPressure', 'memAvailable'
+	, 'cpuAffinity', 'setCpuAffinity', 'cpuTopology', 'secondsToHms']
+
 DEBUG_TRACE = False  # Trace start / stop and other events to stderr
+# Header of the Resource Consumption Profile (.rcp) of the jobs, compatible with the exectime output
+_RCPHEADER = '# ExecTime(sec)\tCPU_time(sec)\tCPU_usr(sec)\tCPU_kern(sec)\tRSS_RAM_peak(Mb)\tTaskName\n'
+# Marker of the .rcp rows having the own RSS peak of the jobs (see _ownMaxRss), the former rows
+# include the RSS of the forking pool process
+_RCPOWNRSS = '# RSS_RAM_peak is the own peak of the job process excluding the memory of the execution pool\n'
+_RSSFORKMARGIN = 4  # Max RSS in Mb gained by the forked process before the exec() besides the RSS of the pool
+_RSSFORKTOL = 0.05  # Max relative deviation of the RSS inherited by the forked process from the RSS of the pool
+_PAGESIZE = os.sysconf('SC_PAGE_SIZE')  # Size of the memory page in bytes
+_CLKTCK = os.sysconf('SC_CLK_TCK')  # Clock ticks per second of the CPU time of the processes
+# Header and extension of the resources consumption time series of the jobs
+_RTSHEADER = '# Time(sec)\tCPU(%)\tRSS(Mb)\tRead(Mb)\tWrite(Mb)\tThreads\tProcs\n'
+_RTSEXT = '.rts'
+# Typical diagnostics of the memory allocation failure in the output of the processes
+_MEMOUTHINTS = ('bad_alloc', 'MemoryError', 'OutOfMemoryError', 'Cannot allocate memory', 'out of memory')
+# Header of the journal of the jobs states
+_JOURNALHEADER = '# Time(sec)\tState\tFingerprint\tJobName\n'
+_SPOOLSIZE = 1024 ** 2  # Size of the in-memory buffer of the captured output of each job, spilled to a temp file above
+_CPUSETSIZE = 1024  # Max number of the logical CPUs in the affinity mask, CPU_SETSIZE of glibc
+_STATUSPERIOD = 5  # Min interval in sec between the rewritings of the status file of the pool
+# Adaptation of the workers limit to the load of the host
+_ADAPTPERIOD = 10  # Min interval in sec between the adaptations, corresponds to avg10 of the PSI
+_PSIMEMFULL = 5  # Memory pressure (full avg10, %) to reduce the workers (thrashing)
+_PSIIOFULL = 25  # IO pressure (full avg10, %) to reduce the workers
+_PSICPUSOME = 10  # Max CPU pressure (some avg10, %) to add the workers
+_PSIMEMSOME = 1  # Max memory pressure (some avg10, %) to add the workers
+_PSIIOSOME = 10  # Max IO pressure (some avg10, %) to add the workers
+_MEMRESERVE = 0.05  # Reserved fraction of the physical memory, which should remain available
+_MEMSPARE = 0.2  # Min fraction of the available physical memory to add the workers
+_FAIRPULL = 8  # Max extension of the queue of the lazily scheduled jobs on the fair-share scheduling
+_BACKOFFMAX = 3600  # Max delay in sec before the retry of the failed job
+_AGENTPORT = 9467  # Default TCP port of the worker agents (see mpeagent.py)
+_AGENTTIMEOUT = 10  # Timeout in sec of the connection to the worker agent
+_AGENTTOKEN = 'MPEAGENT_TOKEN'  # Environment variable of the shared secret token of the pools and the worker agents
+_AGENTMSGMAX = 4096  # Max size in bytes of the message of the unauthenticated peer
+_NUMACTL = distutils.spawn.find_executable('numactl')  # NUMA memory policy utility
+try:
+	_LIBC = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+except OSError:
+	_LIBC = None
+_rcpmarked = set()  # The .rcp files marked by _RCPOWNRSS in this process
+
+
+def procRss(pid):
+	"""Current RSS memory of the process in Mb
+
+	pid  - process id
+
+	return  - RSS in Mb or 0 if the process does not exist
+	"""
+	try:
+		with open('/proc/{}/statm'.format(pid), 'r') as fstat:
+			# Note: the second field is the resident set size in pages
+			return int(fstat.read().split(None, 2)[1]) * _PAGESIZE / 1024. ** 2
+	except (IOError, IndexError, ValueError):
+		return 0
+
+
+def procHwm(pid):
+	"""Peak RSS (VmHWM) of the process in Mb
+
+	pid  - process id
+
+	return  - VmHWM in Mb or 0 if the process does not exist
+	"""
+	try:
+		with open('/proc/{}/status'.format(pid), 'r') as fstat:
+			for ln in fstat:
+				if ln.startswith('VmHWM:'):
+					# Note: values are in kB
+					return int(ln.split(None, 2)[1]) / 1024.
+	except (IOError, IndexError, ValueError):
+		pass
+	return 0
+
+
+def _ownMaxRss(rusage, forkrss, hwm, forked=False):
+	"""Resources consumption of the completed process with the own RSS peak of the process
+
+	The forked process inherits the RSS of the forking (pool) process, which is retained
+	by ru_maxrss across the exec(). So ru_maxrss is the own peak of the exec'd process only
+	when it exceeds the RSS of the forking process, otherwise the observed VmHWM of the
+	process after the exec() is taken. The peak of the process forked without the exec()
+	is the increase of ru_maxrss above the RSS of the forking process.
+
+	rusage  - resources consumption of the completed process, resource.struct_rusage
+	forkrss  - RSS of the forking process on the fork in Mb
+	hwm  - max observed VmHWM of the process after the exec() in Mb
+	forked  - the process is forked without the exec()
+
+	return  - resource.struct_rusage with ru_maxrss being the own peak RSS of the process in Kb
+
+	>>> ru = resource.struct_rusage((1.0, 0.5, 309 * 1024) + (0,) * 13)
+	>>> _ownMaxRss(ru, 300, 1.5).ru_maxrss
+	1536
+	>>> _ownMaxRss(ru, 300, 1.5).ru_utime
+	1.0
+	>>> _ownMaxRss(ru, 100, 1.5).ru_maxrss
+	316416
+	>>> _ownMaxRss(ru, 300, 0, True).ru_maxrss
+	9216
+	"""
+	maxrss = rusage.ru_maxrss / 1024.
+	if forked:
+		maxrss = max(maxrss - forkrss, 0)
+	elif maxrss <= forkrss * (1 + _RSSFORKTOL) + _RSSFORKMARGIN:
+		maxrss = hwm
+	return resource.struct_rusage(tuple(rusage[:2]) + (int(round(maxrss * 1024)),) + tuple(rusage[3:]))
+
+
+def procVmPeak(pid):
+	"""Peak virtual memory and data segment size of the process in Mb
+
+	pid  - process id
+
+	return  - VmPeak, VmData in Mb or zeros if the process does not exist
+	"""
+	vmpeak = 0
+	vmdata = 0
+	try:
+		with open('/proc/{}/status'.format(pid), 'r') as fstat:
+			for ln in fstat:
+				# Note: values are in kB
+				if ln.startswith('VmPeak:'):
+					vmpeak = int(ln.split(None, 2)[1]) / 1024.
+				elif ln.startswith('VmData:'):
+					vmdata = int(ln.split(None, 2)[1]) / 1024.
+	except (IOError, IndexError, ValueError):
+		pass
+	return vmpeak, vmdata
+
+
+def procStats():
+	"""CPU time and threads of the running processes
+
+	return  - dict of the processes stats: pid: (ppid, cputicks, threads), where cputicks include
+		the reaped children of the process
+	"""
+	stats = {}
+	for name in os.listdir('/proc'):
+		if not name.isdigit():
+			continue
+		try:
+			with open('/proc/{}/stat'.format(name), 'r') as fstat:
+				# Note: the process name can contain spaces and parentheses
+				fields = fstat.read().rsplit(')', 1)[1].split()
+			# Fields following the name: state, ppid, ..., utime (14), stime, cutime, cstime, ..., num_threads (20)
+			stats[int(name)] = (int(fields[1]), sum(int(val) for val in fields[11:15]), int(fields[17]))
+		except (IOError, IndexError, ValueError):
+			pass  # The process is completed
+	return stats
+
+
+def procIo(pid):
+	"""Storage IO of the process in bytes
+
+	pid  - process id
+
+	return  - read_bytes, write_bytes or zeros if the process does not exist or its IO is not accessible
+	"""
+	ior = 0
+	iow = 0
+	try:
+		with open('/proc/{}/io'.format(pid), 'r') as fio:
+			for ln in fio:
+				if ln.startswith('read_bytes:'):
+					ior = int(ln.split(None, 2)[1])
+				elif ln.startswith('write_bytes:'):
+					iow = int(ln.split(None, 2)[1])
+	except (IOError, IndexError, ValueError):
+		pass
+	return ior, iow
+
+
+def procPressure(resource):
+	"""Pressure stall information (PSI) of the resource
+
+	resource  - 'cpu', 'memory' or 'io'
+
+	return  - avg10 of the (some, full) stalls in percent or None if the PSI is not available
+	"""
+	stalls = [0., 0.]
+	try:
+		with open('/proc/pressure/' + resource, 'r') as fpsi:
+			for ln in fpsi:
+				fields = ln.split()
+				# Note: the "full" line of the CPU is absent in the former kernels
+				if fields and fields[0] in ('some', 'full'):
+					stalls[fields[0] == 'full'] = float(fields[1].split('=', 1)[1])
+	except (IOError, IndexError, ValueError):
+		return None
+	return tuple(stalls)
+
+
+def memAvailable():
+	"""Available and total physical memory in Mb
+
+	return  - MemAvailable, MemTotal or None if they are unknown
+	"""
+	mem = {}
+	try:
+		with open('/proc/meminfo', 'r') as fmem:
+			for ln in fmem:
+				if ln.startswith(('MemAvailable:', 'MemTotal:')):
+					# Note: values are in kB
+					name, val = ln.split(None, 2)[:2]
+					mem[name] = int(val) / 1024.
+	except (IOError, ValueError):
+		return None
+	if len(mem) != 2:
+		return None
+	return mem['MemAvailable:'], mem['MemTotal:']
+
+
+def _cpuMask(cpus=()):
+	"""CPU set (cpu_set_t) of the specified logical CPUs
+
+	cpus  - logical CPU ids to be included in the set
+
+	return  - ctypes array of the CPU set
+	"""
+	bits = 8 * ctypes.sizeof(ctypes.c_ulong)
+	mask = (ctypes.c_ulong * (_CPUSETSIZE // bits))()
+	for cpu in cpus:
+		mask[cpu // bits] |= 1 << (cpu % bits)
+	return mask
+
+
+def cpuAffinity(pid=0):
+	"""Logical CPUs allowed for the process
+
+	pid  - process id, 0 means the calling process
+
+	return  - sorted list of the allowed logical CPU ids
+	"""
+	mask = _cpuMask()
+	if _LIBC is None or _LIBC.sched_getaffinity(pid, ctypes.sizeof(mask), mask) != 0:
+		return range(cpu_count())
+	bits = 8 * ctypes.sizeof(ctypes.c_ulong)
+	return [cpu for cpu in range(_CPUSETSIZE) if mask[cpu // bits] & (1 << (cpu % bits))]
+
+
+def setCpuAffinity(cpus, pid=0):
+	"""Bind the process to the specified logical CPUs
+
+	cpus  - logical CPU ids to bind the process to
+	pid  - process id, 0 means the calling process
+	"""
+	assert cpus, 'Logical CPUs should be specified'
+	if _LIBC is None:
+		raise OSError(errno.ENOSYS, 'sched_setaffinity() is not available')
+	mask = _cpuMask(cpus)
+	if _LIBC.sched_setaffinity(pid, ctypes.sizeof(mask), mask) != 0:
+		err = ctypes.get_errno()
+		raise OSError(err, os.strerror(err))
+
+
+def _cpuList(text):
+	"""Parse the list of logical CPUs in the Linux format: "0-3,8,10-11"
+
+	return  - list of the logical CPU ids
+	"""
+	cpus = []
+	for rng in text.strip().split(','):
+		if not rng:
+			continue
+		beg, _, end = rng.partition('-')
+		cpus.extend(range(int(beg), int(end or beg) + 1))
+	return cpus
+
+
+def cpuTopology():
+	"""Physical cores of the allowed logical CPUs
+
+	The topology is read from the Linux sysfs, each logical CPU is considered
+	as a separate core on any missed information.
+
+	return  - list of the physical cores: (node, package, core, cpus), where
+		node  - NUMA node id, 0 if unknown
+		package  - physical package (socket) id
+		core  - core id in the package
+		cpus  - tuple of the logical CPUs (hardware threads) of the core
+	"""
+	nodes = {}  # Logical CPU: NUMA node
+	for fnode in glob.glob('/sys/devices/system/node/node[0-9]*/cpulist'):
+		node = int(os.path.basename(os.path.dirname(fnode))[len('node'):])
+		try:
+			with open(fnode, 'r') as fcpus:
+				for cpu in _cpuList(fcpus.read()):
+					nodes[cpu] = node
+		except (IOError, ValueError):
+			pass
+	cores = {}  # (node, package, core): [cpus]
+	for cpu in cpuAffinity():
+		try:
+			topo = '/sys/devices/system/cpu/cpu{}/topology/'.format(cpu)
+			with open(topo + 'physical_package_id', 'r') as ftopo:
+				package = int(ftopo.read())
+			with open(topo + 'core_id', 'r') as ftopo:
+				core = int(ftopo.read())
+		except (IOError, ValueError):
+			package = 0
+			core = -1 - cpu  # Unique core for the logical CPU
+		cores.setdefault((nodes.get(cpu, 0), package, core), []).append(cpu)
+	return sorted(key + (tuple(cpus),) for key, cpus in cores.iteritems())
 
 
 def secondsToHms(seconds):
@@ -50,14 +379,33 @@ def secondsToHms(seconds):
 	return hours, mins, secs
 
 
+def _depsState(job):
+	"""State of the dependencies of the job
+
+	job  - the job having dependencies
+
+	return
+		ready  - all dependencies are successfully completed
+		failed  - the failed dependency (Job or Task) or None
+	"""
+	ready = True
+	for dep in job.depends:
+		if dep.tstop is None:
+			ready = False
+		elif not (dep._succeeded if isinstance(dep, Job) else dep._graceful.value):
+			return False, dep
+	return ready, None
+
+
 class Task(object):
 	""" Container of Jobs"""
-	#TODO: Implement timeout support in add/delJob
-	def __init__(self, name, timeout=0, onstart=None, ondone=None, params=None, stdout=sys.stdout, stderr=sys.stderr):
+	def __init__(self, name, timeout=0, onstart=None, ondone=None, params=None, stdout=sys.stdout, stderr=sys.stderr
+	, task=None):
 		"""Initialize task, which is a group of jobs to be executed
 
 		name  - task name
-		timeout  - execution timeout. Default: 0, means infinity
+		timeout  - execution timeout of all the task jobs since the task start, the queued jobs
+			are dropped and the running ones are terminated on the timeout. Default: 0, means infinity
 		onstart  - callback which is executed on the task starting (before the execution
 			started) in the CONTEXT OF THE CALLER (main process) with the single argument,
 			the task. Default: None
@@ -69,9 +417,14 @@ class Task(object):
 		stdout  - None or file name or PIPE for the buffered output to be APPENDED
 		stderr  - None or file name or PIPE or STDOUT for the unbuffered error output to be APPENDED
 			ATTENTION: PIPE is a buffer in RAM, so do not use it if the output data is huge or unlimited
+		task  - super-task embracing this task, its timeout and cancellation are applied to this task
+			as to the jobs of the super-task. Default: None
 
 		tstart  - start time is filled automatically on the execution start (before onstart). Default: None
 		tstop  - termination / completion time after ondone
+			NOTE: the task is completed when all its jobs are completed, so all jobs
+			should be created before the execution of the task jobs dependent on it
+		canceled  - the task is canceled (see cancel())
 		"""
 		assert isinstance(name, str) and timeout >= 0, 'Parameters validaiton failed'
 		self.name = name
@@ -81,9 +434,12 @@ class Task(object):
 		self.ondone = types.MethodType(ondone, self) if ondone else None
 		self.stdout = stdout
 		self.stderr = stderr
+		self.task = task
 		self.tstart = None
 		self.tstop = None  # SyncValue()  # Termination / completion time after ondone
+		self.canceled = False
 		# Private attributes
+		self._cancelsets = []  # Sets of the canceled tasks of the execution pools executing the jobs of the task
 		self._jobsnum = Value(ctypes.c_uint)
 		# Graceful completion of all tasks or at least one of the tasks was terminated
 		self._graceful = Value(ctypes.c_bool)
@@ -103,6 +459,9 @@ class Task(object):
 		# Run onstart if required
 		if initial:
 			self.tstart = time.time()
+			# Note: the task is a member of its super-task like a job
+			if self.task:
+				self.task.addJob()
 			if self.onstart:
 				self.onstart()
 		return self
@@ -122,10 +481,67 @@ class Task(object):
 		# Finalize if required
 		if not graceful:
 			self._graceful.value = False
-		elif final:
+		if final:
 			if self.ondone and self._graceful.value:
 				self.ondone()
 			self.tstop = time.time()
+			if self.task:
+				self.task.delJob(self._graceful.value)
+		return None
+
+
+	def cancel(self):
+		"""Cancel the task: its queued jobs are dropped and the running ones are terminated
+		by the execution pool, including the jobs of the subtasks
+
+		return  - None
+		"""
+		if not self.canceled and self.tstop is None:
+			self.canceled = True
+			for canceled in self._cancelsets:
+				canceled.add(self)
+
+
+	def _watch(self, canceled):
+		"""Register the set of the canceled tasks of the execution pool to be notified
+		on the cancellation of this task or its super-tasks
+
+		canceled  - the set of the canceled tasks of the pool
+		"""
+		task = self
+		while task:
+			if not any(cset is canceled for cset in task._cancelsets):
+				task._cancelsets.append(canceled)
+			task = task.task
+
+
+	def deadline(self):
+		"""Nearest deadline of the task considering its super-tasks
+
+		return  - time of the deadline or None if the task is not limited by the timeout
+		"""
+		deadline = None
+		task = self
+		while task:
+			if task.timeout and task.tstart is not None and (deadline is None
+			or task.tstart + task.timeout < deadline):
+				deadline = task.tstart + task.timeout
+			task = task.task
+		return deadline
+
+
+	def expired(self):
+		"""Whether the task is canceled or timed out considering its super-tasks
+
+		return  - None if the task is active, otherwise the cause: 'canceled' or 'timeout'
+		"""
+		task = self
+		while task:
+			if task.canceled:
+				return 'canceled'
+			if task.timeout and task.tstart is not None and time.time() >= task.tstart + task.timeout:
+				return 'timeout'
+			task = task.task
 		return None
 
 
@@ -137,17 +553,22 @@ class Job(object):
 	"""
 	# NOTE: keyword-only arguments are specified after the *, supported only since Python 3
 	def __init__(self, name, workdir=None, args=(), timeout=0, ontimeout=False, task=None #,*
-	, startdelay=0, onstart=None, ondone=None, params=None, stdout=sys.stdout, stderr=sys.stderr):
+	, startdelay=0, onstart=None, ondone=None, params=None, stdout=sys.stdout, stderr=sys.stderr
+	, rcpoutp=None, rcpname=None, mem=0, vmemlim=0, datalim=0, cpulim=0, cost=0, inputs=(), depends=(), slots=1
+	, batchkey=None, outputs=(), group=None, attempts=0, retryon=(), backoff=1):
 		"""Initialize job to be executed
 
 		name  - job name
 		workdir  - working directory for the corresponding process, None means the dir of the benchmarking
 		args  - execution arguments including the executable itself for the process
 			NOTE: can be None to make make a stub process and execute the callbacks
+			NOTE: the executable can be a Python callable, which is called with the remained
+			args in the process forked from the execution pool having all its modules loaded
+			(see ExecPool.preload). The returned int (None means 0) is the exit code
 		timeout  - execution timeout. Default: 0, means infinity
 		ontimeout  - action on timeout:
 			False  - terminate the job. Default
-			True  - restart the job
+			True  - restart the job, the number of the restarts is bounded by the attempts
 		task  - origin task if this job is a part of the task
 		startdelay  - delay after the job process starting to execute it for some time,
 			executed in the CONTEXT OF THE CALLER (main process).
@@ -163,11 +584,64 @@ class Job(object):
 		params  - additional parameters to be used in callbacks
 		stdout  - None or file name or PIPE for the buffered output to be APPENDED
 		stderr  - None or file name or PIPE or STDOUT for the unbuffered error output to be APPENDED
-			ATTENTION: PIPE is a buffer in RAM, so do not use it if the output data is huge or unlimited
+			NOTE: PIPE output is captured by the pool continuously into outp / errp, which
+			are held in RAM up to _SPOOLSIZE bytes and spilled to a temporary file above
+		rcpoutp  - file name to APPEND the resource consumption profile of the job process
+			in the exectime format (.rcp), the path is relative to the current dir (not the workdir).
+			Default: None, the profile is not stored
+		rcpname  - task name in the resource consumption profile. Default: the job name
+		mem  - expected peak RSS of the job process in Mb, which is reserved on the job
+			execution when the memory limit of the pool is specified. Default: 0, unknown
+		vmemlim  - virtual memory limit (RLIMIT_AS) of the job process in Mb. Default: 0, unlimited
+		datalim  - data segment (heap) limit (RLIMIT_DATA) of the job process in Mb. Default: 0, unlimited
+		cpulim  - CPU time limit (RLIMIT_CPU) of the job process in sec. Default: 0, unlimited
+			NOTE: the job violating its limits is terminated and traced with the 'memout'
+			or 'cpuout' termination cause, memory violations are identified heuristically
+		cost  - estimated execution cost of the job (expected execution time in sec), the queued
+			jobs are started in the order of decreasing cost (longest first) to shorten
+			the total execution time. Default: 0, the jobs are started in the scheduling order
+		inputs  - input files of the job, which are fingerprinted (size and modification time)
+			together with the job name and args in the journal of the execution pool
+		depends  - jobs and tasks the job depends on. The job is started only after the
+			successful completion of all of them and it is canceled (completed as failed)
+			if any of them fails
+		slots  - number of the worker slots (cores) occupied by the multithreaded job process,
+			it is limited by the workers of the execution pool. The job process is bound to the
+			cores of all its slots if the pool has the affinity, and OMP_NUM_THREADS is set to
+			the number of slots. Default: 1
+		batchkey  - key of the jobs, which can be executed one by one by the same worker process
+			(typically the executable and its base input file) to eliminate the scheduling
+			overhead of the tiny jobs, see ExecPool.batch. Each batched job has its own
+			timeout, output and resources consumption. Default: None, the job is not batched
+			NOTE: only the executable (non-callable) jobs without the restart on timeout are batched
+		outputs  - output files and dirs of the job, the paths are relative to the current dir
+			(not the workdir). They are cached together with the custom stdout / stderr files
+			and PIPE output when the execution pool has the results cache, see Cache
+		group  - group of the job for the fair-share scheduling (see ExecPool.shares), for example
+			the algorithm name. Default: None, the name of the task of the job if any
+		attempts  - max number of the attempts to execute the job, including its restarts on timeout
+			(see ontimeout) and retries on failures. The job failed on all its attempts is quarantined:
+			completed with the 'quarantined' termination cause, which is not executed again on the
+			resumed execution (see Journal). Default: 0, the failed job is not retried and the
+			restarts on timeout are unlimited
+		retryon  - return codes of the failed job process to retry the job: positive exit codes
+			and negative signals (for example, -signal.SIGSEGV). Default: any failure excluding
+			the termination by the resources limits
+		backoff  - delay in sec before the first retry of the failed job, doubled on each subsequent
+			retry up to _BACKOFFMAX. The jobs are restarted on timeout without the delay
 
 		tstart  - start time is filled automatically on the execution start (before onstart). Default: None
 		tstop  - termination / completion time after ondone
-		proc  - process of the job, can be used in the ondone() to read it's PIPE
+		proc  - process of the job
+		outp  - file-like object with the captured PIPE stdout (and stderr if it is STDOUT)
+			of the job process, rewound before ondone() and closed after it, or None
+		errp  - file-like object with the captured PIPE stderr of the job process or None
+		rusage  - resources consumption of the completed job process (resource.struct_rusage) or None
+			NOTE: ru_maxrss is the own RSS peak of the job process excluding the memory inherited
+			from the pool on the fork (see _ownMaxRss)
+		exectime  - wall-clock execution time of the completed job process in sec or None
+		termcause  - cause of the job termination by the pool or its resource limits
+			('timeout', 'memout', 'cpuout') or None
 		"""
 		assert isinstance(name, str) and timeout >= 0 and (task is None or isinstance(task, Task)), 'Parameters validaiton failed'
 		#if not args:
@@ -189,14 +663,55 @@ class Job(object):
 		# I/O redirection ------------------------------------------------------
 		self.stdout = stdout
 		self.stderr = stderr
+		# Resources consumption tracing ----------------------------------------
+		self.rcpoutp = rcpoutp
+		self.rcpname = rcpname
+		self.mem = mem
+		# Resources limits -----------------------------------------------------
+		self.vmemlim = vmemlim
+		self.datalim = datalim
+		self.cpulim = cpulim
+		# Scheduling -----------------------------------------------------------
+		self.cost = cost
+		self.inputs = inputs
+		self.depends = depends
+		self.slots = slots
+		self.batchkey = batchkey
+		self.outputs = outputs
+		self.group = group if group is not None or not task else task.name
+		self.attempts = attempts
+		self.retryon = retryon
+		self.backoff = backoff
 		# Internal properties --------------------------------------------------
 		self.tstart = None  # start time is filled automatically on the execution start, before onstart. Default: None
 		self.tstop = None  # SyncValue()  # Termination / completion time after ondone
+		self.rusage = None  # Resources consumption of the completed job process
+		self.exectime = None  # Wall-clock execution time of the completed job process
+		self.termcause = None  # Cause of the job termination by the pool
 		# Private attributes
-		self.proc = None  # Process of the job, can be used in the ondone() to read it's PIPE
+		self.proc = None  # Process of the job
+		self.outp = None  # Captured PIPE stdout of the job process
+		self.errp = None  # Captured PIPE stderr of the job process
+		self._rss = 0  # Last observed RSS of the job process in Mb
+		self._vmpeak = 0  # Observed peak of the virtual memory of the job process in Mb
+		self._vmdata = 0  # Max observed data segment size of the job process in Mb
+		self._terminating = False  # The job process is being terminated by the timeout
+		self._canceled = None  # Expiration cause of the task terminating the job process: 'canceled', 'timeout'
+		self._succeeded = None  # The job is completed successfully (without the error code)
+		self._slotids = None  # Indexes of the pool slots (core sets) assigned to the executing job
+		self._cpus = None  # Logical CPUs to bind the job process to
+		self._journal = None  # Journal of the execution pool to log the job states
+		self._status = None  # Live metrics of the execution pool accounting the completed job
+		self._batch = None  # Jobs executed by the batch worker represented by this job
+		self._results = None  # Reported results of the batched jobs
+		self._cachekey = None  # Key of the cached results of the job
+		self._agent = None  # Remote worker agent executing the job, _AgentLink
+		self._attempt = 0  # Number of the started attempts of the job
 		# Process-related file descriptors to be closed
 		self._fstdout = None
 		self._fstderr = None
+		self._forkrss = 0  # RSS of the pool process on the fork of the job process in Mb
+		self._hwm = 0  # Max observed VmHWM of the job process after the exec() in Mb
 
 
 	def complete(self, graceful=True):
@@ -213,6 +728,16 @@ class Job(object):
 		self._fstdout = None
 		self._fstderr = None
 
+		# Trace resources consumption of the job process
+		if self.rcpoutp and self.rusage is not None:
+			self.__saveRcp()
+		# Note: the job completed with the error code is failed
+		self._succeeded = graceful and not (self.proc and self.proc.returncode)
+		if self._journal:
+			self._journal.log(self, 'done' if self._succeeded else self.termcause or 'failed')
+		if self._status:
+			self._status.completed(self)
+
 		# Job-related post execution
 		if graceful:
 			if self.ondone:
@@ -242,6 +767,12 @@ class Job(object):
 					pass  # The dir is not empty, just skip it
 			if DEBUG_TRACE:
 				print('"{}" #{} is completed'.format(self.name, self.proc.pid if self.proc else -1), file=sys.stderr)
+		# Release the captured output
+		for outp in (self.outp, self.errp):
+			if outp:
+				outp.close()
+		self.outp = None
+		self.errp = None
 		# Check whether the job is associated with any task
 		if self.task:
 			self.task = self.task.delJob(graceful)
@@ -249,246 +780,3060 @@ class Job(object):
 		self.tstop = time.time()
 
 
-class ExecPool(object):
-	'''Execution Pool of workers for jobs
+	def __saveRcp(self):
+		"""Append resources consumption of the completed job process to the rcpoutp
 
-	A worker in the pool executes only the one job, a new worker is created for
-	each subsequent job.
-	'''
+		The terminated jobs are commented out with the termination cause to be
+		skipped on the aggregation
+		"""
+		utime = self.rusage.ru_utime
+		stime = self.rusage.ru_stime
+		# Note: ru_maxrss is in Kb on Linux
+		rcp = '{:.6f}\t{:.6f}\t{:.6f}\t{:.6f}\t{:.3f}\t{}\n'.format(self.exectime, utime + stime
+			, utime, stime, self.rusage.ru_maxrss / 1024., self.rcpname or self.name)
+		if self.termcause:
+			rcp = '# {}\t{}'.format(self.termcause, rcp)
+		try:
+			basedir = os.path.split(self.rcpoutp)[0]
+			if basedir and not os.path.exists(basedir):
+				os.makedirs(basedir)
+			with open(self.rcpoutp, 'a+') as frcp:
+				frcp.seek(0, os.SEEK_END)
+				if not frcp.tell():
+					frcp.write(_RCPHEADER + _RCPOWNRSS)
+				elif self.rcpoutp not in _rcpmarked:
+					# Mark the subsequent rows of the former file having the own RSS peak
+					frcp.seek(0)
+					marked = any(ln == _RCPOWNRSS for ln in frcp)
+					frcp.seek(0, os.SEEK_END)
+					if not marked:
+						frcp.write(_RCPOWNRSS)
+				_rcpmarked.add(self.rcpoutp)
+				frcp.write(rcp)
+		except (IOError, OSError) as err:
+			print('ERROR on the resources consumption output of "{}" into "{}": {}'
+				.format(self.name, self.rcpoutp, err), file=sys.stderr)
 
-	def __init__(self, workers=cpu_count()):
-		"""Execution Pool constructor
 
-		workers  - number of resident worker processes
-		"""
-		assert workers >= 1, 'At least one worker should be managed by the pool'
+	def _preexec(self):
+		"""Apply resource limits and CPU affinity in the forked job process before the exec()"""
+		if self._cpus:
+			try:
+				setCpuAffinity(self._cpus)
+			except OSError as err:
+				print('WARNING, "{}" can not be bound to the CPUs {}: {}'.format(
+					self.name, self._cpus, err), file=sys.stderr)
+		for rlim, val in ((resource.RLIMIT_AS, self.vmemlim * 1024 ** 2)
+		, (resource.RLIMIT_DATA, self.datalim * 1024 ** 2), (resource.RLIMIT_CPU, self.cpulim)):
+			if not val:
+				continue
+			val = int(val)
+			hard = resource.getrlimit(rlim)[1]
+			# Note: SIGXCPU is sent on the soft CPU limit and SIGKILL on the hard one
+			lim = val + 1 if rlim == resource.RLIMIT_CPU else val
+			if hard != resource.RLIM_INFINITY and hard < lim:
+				lim = hard
+			resource.setrlimit(rlim, (min(val, lim), lim))
 
-		self._workersLim = workers  # Max number of workers
-		self._workers = {}  # Current workers: 'jname': <proc>; <proc>: timeout
-		self._jobs = collections.deque()  # Scheduled jobs: 'jname': **args
-		self._tstart = None  # Start time of the execution of the first task
-		# Predefined privte attributes
-		self._latency = 1  # 1 sec of sleep on pooling
-		self._killCount = 3  # 3 cycles of self._latency, termination wait time
 
+	def _limcause(self):
+		"""Cause of the completed job process termination by its resources limits
 
-	def __del__(self):
-		self.__terminate()
+		return  - 'cpuout', 'memout' or None if the job is not terminated by its limits
+		"""
+		rcode = self.proc.returncode
+		if not rcode:
+			return None
+		if self.cpulim and (rcode == -signal.SIGXCPU or (rcode == -signal.SIGKILL and self.rusage
+		and self.rusage.ru_utime + self.rusage.ru_stime >= self.cpulim)):
+			return 'cpuout'
+		# Memory allocation failure is not distinguishable by the exit status, so the process
+		# approached its memory limit should be either signaled (aborted on the failed allocation)
+		# or report the allocation failure in its error output
+		if not ((self.vmemlim and self._vmpeak >= 0.9 * self.vmemlim)
+		or (self.datalim and self._vmdata >= 0.9 * self.datalim)):
+			return None
+		if rcode < 0:
+			return 'memout'
+		for outp in (self.stderr, self.stdout):
+			if not outp or not isinstance(outp, str) or outp == os.devnull:
+				continue
+			try:
+				with open(outp, 'r') as fout:
+					fout.seek(0, os.SEEK_END)
+					fout.seek(max(fout.tell() - 4096, 0))
+					tail = fout.read()
+			except IOError:
+				continue
+			if any(hint in tail for hint in _MEMOUTHINTS):
+				return 'memout'
+		return None
 
 
-	def __finalize__(self):
-		self.__del__()
+def _reap(job, block=False):
+	"""Reap the job process if it is completed, fetching its resources consumption
 
+	job  - the job, which process should be reaped
+	block  - wait for the process completion
 
-	def __terminate(self):
-		"""Force termination of the pool"""
-		if not self._jobs and not self._workers:
-			return
+	return  - returncode of the completed process or None
+	"""
+	proc = job.proc
+	if proc.returncode is not None:
+		return proc.returncode
+	if job._agent:
+		# Note: resources consumption of the remote process is reported by the agent
+		return proc.wait() if block else proc.poll()
+	try:
+		pid, status, rusage = os.wait4(proc.pid, 0 if block else os.WNOHANG)
+	except OSError as err:
+		if err.errno != errno.ECHILD:
+			raise
+		# The process has been already reaped by the subprocess module
+		return proc.wait() if block else proc.poll()
+	if not pid:
+		return None
+	# Note: returncode is set to be used by the Popen methods as well
+	proc.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+	job.rusage = _ownMaxRss(rusage, job._forkrss, job._hwm, isinstance(proc, _ForkProc))
+	job.exectime = time.time() - job.tstart
+	return proc.returncode
 
-		print('WARNING: terminating the workers pool ...')
-		for job in self._jobs:
-			job.complete(False)
-			print('  Scheduled "{}" is removed'.format(job.name))
-		self._jobs.clear()
-		while self._workers:
-			procs = self._workers.keys()
-			for proc in procs:
-				print('  Terminating "{}" #{} ...'.format(self._workers[proc].name, proc.pid), file=sys.stderr)
-				proc.terminate()
-			# Wait a few sec for the successful process termitaion before killing it
-			i = 0
-			active = True
-			while active and i < self._killCount:
-				active = False
-				for proc in procs:
-					if proc.poll() is None:
-						active = True
-						break
-				time.sleep(self._latency)
-			# Kill nonterminated processes
-			if active:
-				for proc in procs:
-					if proc.poll() is None:
-						print('  Killing the worker #{} ...'.format(proc.pid), file=sys.stderr)
-						proc.kill()
-			# Tidy jobs
-			for job in self._workers.values():
-				job.complete(False)
-			self._workers.clear()
 
+class _ForkProc(object):
+	"""Process of the Python callable job forked from the execution pool
 
-	def __startJob(self, job, async=True):
-		"""Start the specified job by one of workers
+	The callable is executed in the child of the pool process sharing (copy-on-write)
+	all modules loaded by the pool without the startup of the interpreter.
+	The interface mimics subprocess.Popen to manage the process as any other worker.
+	"""
+	def __init__(self, job, stdout=None, stderr=None, env=None, closefds=()):
+		"""Fork the process and execute the callable job.args[0](*job.args[1:]) in it
 
-		job  - the job to be executed, instance of Job
-		async  - async execution or wait intill execution completed
-		return  - 0 on successful execution, proc.returncode otherwise
+		job  - the job to be executed
+		stdout  - None or file object or PIPE for the output of the process
+		stderr  - None or file object or PIPE or STDOUT for the error output of the process
+		env  - environment variables to be updated in the process
+		closefds  - file descriptors of the pool to be closed in the process
 		"""
-		assert isinstance(job, Job), 'job type is invalid'
-		assert job.tstop is None, 'Only non-completed jobs should be started'
-		if async and len(self._workers) > self._workersLim:
-			raise AssertionError('Free workers must be available ({} busy workers of {})'
-				.format(len(self._workers), self._workersLim))
+		self.pid = None
+		self.returncode = None
+		self.stdout = None
+		self.stderr = None
+		pipes = {}  # Pipes of the PIPE output: channel: (rfd, wfd)
+		for chnl, outp in ((1, stdout), (2, stderr)):
+			if outp == PIPE:
+				pipes[chnl] = os.pipe()
+		# Flush the buffered output to not duplicate it in the child
+		for outp in (sys.stdout, sys.stderr):
+			try:
+				outp.flush()
+			except (IOError, ValueError):
+				pass
+		self.pid = os.fork()
+		if not self.pid:
+			# Note: the child never returns to the pool
+			rcode = 1
+			try:
+				rcode = self.__execute(job, stdout, stderr, pipes, env, closefds)
+			finally:
+				os._exit(rcode)
+		for chnl, (rfd, wfd) in pipes.iteritems():
+			os.close(wfd)
+			if chnl == 1:
+				self.stdout = os.fdopen(rfd, 'rb')
+			else:
+				self.stderr = os.fdopen(rfd, 'rb')
 
-		if DEBUG_TRACE:
-			print('Starting "{}"{}...'.format(job.name, '' if async else ' in sync mode'), file=sys.stderr)
-		job.tstart = time.time()
-		if job.onstart:
-			#print('Starting onstart() for job {}: {}'.format(job.name), file=sys.stderr)
+
+	@staticmethod
+	def __execute(job, stdout, stderr, pipes, env, closefds):
+		"""Execute the callable job in the forked process
+
+		return  - exit code of the process
+		"""
+		# Restore the default handling of the signals intercepted by the pool and the benchmark
+		try:
+			signal.set_wakeup_fd(-1)
+		except ValueError:  # Forked from a non-main thread
+			pass
+		for sig in (signal.SIGCHLD, signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGQUIT, signal.SIGABRT):
+			signal.signal(sig, signal.SIG_DFL)
+		for fd in closefds:
 			try:
-				job.onstart()
-			except StandardError as err:
-				print('ERROR in onstart() callback of "{}": {}. {}'.format(
-					job.name, err, traceback.format_exc()), file=sys.stderr)
-				return -1
-		# Consider custom output channels for the job
-		fstdout = None
-		fstderr = None
+				os.close(fd)
+			except OSError:
+				pass
+		# Redirect the output channels
+		for chnl, outp in ((1, stdout), (2, stderr)):
+			if chnl in pipes:
+				rfd, wfd = pipes[chnl]
+				os.close(rfd)
+				os.dup2(wfd, chnl)
+				os.close(wfd)
+			elif chnl == 2 and outp == STDOUT:
+				os.dup2(1, 2)
+			elif outp is not None and hasattr(outp, 'fileno'):
+				os.dup2(outp.fileno(), chnl)
+		if job.workdir:
+			os.chdir(job.workdir)
+		if env:
+			os.environ.update(env)
+		job._preexec()
+		rcode = 0
 		try:
-			# Initialize fstdout, fstderr by the required output channel
-			for joutp in (job.stdout, job.stderr):
-				if joutp and isinstance(joutp, str):
-					basedir = os.path.split(joutp)[0]
-					if not os.path.exists(basedir):
-						os.makedirs(basedir)
-					try:
-						if joutp == job.stdout:
-							self._fstdout = open(joutp, 'a')
-							fstdout = self._fstdout
-							outcapt = 'stdout'
-						elif joutp == job.stderr:
-							self._fstderr = open(joutp, 'a')
-							fstderr = self._fstderr
-							outcapt = 'stderr'
-						else:
-							raise ValueError('Ivalid output stream value: ' + joutp)
-					except IOError as err:
-						print('ERROR on opening custom {} "{}" for "{}": {}. Default is used.'
-							.format(outcapt, joutp, job.name, err), file=sys.stderr)
-				else:
-					if joutp == job.stdout:
-						fstdout = joutp
-					elif joutp == job.stderr:
-						fstderr = joutp
-					else:
-						raise ValueError('Ivalid output stream buffer: ' + str(joutp))
+			rcode = job.args[0](*job.args[1:])
+		except SystemExit as err:
+			rcode = err.code
+		except BaseException:
+			traceback.print_exc()
+			rcode = 1
+		if rcode is not None and not isinstance(rcode, (int, long)):
+			print(rcode, file=sys.stderr)
+			rcode = 1
+		for outp in (sys.stdout, sys.stderr):
+			try:
+				outp.flush()
+			except (IOError, ValueError):
+				pass
+		return rcode & 0xFF if rcode else 0
 
-			if DEBUG_TRACE and (fstdout or fstderr):
-				print('"{}" output channels:\n\tstdout: {}\n\tstderr: {}'.format(job.name
-					, str(job.stdout), str(job.stderr)))
-			if(job.args):
-				#print('Opening proc with:\n\tjob.args: {},\n\tcwd: {}'.format(' '.join(job.args), job.workdir), file=sys.stderr)
-				job.proc = subprocess.Popen(job.args, bufsize=-1, cwd=job.workdir, stdout=fstdout, stderr=fstderr)  # bufsize=-1 - use system default IO buffer size
-				# Wait a little bit to start the process besides it's scheduling
-				if job.startdelay > 0:
-					time.sleep(job.startdelay)
-		except StandardError as err:  # Should not occur: subprocess.CalledProcessError
-			print('ERROR on "{}" execution occurred: {}, skipping the job. {}'.format(
-				job.name, err, traceback.format_exc()), file=sys.stderr)
-			# Note: process-associated file descriptors are closed in complete()
-			job.complete(False)
-		else:
-			if async:
-				self._workers[job.proc] = job
-			else:
-				job.proc.wait()
-				job.complete()
-				return job.proc.returncode
-		return 0
 
+	def poll(self):
+		"""Check whether the process is completed
 
-	def __reviseWorkers(self):
-		"""Rewise the workers
+		return  - returncode of the completed process or None
+		"""
+		return self.wait(False)
 
-		Check for the comleted jobs and their timeous, update corresponding
-		workers and start the jobs if possible
+
+	def wait(self, block=True):
+		"""Wait for the process completion
+
+		block  - wait for the completion, otherwise just check it
+
+		return  - returncode of the completed process or None
 		"""
-		completed = []  # Completed workers
-		for proc, job in self._workers.items():
-			if proc.poll() is not None:
-				completed.append((proc, job))
-				continue
-			exectime = time.time() - job.tstart
-			if not job.timeout or exectime < job.timeout:
-				continue
-			# Terminate the worker
-			proc.terminate()
-			# Wait a few sec for the successful process termitaion before killing it
-			i = 0
-			while proc.poll() is None and i < self._killCount:
-				i += 1
-				time.sleep(self._latency)
-			if proc.poll() is None:
-				proc.kill()
-			del self._workers[proc]
-			print('WARNING, "{}" #{} is terminated by the timeout ({:.4f} sec): {:.4f} sec ({} h {} m {:.4f} s)'
-				.format(job.name, proc.pid, job.timeout, exectime, *secondsToHms(exectime)), file=sys.stderr)
-			# Restart the job if required
-			if job.ontimeout:
-				self.__startJob(job)
-			else:
-				job.complete(False)
+		if self.returncode is None:
+			try:
+				pid, status = os.waitpid(self.pid, 0 if block else os.WNOHANG)
+			except OSError as err:
+				if err.errno != errno.ECHILD:
+					raise
+				# The process has been reaped already, its status is unknown
+				pid, status = self.pid, 0
+			if pid:
+				self.returncode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+		return self.returncode
 
-		# Process completed jobs: execute callbacks and remove the workers
-		for proc, job in completed:
-			del self._workers[proc]
-			job.complete()
 
-		# Start subsequent job if it is required
-		while self._jobs and len(self._workers) <  self._workersLim:
-			self.__startJob(self._jobs.popleft())
+	def send_signal(self, sig):
+		"""Send the signal to the process if it is not completed"""
+		if self.returncode is None:
+			os.kill(self.pid, sig)
 
 
-	def execute(self, job, async=True):
-		"""Schecule the job for the execution
+	def terminate(self):
+		"""Terminate the process with SIGTERM"""
+		self.send_signal(signal.SIGTERM)
 
-		job  - the job to be executed, instance of Job
-		async  - async execution or wait until execution completed
-		  NOTE: sync tasks are started at once
-		return  - 0 on successful execution, proc. returncode otherwise
-		"""
-		assert isinstance(job, Job), 'job type is invalid'
-		assert len(self._workers) <= self._workersLim, 'Number of workers exceeds the limit'
-		assert job.name, "Job parameters must be defined"  #  and job.workdir and job.args
 
-		if DEBUG_TRACE:
-			print('Scheduling the job "{}" with timeout {}'.format(job.name, job.timeout))
-		if async:
-			# Start the execution timer
-			if self._tstart is None:
-				self._tstart = time.time()
-			# Schedule the job, postpone it if already postponed jobs exist or no any free workers
-			if self._jobs or len(self._workers) >= self._workersLim:
-				self._jobs.append(job)
-				#self.__reviseWorkers()  # Anyway the workers are revised if exist in the working cycle
-			else:
-				self.__startJob(job)
-		else:
-			return self.__startJob(job, False)
-		return  0
+	def kill(self):
+		"""Kill the process with SIGKILL"""
+		self.send_signal(signal.SIGKILL)
 
 
+class _DoneProc(object):
+	"""Completed process of the batched job, mimics the completed subprocess.Popen"""
+	def __init__(self, pid, returncode):
+		self.pid = pid
+		self.returncode = returncode
+		self.stdout = None
+		self.stderr = None
 
-	def join(self, timeout=0):
-		"""Execution cycle
 
-		timeout  - execution timeout in seconds before the workers termination, >= 0.
-			0 means absebse of the timeout. The time is measured SINCE the first job
-			was scheduled UNTIL the completion of all scheduled jobs.
+	def poll(self):
+		return self.returncode
+
+
+	def wait(self):
+		return self.returncode
+
+
+class _BatchResults(object):
+	"""Results of the batched jobs reported by the batch worker
+
+	The results pipe of the worker is captured by the pool into this object
+	instead of the output spool.
+	"""
+	def __init__(self):
+		self.results = []  # Reported results: (index, pid, returncode, exectime, rusage, termcause)
+		self._tail = ''  # Incomplete line of the results
+
+
+	def write(self, data):
+		"""Parse the captured results
+
+		data  - captured results, lines of:
+			index  pid  returncode  exectime  utime  stime  maxrss  termcause
+		"""
+		lines = (self._tail + data).split('\n')
+		self._tail = lines.pop()
+		for ln in lines:
+			idx, pid, rcode, etime, utime, stime, maxrss, termcause = ln.split('\t')
+			self.results.append((int(idx), int(pid), int(rcode), float(etime), resource.struct_rusage(
+				(float(utime), float(stime), int(maxrss)) + (0,) * 13), termcause))
+
+
+def _execBatch(jobs, resfd, grace):
+	"""Execute the batched jobs one by one in the batch worker reporting their results
+
+	jobs  - batched jobs: (job, stdout, stderr) with the opened output channels
+	resfd  - file descriptor of the pipe to report the results (see _BatchResults)
+	grace  - time in sec given to the job process terminated by the timeout before killing it
+
+	return  - exit code of the worker
+	"""
+	curproc = []  # Process of the executing job
+
+	def terminate(signum, frame):
+		"""Terminate the worker together with the executing job process"""
+		for proc in curproc:
+			proc.kill()
+		os._exit(1)
+
+	signal.signal(signal.SIGTERM, terminate)
+	for i, (job, stdout, stderr) in enumerate(jobs):
+		tstart = time.time()
+		forkrss = procRss(os.getpid())
+		try:
+			proc = subprocess.Popen(job.args, bufsize=-1, cwd=job.workdir, stdout=stdout, stderr=stderr
+				, preexec_fn=job._preexec if job.vmemlim or job.datalim or job.cpulim else None)
+		except StandardError as err:
+			print('ERROR on "{}" execution occurred: {}, skipping the job. {}'.format(
+				job.name, err, traceback.format_exc()), file=sys.stderr)
+			os.write(resfd, '{}\t0\t-1\t0\t0\t0\t0\terror\n'.format(i))
+			continue
+		curproc[:] = [proc]
+		# Wait for the job process completion considering its timeout
+		deadline = tstart + job.timeout if job.timeout else None
+		termcause = '-'
+		delay = 0.001
+		hwm = 0  # Max observed VmHWM of the job process
+		while True:
+			hwm = max(hwm, procHwm(proc.pid))
+			pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+			if pid:
+				break
+			if deadline and time.time() >= deadline:
+				if termcause == '-':
+					termcause = 'timeout'
+					proc.terminate()
+					deadline = time.time() + grace
+				else:
+					proc.kill()
+					deadline = None
+			time.sleep(delay)
+			delay = min(delay * 2, 0.05)
+		curproc[:] = []
+		rcode = -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+		rusage = _ownMaxRss(rusage, forkrss, hwm)
+		os.write(resfd, '{}\t{}\t{}\t{:.6f}\t{:.6f}\t{:.6f}\t{}\t{}\n'.format(i, pid, rcode
+			, time.time() - tstart, rusage.ru_utime, rusage.ru_stime, rusage.ru_maxrss, termcause))
+	return 0
+
+
+def _packPaths(paths):
+	"""Pack the files and directories into the transferable archive
+
+	paths  - relative paths of the files and directories, the absent ones are skipped
+
+	return  - base64-encoded tar.gz archive with the items under their paths
+	"""
+	buf = io.BytesIO()
+	# Note: the symbolic links are packed as the files they refer to, since the links are not unpacked
+	with contextlib.closing(tarfile.open(fileobj=buf, mode='w:gz', dereference=True)) as tar:
+		for path in paths:
+			path = path.rstrip('/')
+			if os.path.lexists(path):
+				tar.add(path)
+	return base64.b64encode(buf.getvalue())
+
+
+def _unpackPaths(data, replace=()):
+	"""Unpack the archive of the files and directories (see _packPaths) into the current directory
+
+	data  - the packed archive or None to remove the replaced items only
+	replace  - paths of the items to be removed before the unpacking if exist
+
+	return  - None
+
+	Raises tarfile.TarError if the archive has unsafe items: links and special files, paths outside
+	the current directory or passing through the existing symbolic links. Nothing is unpacked then.
+	"""
+	for path in replace:
+		path = path.rstrip('/')
+		if os.path.isdir(path) and not os.path.islink(path):
+			shutil.rmtree(path)
+		elif os.path.lexists(path):
+			os.remove(path)
+	if data is None:
+		return
+	with contextlib.closing(tarfile.open(fileobj=io.BytesIO(base64.b64decode(data)), mode='r:gz')) as tar:
+		members = tar.getmembers()
+		for member in members:
+			parts = member.name.split('/')
+			if not (member.isfile() or member.isdir()) or os.path.isabs(member.name) or '..' in parts:
+				raise tarfile.TarError('unsafe item of the archive: ' + member.name)
+			# Note: the existing symbolic links would redirect the items outside the current directory
+			path = ''
+			for part in parts:
+				path = os.path.join(path, part)
+				if os.path.islink(path):
+					raise tarfile.TarError('the item of the archive passes through the symbolic link: ' + member.name)
+			member.mode &= 0o777  # Omit setuid, setgid and sticky bits
+		tar.extractall('.', members)
+
+
+def _authDigest(token, nonce):
+	"""Authentication digest of the peer knowing the shared secret token
+
+	token  - the shared secret token of the pools and the worker agents
+	nonce  - the challenge of the authenticating peer
+
+	return  - hex digest of the HMAC-SHA256 of the challenge
+
+	>>> _authDigest('secret', 'abc') == _authDigest('secret', 'abc') != _authDigest('secret2', 'abc')
+	True
+	"""
+	return hmac.new(token, nonce, hashlib.sha256).hexdigest()
+
+
+class _Channel(object):
+	"""Channel of the messages over the TCP connection, the messages are JSON objects one per line"""
+	def __init__(self, sock):
+		"""Channel constructor
+
+		sock  - the connected socket
+		"""
+		self.sock = sock
+		self.closed = False  # The connection is closed by the peer
+		self.limit = 0  # Max size in bytes of the message, 0 means unlimited
+		self._tail = ''  # Incomplete line of the received messages
+
+
+	def fileno(self):
+		return self.sock.fileno()
+
+
+	def send(self, msg):
+		"""Send the message
+
+		msg  - dict to be sent
+		"""
+		self.sock.sendall(json.dumps(msg, separators=(',', ':')) + '\n')
+
+
+	def receive(self, block=False):
+		"""Receive the available messages
+
+		block  - wait for at least one message unless the connection is closed
+
+		return  - list of the received messages, empty if there are no messages or the connection
+			is closed (see closed)
+
+		Raises ValueError on the invalid message or the message exceeding the limit
+		"""
+		msgs = []
+		while not self.closed:
+			try:
+				data = self.sock.recv(64 * 1024, 0 if block and not msgs else socket.MSG_DONTWAIT)
+			except socket.error as err:
+				if err.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+					break
+				if err.errno == errno.EINTR:
+					continue
+				if err.errno not in (errno.ECONNRESET, errno.EPIPE):
+					raise
+				data = ''
+			if not data:
+				self.closed = True
+				break
+			lines = (self._tail + data).split('\n')
+			self._tail = lines.pop()
+			if self.limit and max(len(ln) for ln in lines + [self._tail]) > self.limit:
+				raise ValueError('the message exceeds {} bytes'.format(self.limit))
+			msgs.extend(json.loads(ln) for ln in lines if ln)
+		return msgs
+
+
+	def close(self):
+		"""Close the connection"""
+		self.sock.close()
+		self.closed = True
+
+
+class _RemoteProc(object):
+	"""Process of the job executed by the remote worker agent
+
+	The process is started, signaled and completed by the messages of the agent (see _AgentLink).
+	The interface mimics subprocess.Popen to manage the process as any other worker.
+	"""
+	def __init__(self, agent, job, slots, stdout=None, stderr=None):
+		"""Start the job by the agent
+
+		agent  - the worker agent, _AgentLink
+		job  - the job to be executed
+		slots  - worker slots of the agent occupied by the job
+		stdout  - None or file object or PIPE for the output of the process
+		stderr  - None or file object or PIPE or STDOUT for the error output of the process
+		"""
+		self.agent = agent
+		self.slots = slots
+		self.id = None  # Id of the process in the agent
+		self.pid = None  # Process id on the host of the agent
+		self.returncode = None
+		# Note: the output is transferred by the agent, so it is not captured by the pool
+		self.stdout = None
+		self.stderr = None
+		agent.start(self, job, (stdout, stderr))
+
+
+	def poll(self):
+		"""Check whether the process is completed
+
+		return  - returncode of the completed process or None
+		"""
+		if self.returncode is None:
+			self.agent.receive()
+		return self.returncode
+
+
+	def wait(self):
+		"""Wait for the process completion
+
+		return  - returncode of the completed process
+		"""
+		while self.returncode is None:
+			select.select((self.agent.channel,), (), ())
+			self.agent.receive()
+		return self.returncode
+
+
+	def send_signal(self, sig):
+		"""Send the signal to the process if it is not completed"""
+		if self.returncode is None:
+			self.agent.signal(self, sig)
+
+
+	def terminate(self):
+		"""Terminate the process with SIGTERM"""
+		self.send_signal(signal.SIGTERM)
+
+
+	def kill(self):
+		"""Kill the process with SIGKILL"""
+		self.send_signal(signal.SIGKILL)
+
+
+class _AgentLink(object):
+	"""Connection of the execution pool to the remote worker agent (see mpeagent.py)
+
+	The agent executes the jobs in its root directory, which is either the working directory
+	of the pool on the shared file system or its replica having the same executables, where
+	the inputs of the jobs (Job.inputs) are staged by the pool and their outputs (Job.outputs)
+	are fetched back on the completion. The output channels of the jobs and their resources
+	consumption are always transferred to the pool.
+
+	The pool and the agent authenticate each other by the HMAC of the challenges
+	with the shared secret token on the connection:
+	agent: {op: 'hello', nonce}
+	pool: {op: 'auth', digest, nonce}
+	agent: {op: 'ready', slots, digest}
+	"""
+	def __init__(self, address, token, staging=False):
+		"""Connect to the agent
+
+		address  - address of the agent: 'host[:port]' or (host, port)
+		token  - the shared secret token of the pool and the agent
+		staging  - stage the inputs of the jobs to the agent and fetch their outputs back,
+			otherwise the file system is shared
+		"""
+		if not token:
+			raise ValueError('the shared secret token of the agents is not specified ({})'.format(_AGENTTOKEN))
+		if isinstance(address, str):
+			host, port = address.rsplit(':', 1) if ':' in address else (address, _AGENTPORT)
+			address = (host, int(port))
+		self.address = address
+		self.staging = staging
+		sock = socket.create_connection(address, _AGENTTIMEOUT)
+		# Note: the channel operates on the blocking socket, the timeout is applied to the handshake only
+		sock.settimeout(None)
+		self.channel = _Channel(sock)
+		hello = self.__handshake('hello')
+		nonce = base64.b16encode(os.urandom(16))
+		self.channel.send({'op': 'auth', 'digest': _authDigest(token, str(hello.get('nonce'))), 'nonce': nonce})
+		ready = self.__handshake('ready')
+		if not hmac.compare_digest(_authDigest(token, nonce), str(ready.get('digest'))):
+			self.channel.close()
+			raise socket.error('the agent is not authenticated')
+		self.slots = ready['slots']  # Worker slots of the agent
+		self.busy = 0  # Worker slots of the agent occupied by the jobs
+		self._procs = {}  # Processes of the executing jobs: id: (proc, job, outputs)
+		self._ids = itertools.count(1)  # Ids of the processes
+		self._staged = {}  # Modification time of the staged inputs: path: mtime
+
+
+	def __handshake(self, op):
+		"""Receive the handshake message of the agent
+
+		op  - operation of the expected message
+
+		return  - the message
+		"""
+		msgs = self.channel.receive(True) if select.select((self.channel,), (), (), _AGENTTIMEOUT)[0] else None
+		if not msgs or msgs[0].get('op') != op:
+			self.channel.close()
+			raise socket.error('unexpected handshake of the agent, the token can be invalid')
+		return msgs[0]
+
+
+	def start(self, proc, job, outputs):
+		"""Start the job by the agent
+
+		proc  - remote process of the job
+		job  - the job to be started
+		outputs  - output channels of the job: (stdout, stderr), see _RemoteProc
+		"""
+		proc.id = next(self._ids)
+		# Output channels of the job: 'send' to the pool, 'drop' or 'merge' stderr into stdout
+		channels = []
+		targets = []  # Files to write the transferred output of the job
+		for chnl, outp, joutp in ((1, outputs[0], job.stdout), (2, outputs[1], job.stderr)):
+			if joutp == os.devnull:
+				channels.append('drop')
+				targets.append(None)
+			elif outp == STDOUT:
+				channels.append('merge')
+				targets.append(None)
+			else:
+				channels.append('send')
+				if outp == PIPE:
+					outp = tempfile.SpooledTemporaryFile(_SPOOLSIZE)
+					if chnl == 1:
+						job.outp = outp
+					else:
+						job.errp = outp
+				targets.append(outp or (sys.stdout if chnl == 1 else sys.stderr))
+		msg = {'op': 'start', 'id': proc.id, 'name': job.name, 'workdir': job.workdir, 'args': job.args
+			, 'timeout': job.timeout, 'slots': proc.slots, 'vmemlim': job.vmemlim, 'datalim': job.datalim
+			, 'cpulim': job.cpulim, 'channels': channels}
+		if self.staging:
+			# Note: only the inputs changed since the former staging are transferred
+			inputs = [inp for inp in job.inputs if os.path.exists(inp)
+				and self._staged.get(inp) != os.path.getmtime(inp)]
+			if inputs:
+				msg['inputs'] = _packPaths(inputs)
+			msg['dirs'] = [outp for outp in job.outputs if os.path.isdir(outp)]
+			msg['fetch'] = job.outputs
+		self.channel.send(msg)
+		if self.staging:
+			for inp in inputs:
+				self._staged[inp] = os.path.getmtime(inp)
+		self._procs[proc.id] = (proc, job, targets)
+		self.busy += proc.slots
+
+
+	def signal(self, proc, sig):
+		"""Send the signal to the remote process
+
+		proc  - remote process of the job
+		sig  - the signal
+		"""
+		try:
+			self.channel.send({'op': 'signal', 'id': proc.id, 'sig': sig})
+		except socket.error as err:
+			print('ERROR, the signal can not be sent to "{}" executed by the agent {}:{}: {}'.format(
+				self._procs[proc.id][1].name, self.address[0], self.address[1], err), file=sys.stderr)
+
+
+	def receive(self):
+		"""Process the received messages of the agent
+
+		return  - whether any job is completed
+		"""
+		completed = False
+		for msg in self.channel.receive():
+			entry = self._procs.get(msg.get('id'))
+			if not entry:
+				continue
+			proc, job, targets = entry
+			if msg['op'] == 'started':
+				proc.pid = msg['pid']
+			elif msg['op'] == 'output':
+				target = targets[msg['chnl'] - 1]
+				if target:
+					target.write(base64.b64decode(msg['data']))
+			elif msg['op'] == 'done':
+				if msg.get('outputs'):
+					try:
+						_unpackPaths(msg['outputs'], job.outputs)
+					except (tarfile.TarError, IOError, OSError) as err:
+						print('ERROR, outputs of "{}" can not be fetched from the agent {}:{}: {}'.format(
+							job.name, self.address[0], self.address[1], err), file=sys.stderr)
+				job.exectime = msg['exectime']
+				job.rusage = resource.struct_rusage(tuple(msg['rusage']) + (0,) * 13)
+				if msg.get('termcause') == 'timeout':
+					job._terminating = True  # The job is terminated by the agent on its timeout
+				proc.returncode = msg['returncode']
+				del self._procs[proc.id]
+				self.busy -= proc.slots
+				completed = True
+		if self.channel.closed and self.slots:
+			print('ERROR, the agent {}:{} is disconnected, its {} executing jobs are failed'.format(
+				self.address[0], self.address[1], len(self._procs)), file=sys.stderr)
+			for proc, job, targets in self._procs.itervalues():
+				job.exectime = time.time() - job.tstart
+				proc.returncode = -signal.SIGKILL
+			self._procs.clear()
+			self.busy = 0
+			self.slots = 0
+			completed = True
+		return completed
+
+
+	def close(self):
+		"""Close the connection to the agent"""
+		self.channel.close()
+
+
+class Journal(object):
+	"""Write-ahead journal of the jobs states
+
+	The states are appended to the journal file on each change:
+		queued  - the job is scheduled
+		started  - the job process is started
+		done  - the job is successfully completed
+		failed  - the job is failed or canceled
+		timeout, memout, cpuout  - the job is terminated by the respective limit
+		retry  - the failed job is scheduled for the next attempt
+		quarantined  - the job is failed on all its attempts
+	The terminal states are flushed to the disk to survive crashes of the host.
+	Jobs are identified by their name and fingerprint of the args and inputs, so
+	the job is considered completed on the resumed execution only if neither its
+	args nor the input files are changed, and all its declared input files exist.
+	"""
+	# States of the completed jobs, which are skipped on the resumed execution
+	# Note: jobs failed or canceled by the pool termination are executed again
+	COMPLETED = ('done', 'timeout', 'memout', 'cpuout', 'quarantined')
+
+	def __init__(self, path, resume=False):
+		"""Open the journal
+
+		path  - the journal file
+		resume  - load the states of the former execution and append the journal,
+			otherwise the journal is truncated
+		"""
+		self.path = path
+		self.resume = resume
+		self._states = {}  # States of the jobs of the former execution: name: (state, fingerprint)
+		if resume:
+			self.__load()
+		basedir = os.path.split(path)[0]
+		if basedir and not os.path.exists(basedir):
+			os.makedirs(basedir)
+		self._file = open(path, 'a' if resume else 'w')
+		if not self._file.tell():
+			self._file.write(_JOURNALHEADER)
+		self._file.write('# --- {} ---\n'.format(time.strftime('%Y-%m-%d %H:%M:%S')))
+		self._file.flush()
+
+
+	def __del__(self):
+		self.close()
+
+
+	def __load(self):
+		"""Load the latest states of the jobs from the journal"""
+		try:
+			with open(self.path, 'r') as fjnl:
+				for ln in fjnl:
+					# Note: the last line can be truncated by the crash
+					if not ln.endswith('\n') or ln[0] == '#':
+						continue
+					fields = ln.rstrip('\n').split('\t', 3)
+					if len(fields) == 4:
+						self._states[fields[3]] = (fields[1], fields[2])
+		except IOError:
+			pass  # The journal is absent, nothing to resume
+
+
+	def close(self):
+		"""Close the journal"""
+		if self._file:
+			self._file.close()
+			self._file = None
+
+
+	@staticmethod
+	def fingerprint(job, missing=None):
+		"""Fingerprint of the job
+
+		job  - the job
+		missing  - list to be extended with the declared inputs of the job, which do not exist
+			and are fingerprinted only by their names
+
+		return  - hex digest of the job name, args and size with modification time of the inputs
+		"""
+		fgp = hashlib.md5(job.name)
+		args = tuple(job.args or ())
+		if args and callable(args[0]):
+			# Note: repr of the callable contains its address, which varies between the executions
+			args = ('.'.join((getattr(args[0], '__module__', None) or '', getattr(args[0], '__name__', type(args[0]).__name__))),) + args[1:]
+		fgp.update(repr(args))
+		for finp in job.inputs:
+			try:
+				fst = os.stat(finp)
+				fgp.update('{}\t{}\t{}'.format(finp, fst.st_size, fst.st_mtime))
+			except OSError:
+				fgp.update(finp)
+				if missing is not None:
+					missing.append(finp)
+		return fgp.hexdigest()
+
+
+	def completed(self, job):
+		"""Whether the job is completed in the former execution
+
+		job  - the job to be executed
+
+		return  - True if the job is completed and neither its args nor inputs are changed,
+			the job having absent inputs is not completed since their changes can not be verified
+		"""
+		state = self._states.get(job.name)
+		if not state or state[0] not in Journal.COMPLETED:
+			return False
+		missing = []
+		if state[1] != Journal.fingerprint(job, missing):
+			return False
+		if missing:
+			print('WARNING, "{}" is executed again, its inputs are absent: {}'
+				.format(job.name, ', '.join(missing)), file=sys.stderr)
+			return False
+		return True
+
+
+	def log(self, job, state):
+		"""Log the job state
+
+		job  - the job
+		state  - new state of the job
+		"""
+		if not self._file:
+			return
+		# Note: the inputs can be formed by the dependencies of the job, so they are checked only on the start
+		missing = [] if state == 'started' else None
+		fgp = Journal.fingerprint(job, missing)
+		if missing:
+			print('WARNING, the inputs of "{}" are absent on its start, so their changes are not tracked: {}'
+				.format(job.name, ', '.join(missing)), file=sys.stderr)
+		try:
+			self._file.write('{:.3f}\t{}\t{}\t{}\n'.format(time.time(), state, fgp, job.name))
+			self._file.flush()
+			if state not in ('queued', 'started', 'retry'):
+				os.fsync(self._file.fileno())
+		except (IOError, OSError) as err:
+			print('ERROR on the journaling of "{}" into "{}": {}'.format(job.name, self.path, err), file=sys.stderr)
+
+
+class Cache(object):
+	"""Content-addressed cache of the job results
+
+	The job is identified by the content of its executable, the args (including the
+	content of the args being existing files) and the content of the inputs.
+	Results of the successfully completed job are cached: the outputs, custom stdout /
+	stderr files, captured PIPE output and resources consumption. The cached results are
+	restored instead of the job execution and the job is completed as usual (ondone is
+	called and the .rcp is appended).
+	Only the jobs having the outputs or the PIPE output are cached.
+	"""
+	def __init__(self, path):
+		"""Open the cache
+
+		path  - directory of the cache entries
+		"""
+		self.path = path if path.endswith('/') else path + '/'
+		self._digests = {}  # Content digests of the files: (path, size, mtime): digest
+		if not os.path.exists(self.path):
+			os.makedirs(self.path)
+
+
+	@staticmethod
+	def cacheable(job):
+		"""Whether the results of the job can be cached"""
+		return bool(job.args) and bool(job.outputs or PIPE in (job.stdout, job.stderr))
+
+
+	def __digest(self, path):
+		"""Content digest of the file
+
+		path  - the file
+
+		return  - hex digest of the file content or None if the file does not exist
+		"""
+		try:
+			fst = os.stat(path)
+		except OSError:
+			return None
+		fid = (os.path.abspath(path), fst.st_size, fst.st_mtime)
+		digest = self._digests.get(fid)
+		if digest is None:
+			fgp = hashlib.md5()
+			with open(path, 'rb') as finp:
+				for data in iter(lambda: finp.read(1024 ** 2), ''):
+					fgp.update(data)
+			digest = fgp.hexdigest()
+			self._digests[fid] = digest
+		return digest
+
+
+	@staticmethod
+	def __outputs(job):
+		"""Cached outputs of the job: outputs and custom stdout / stderr files"""
+		outputs = [outp.rstrip('/') for outp in job.outputs]
+		for outp in (job.stdout, job.stderr):
+			if outp and isinstance(outp, str) and outp != os.devnull and outp not in outputs:
+				outputs.append(outp)
+		return outputs
+
+
+	def key(self, job):
+		"""Key of the job results
+
+		job  - the job
+
+		return  - hex digest of the job executable, args and inputs content
+		"""
+		args = list(job.args)
+		workdir = job.workdir or ''
+		exe = args[0]
+		if callable(exe):
+			args[0] = '.'.join((getattr(exe, '__module__', None) or '', getattr(exe, '__name__', type(exe).__name__)))
+			exe = getattr(sys.modules.get(getattr(exe, '__module__', None)), '__file__', None)
+			if exe and exe.endswith(('.pyc', '.pyo')):
+				exe = exe[:-1]
+		elif os.sep in exe:
+			exe = os.path.join(workdir, exe)
+		else:
+			exe = distutils.spawn.find_executable(exe)
+		fgp = hashlib.md5(repr((workdir, args, Cache.__outputs(job)
+			, [outp if isinstance(outp, (str, int)) else None for outp in (job.stdout, job.stderr)])))
+		fgp.update(str(exe and self.__digest(exe)))
+		# Note: the input files are frequently specified by the args
+		for arg in args[1:]:
+			if isinstance(arg, str) and os.path.isfile(os.path.join(workdir, arg)):
+				fgp.update(self.__digest(os.path.join(workdir, arg)))
+		for finp in job.inputs:
+			fgp.update('{}\t{}'.format(finp, self.__digest(finp)))
+		return fgp.hexdigest()
+
+
+	def __entry(self, key):
+		"""File of the cache entry"""
+		return ''.join((self.path, key[:2], '/', key, '.tar'))
+
+
+	def restore(self, job):
+		"""Restore the cached results of the job
+
+		job  - the job to be executed
+
+		return  - whether the results are restored
+		"""
+		entry = self.__entry(job._cachekey)
+		if not os.path.exists(entry):
+			return False
+		try:
+			with tarfile.open(entry, 'r') as tar:
+				meta = json.load(tar.extractfile('meta'))
+				members = tar.getmembers()
+				for i, outp in enumerate(meta['outputs']):
+					outp = str(outp)
+					if os.path.isdir(outp) and not os.path.islink(outp):
+						shutil.rmtree(outp)
+					elif os.path.lexists(outp):
+						os.remove(outp)
+					arcname = 'o{}'.format(i)
+					omembers = []
+					for member in members:
+						if member.name == arcname or member.name.startswith(arcname + '/'):
+							member.name = outp + member.name[len(arcname):]
+							omembers.append(member)
+					tar.extractall('.', omembers)
+				for name in ('stdout', 'stderr'):
+					if name not in meta['pipes']:
+						continue
+					spool = tempfile.SpooledTemporaryFile(_SPOOLSIZE)
+					shutil.copyfileobj(tar.extractfile(name), spool)
+					spool.seek(0)
+					if name == 'stdout':
+						job.outp = spool
+					else:
+						job.errp = spool
+		except (tarfile.TarError, IOError, OSError, ValueError, KeyError) as err:
+			print('WARNING, cached results of "{}" can not be restored, the job is executed: {}'
+				.format(job.name, err), file=sys.stderr)
+			for outp in (job.outp, job.errp):
+				if outp:
+					outp.close()
+			job.outp = None
+			job.errp = None
+			return False
+		job.proc = _DoneProc(0, 0)
+		job.exectime = meta['exectime']
+		job.rusage = resource.struct_rusage(tuple(meta['rusage']) + (0,) * 13)
+		return True
+
+
+	def store(self, job):
+		"""Cache results of the successfully completed job
+
+		job  - the completed job
+		"""
+		entry = self.__entry(job._cachekey)
+		basedir = os.path.split(entry)[0]
+		tmpname = None
+		try:
+			if not os.path.exists(basedir):
+				os.makedirs(basedir)
+			outputs = [outp for outp in Cache.__outputs(job) if os.path.exists(outp)]
+			pipes = {}
+			if job.outp:
+				pipes['stdout'] = job.outp
+			if job.errp:
+				pipes['stderr'] = job.errp
+			meta = {'name': job.name, 'outputs': outputs, 'pipes': pipes.keys(), 'exectime': job.exectime or 0
+				, 'rusage': [job.rusage.ru_utime, job.rusage.ru_stime, job.rusage.ru_maxrss] if job.rusage else [0, 0, 0]}
+			fd, tmpname = tempfile.mkstemp(dir=basedir)
+			os.close(fd)
+			with tarfile.open(tmpname, 'w') as tar:
+				for name, data in [('meta', json.dumps(meta))] + [(name, outp.read()) for name, outp in pipes.iteritems()]:
+					info = tarfile.TarInfo(name)
+					info.size = len(data)
+					info.mtime = time.time()
+					tar.addfile(info, io.BytesIO(data))
+				for i, outp in enumerate(outputs):
+					tar.add(outp, 'o{}'.format(i))
+			# Note: the entry appears atomically
+			os.rename(tmpname, entry)
+			tmpname = None
+		except (tarfile.TarError, IOError, OSError) as err:
+			print('WARNING, results of "{}" can not be cached: {}'.format(job.name, err), file=sys.stderr)
+		finally:
+			for outp in (job.outp, job.errp):
+				if outp:
+					outp.seek(0)
+			if tmpname:
+				os.remove(tmpname)
+
+
+class Status(object):
+	"""Live metrics of the execution pool
+
+	The snapshot of the pool (see ExecPool.stats()) is periodically rewritten to the
+	JSON status file and served in the Prometheus text format by the HTTP endpoint
+	on the localhost (the JSON snapshot is served on the "/status" path). The endpoint
+	is served by the execution cycle of the pool without any threads.
+	"""
+	def __init__(self, path=None, port=None, period=_STATUSPERIOD):
+		"""Open the status outputs
+
+		path  - the JSON status file. Default: None, the file is not maintained
+		port  - port of the HTTP endpoint on the localhost. Default: None, the metrics are not served
+		period  - min interval in sec between the rewritings of the status file
+		"""
+		self.path = path
+		self.period = period
+		self._tsaved = 0  # Last time of the status file rewriting
+		# Counters of the completed jobs
+		self.succeeded = 0
+		self.failed = 0
+		self.timeouts = 0  # Jobs terminated by the timeout, also counted as failed
+		self.busytime = 0  # Slot-seconds of the completed job processes to evaluate the average utilization
+		self._sock = None  # Listening socket of the HTTP endpoint
+		if path:
+			basedir = os.path.split(path)[0]
+			if basedir and not os.path.exists(basedir):
+				os.makedirs(basedir)
+		if port is not None:
+			try:
+				self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+				self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+				self._sock.bind(('127.0.0.1', port))
+				self._sock.listen(8)
+				self._sock.setblocking(0)
+				# Do not inherit the listening socket by the workers
+				fd = self._sock.fileno()
+				fcntl.fcntl(fd, fcntl.F_SETFD, fcntl.fcntl(fd, fcntl.F_GETFD) | fcntl.FD_CLOEXEC)
+			except socket.error as err:
+				print('WARNING, the metrics can not be served on the port {}: {}'.format(port, err), file=sys.stderr)
+				self.close()
+
+
+	def __del__(self):
+		self.close()
+
+
+	def close(self):
+		"""Stop serving the metrics"""
+		if self._sock:
+			self._sock.close()
+			self._sock = None
+
+
+	def fileno(self):
+		"""File descriptor of the listening socket of the HTTP endpoint or None"""
+		return self._sock.fileno() if self._sock else None
+
+
+	def completed(self, job):
+		"""Account the completed job
+
+		job  - the completed job
+		"""
+		if job._succeeded:
+			self.succeeded += 1
+		else:
+			self.failed += 1
+			if job.termcause == 'timeout':
+				self.timeouts += 1
+		if job.exectime:
+			self.busytime += job.exectime * max(job.slots, 1)
+
+
+	def update(self, snapshot, force=False):
+		"""Rewrite the status file if its period is elapsed
+
+		snapshot  - callable returning the snapshot of the pool
+		force  - rewrite the status file regardless of the period
+		"""
+		if not self.path or (not force and time.time() - self._tsaved < self.period):
+			return
+		self._tsaved = time.time()
+		basedir = os.path.split(self.path)[0]
+		tmpname = None
+		try:
+			fd, tmpname = tempfile.mkstemp(dir=basedir or None)
+			with os.fdopen(fd, 'w') as fstat:
+				json.dump(snapshot(), fstat, indent=1, sort_keys=True)
+			# Note: the readers never observe the partially written status
+			os.rename(tmpname, self.path)
+			tmpname = None
+		except (IOError, OSError) as err:
+			print('WARNING, the status can not be written into "{}": {}'.format(self.path, err), file=sys.stderr)
+		finally:
+			if tmpname:
+				os.remove(tmpname)
+
+
+	def serve(self, snapshot):
+		"""Serve the pending requests to the HTTP endpoint
+
+		snapshot  - callable returning the snapshot of the pool
+		"""
+		while self._sock:
+			try:
+				conn = self._sock.accept()[0]
+			except socket.error as err:
+				if err.args[0] not in (errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR):
+					print('WARNING, the metrics request can not be accepted: {}'.format(err), file=sys.stderr)
+				return
+			try:
+				# Note: the requests are tiny, the slow clients are not waited for long
+				conn.settimeout(0.5)
+				request = ''
+				while '\r\n\r\n' not in request and '\n\n' not in request and len(request) < 8192:
+					data = conn.recv(4096)
+					if not data:
+						break
+					request += data
+				fields = request.split(None, 2)
+				path = fields[1] if len(fields) >= 2 else '/'
+				if path.split('?', 1)[0] == '/status':
+					body = json.dumps(snapshot(), indent=1, sort_keys=True)
+					ctype = 'application/json'
+				else:
+					body = Status.prometheus(snapshot())
+					ctype = 'text/plain; version=0.0.4'
+				conn.sendall('HTTP/1.0 200 OK\r\nContent-Type: {}\r\nContent-Length: {}\r\nConnection: close\r\n\r\n{}'
+					.format(ctype, len(body), body))
+			except socket.error as err:
+				if DEBUG_TRACE:
+					print('The metrics request is failed: {}'.format(err), file=sys.stderr)
+			finally:
+				conn.close()
+
+
+	@staticmethod
+	def prometheus(stats):
+		"""Format the snapshot of the pool as the Prometheus text exposition
+
+		stats  - snapshot of the pool
+
+		return  - the metrics text
+		"""
+		def label(val):
+			"""Escaped label value"""
+			return str(val).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+		lines = []
+		for name, mtype, descr, val in (
+		('workers', 'gauge', 'Max number of the worker slots', stats['workers'])
+		, ('busy_workers', 'gauge', 'Worker slots occupied by the executing jobs', stats['busy'])
+		, ('utilization', 'gauge', 'Fraction of the occupied worker slots', stats['utilization'])
+		, ('utilization_avg', 'gauge', 'Average fraction of the occupied worker slots since the start', stats['avgutil'])
+		, ('queued_jobs', 'gauge', 'Jobs waiting for the free workers', stats['queued'])
+		, ('delayed_jobs', 'gauge', 'Failed jobs waiting for their retry', stats['delayed'])
+		, ('pending_jobs', 'gauge', 'Jobs waiting for their dependencies', stats['pending'])
+		, ('sources', 'gauge', 'Lazy sources of the jobs being not exhausted', stats['sources'])
+		, ('elapsed_seconds', 'gauge', 'Execution time of the pool', stats['elapsed'])
+		, ('completion_rate', 'gauge', 'Completed jobs per hour', stats['rate'])
+		, ('failure_ratio', 'gauge', 'Fraction of the failed completed jobs', stats['failratio'])
+		, ('eta_seconds', 'gauge', 'Estimated remaining time of the known jobs', stats['eta'])):
+			if val is None:
+				continue
+			lines.append('# HELP execpool_{0} {1}\n# TYPE execpool_{0} {2}\nexecpool_{0} {3}'.format(name, descr, mtype, val))
+		lines.append('# HELP execpool_jobs_total Completed jobs by the outcome, the timeouts are also failed\n# TYPE execpool_jobs_total counter')
+		for state in ('succeeded', 'failed', 'timeouts'):
+			lines.append('execpool_jobs_total{{outcome="{}"}} {}'.format(state, stats[state]))
+		for name, key, descr in (('job_elapsed_seconds', 'elapsed', 'Execution time of the running job')
+		, ('job_rss_mbytes', 'rss', 'RSS of the running job process')):
+			lines.append('# HELP execpool_{0} {1}\n# TYPE execpool_{0} gauge'.format(name, descr))
+			lines.extend('execpool_{}{{job="{}",pid="{}"}} {}'.format(name, label(job['name']), job['pid'], job[key])
+				for job in stats['running'])
+		return '\n'.join(lines) + '\n'
+
+
+class Tracer(object):
+	"""Timeline of the execution in the Chrome trace-event format (JSON array)
+
+	The timeline is viewable by chrome://tracing and Perfetto: the spans of the stages
+	are shown on the "stages" track, the jobs on the "slot N" tracks (a track per
+	concurrently executing job) and the number of the queued and running jobs on the
+	"jobs" counter. The events are appended on the fly, so the timeline of the interrupted
+	execution is also viewable (the viewers tolerate the unterminated array).
+	A single tracer can be shared by several execution pools.
+	"""
+	def __init__(self, path):
+		"""Open the timeline
+
+		path  - the output JSON file
+		"""
+		self.path = path
+		self._tstart = time.time()  # Origin of the timestamps
+		self._pid = os.getpid()
+		self._lanes = {}  # Tracks of the executing jobs: job: track
+		self._free = []  # Heap of the released tracks
+		self._ntracks = 1  # Number of the allocated tracks, track 0 is dedicated to the stages
+		self._counts = None  # Last traced number of the queued and running jobs
+		basedir = os.path.split(path)[0]
+		if basedir and not os.path.exists(basedir):
+			os.makedirs(basedir)
+		self._file = open(path, 'w')
+		self._file.write('[')
+		self._sep = '\n'  # Separator of the events
+		self.__event('M', 'process_name', 0, {'name': os.path.basename(sys.argv[0]) or 'python'})
+		self.__event('M', 'thread_name', 0, {'name': 'stages'})
+
+
+	def __del__(self):
+		self.close()
+
+
+	def close(self):
+		"""Complete the timeline"""
+		if self._file:
+			self._file.write('\n]\n')
+			self._file.close()
+			self._file = None
+
+
+	def __event(self, phase, name, track, args=None, ts=None):
+		"""Append the trace event
+
+		phase  - type of the event: 'B', 'E', 'i', 'C', 'M'
+		name  - name of the event
+		track  - track (thread id) of the event
+		args  - arguments of the event
+		ts  - time of the event, the current time is used if omitted
+		"""
+		if not self._file:
+			return
+		event = {'ph': phase, 'name': name, 'pid': self._pid, 'tid': track
+			, 'ts': round(((ts if ts is not None else time.time()) - self._tstart) * 1e6, 1)}
+		if args:
+			event['args'] = args
+		if phase == 'i':
+			event['s'] = 't'  # Scope of the instant event is its track
+		try:
+			self._file.write(self._sep + json.dumps(event))
+			self._sep = ',\n'
+		except IOError as err:
+			print('ERROR on the tracing into "{}": {}'.format(self.path, err), file=sys.stderr)
+			self._file.close()
+			self._file = None
+
+
+	@contextlib.contextmanager
+	def span(self, name, **args):
+		"""Trace span of the stage
+
+		name  - name of the stage
+		args  - arguments of the stage
+		"""
+		self.__event('B', name, 0, args)
+		try:
+			yield
+		finally:
+			self.__event('E', name, 0)
+			if self._file:
+				self._file.flush()
+
+
+	def queued(self, job):
+		"""Trace the scheduled job
+
+		job  - the job
+		"""
+		self.__event('i', 'queued: ' + job.name, 0)
+
+
+	def started(self, job):
+		"""Trace the started job
+
+		job  - the job
+		"""
+		if job in self._lanes:
+			return
+		if self._free:
+			track = heapq.heappop(self._free)
+		else:
+			track = self._ntracks
+			self._ntracks += 1
+			self.__event('M', 'thread_name', track, {'name': 'slot {}'.format(track)})
+			self.__event('M', 'thread_sort_index', track, {'sort_index': track})
+		self._lanes[job] = track
+		args = {'pid': job.proc.pid if job.proc else None}
+		if job._cpus:
+			args['cpus'] = job._cpus
+		if job._agent:
+			args['agent'] = '{}:{}'.format(*job._agent.address)
+		if job._batch:
+			args['batch'] = [bjob.name for bjob in job._batch]
+		self.__event('B', job.name, track, args, job.tstart)
+
+
+	def finished(self, job):
+		"""Trace the completed or terminated job
+
+		job  - the job
+		"""
+		track = self._lanes.pop(job, None)
+		if track is None:
+			return
+		args = {'returncode': job.proc.returncode if job.proc else None}
+		if job._terminating:
+			self.__event('i', 'timeout', track)
+			args['termcause'] = 'timeout'
+		self.__event('E', job.name, track, args)
+		heapq.heappush(self._free, track)
+
+
+	def counter(self, queued, running):
+		"""Trace the number of the queued and running jobs if changed
+
+		queued  - number of the queued jobs including the jobs waiting for their dependencies
+		running  - number of the occupied worker slots
+		"""
+		if self._counts != (queued, running):
+			self._counts = (queued, running)
+			self.__event('C', 'jobs', 0, {'queued': queued, 'running': running})
+
+
+class _Sampler(object):
+	"""Sampler of the resources consumption time series of the executing jobs
+
+	The series of each job is written to the .rts file next to its log (the stderr
+	or stdout file), the job is not sampled if both are not files. Each sample accounts
+	the job process with all its descendant processes.
+	"""
+	def __init__(self, interval):
+		"""Sampler constructor
+
+		interval  - sampling interval in sec
+		"""
+		assert interval > 0, 'Invalid sampling interval: ' + str(interval)
+		self.interval = interval
+		self.tnext = 0  # Time of the next sampling
+		self._series = {}  # Series of the executing jobs: job: [file, time, cputicks] or None if not sampled
+
+
+	@staticmethod
+	def path(job):
+		"""Path of the resources consumption time series of the job or None"""
+		for outp in (job.stderr, job.stdout):
+			if outp and isinstance(outp, str) and outp != os.devnull:
+				return os.path.splitext(outp)[0] + _RTSEXT
+		return None
+
+
+	def sample(self, jobs):
+		"""Sample the resources consumption of the executing jobs
+
+		jobs  - the executing jobs
+		"""
+		now = time.time()
+		self.tnext = now + self.interval
+		stats = procStats()
+		children = {}  # Child processes: ppid: [pid, ...]
+		for pid, stat in stats.iteritems():
+			children.setdefault(stat[0], []).append(pid)
+		for job in jobs:
+			# Note: the batch workers execute a series of tiny jobs, which are not sampled
+			if job._batch or not job.proc or job.proc.pid not in stats:
+				continue
+			series = self._series.get(job, False)
+			if series is False:
+				series = None
+				path = _Sampler.path(job)
+				if path:
+					try:
+						series = [open(path, 'w'), job.tstart, 0]
+						series[0].write(_RTSHEADER)
+					except IOError as err:
+						print('WARNING, resources consumption of "{}" can not be sampled into "{}": {}'
+							.format(job.name, path, err), file=sys.stderr)
+				self._series[job] = series
+			if not series:
+				continue
+			# Aggregate the process tree of the job
+			pids = [job.proc.pid]
+			ticks = 0
+			threads = 0
+			rss = 0
+			rbytes = 0
+			wbytes = 0
+			for pid in pids:
+				stat = stats.get(pid)
+				if not stat:
+					continue
+				pids.extend(children.get(pid, ()))
+				ticks += stat[1]
+				threads += stat[2]
+				rss += procRss(pid)
+				ior, iow = procIo(pid)
+				rbytes += ior
+				wbytes += iow
+			# Note: CPU utilization is evaluated since the previous sample
+			cpu = max(ticks - series[2], 0) / float(_CLKTCK) / max(now - series[1], 1e-3) * 100
+			series[1] = now
+			series[2] = ticks
+			try:
+				series[0].write('{:.3f}\t{:.1f}\t{:.3f}\t{:.3f}\t{:.3f}\t{}\t{}\n'.format(now - job.tstart, cpu, rss
+					, rbytes / 1024. ** 2, wbytes / 1024. ** 2, threads, len(pids)))
+				series[0].flush()
+			except IOError as err:
+				print('WARNING, resources consumption of "{}" can not be sampled: {}'.format(job.name, err), file=sys.stderr)
+				series[0].close()
+				self._series[job] = None
+
+
+	def close(self, job):
+		"""Complete the time series of the job leaving the workers
+
+		job  - the job
+		"""
+		series = self._series.pop(job, None)
+		if series:
+			series[0].close()
+
+
+class _JobQueue(object):
+	"""Queue of the jobs waiting for the free workers
+
+	The most costly job is fetched first. On the fair-share scheduling the jobs are queued
+	per group and fetched from the group having the least virtual time, which is the
+	slot-seconds consumed by the group (including its executing jobs) divided by its weight.
+	So the groups are served in proportion to their weights regardless of the order of the
+	scheduling. The group becoming active again is not allowed to catch up its former idle
+	time, its virtual time is lifted to the least one of the active groups.
+
+	>>> queue = _JobQueue({'b': 2})
+	>>> for i, group in enumerate('aaabbb'):
+	... 	queue.push((0, i, Job('{}{}'.format(group, i), group=group)))
+	>>> job = queue.pop(0)[2]; queue.started(job, 1); queue.stopped(job, 2); job.name
+	'a0'
+	>>> job = queue.pop(2)[2]; queue.started(job, 1); queue.stopped(job, 4); job.name
+	'b3'
+	>>> [queue.vtime(group, 4) for group in 'ab'], len(queue)
+	([2.0, 1.0], 4)
+	>>> queue.pop(4)[2].name
+	'b4'
+	"""
+	def __init__(self, shares=None):
+		"""Queue constructor
+
+		shares  - weights of the job groups for the fair-share scheduling: {group: weight},
+			the unlisted groups have the weight 1. Default: None, the groups are not considered
+		"""
+		self._shares = shares
+		self._heaps = {}  # Queued jobs of the groups, heaps of: (-cost, seqnum, job)
+		self._size = 0  # Number of the queued jobs
+		self._used = {}  # Slot-seconds consumed by the completed jobs of the groups
+		self._slots = {}  # Slots occupied by the executing jobs of the groups
+		self._tslots = {}  # Start times of the executing jobs of the groups multiplied by their slots
+		self._running = {}  # Executing jobs: job: (slots, tstart)
+		self._tpop = 0  # Time of the last fetching of the job
+
+
+	def __len__(self):
+		return self._size
+
+
+	def __nonzero__(self):
+		return self._size != 0
+
+
+	def __iter__(self):
+		"""Iterate over the queued jobs entries: (-cost, seqnum, job)"""
+		return itertools.chain.from_iterable(self._heaps.itervalues())
+
+
+	def _group(self, job):
+		"""Queue group of the job"""
+		return job.group if self._shares is not None else None
+
+
+	def vtime(self, group, now):
+		"""Virtual time of the group
+
+		group  - the job group
+		now  - current time
+
+		return  - slot-seconds consumed by the group divided by its weight
+		"""
+		used = self._used.get(group, 0) + self._slots.get(group, 0) * now - self._tslots.get(group, 0)
+		return used / float(self._shares.get(group, 1))
+
+
+	def push(self, qjob, restore=False):
+		"""Queue the job
+
+		qjob  - the job entry: (-cost, seqnum, job)
+		restore  - the job is returned to the queue after its fetching, so the virtual
+			time of its group is retained
+		"""
+		group = self._group(qjob[2])
+		heap = self._heaps.get(group)
+		if heap is None:
+			heap = self._heaps[group] = []
+			if self._shares is not None and not restore and not self._slots.get(group):
+				now = time.time()
+				active = [self.vtime(gr, now) for gr in set(self._heaps).union(self._slots) if gr != group
+					and (self._heaps.get(gr) or self._slots.get(gr))]
+				if active and self.vtime(group, now) < min(active):
+					self._used[group] = (min(active) * self._shares.get(group, 1)
+						- self._slots.get(group, 0) * now + self._tslots.get(group, 0))
+		heapq.heappush(heap, qjob)
+		self._size += 1
+
+
+	def pop(self, now=None):
+		"""Fetch the next job to be started
+
+		now  - current time, used on the fair-share scheduling. The jobs fetched to be started
+			together should have the same time to not prefer the groups by the order of fetching
+
+		return  - the queued job entry: (-cost, seqnum, job)
+		"""
+		if self._shares is None:
+			group = None
+		else:
+			if now is None:
+				now = time.time()
+			self._tpop = now
+			group = min(self._heaps, key=lambda gr: (self.vtime(gr, now)
+				, self._slots.get(gr, 0) / float(self._shares.get(gr, 1)), self._heaps[gr][0]))
+		heap = self._heaps[group]
+		qjob = heapq.heappop(heap)
+		if not heap:
+			del self._heaps[group]
+		self._size -= 1
+		return qjob
+
+
+	def retain(self, qjobs):
+		"""Replace the queued jobs retaining the virtual time of the groups
+
+		qjobs  - the job entries to be queued: (-cost, seqnum, job)
+		"""
+		self.clear()
+		for qjob in qjobs:
+			self.push(qjob, True)
+
+
+	def clear(self):
+		"""Remove all the queued jobs"""
+		self._heaps.clear()
+		self._size = 0
+
+
+	def started(self, job, slots):
+		"""Account the started job in the virtual time of its group since its fetching
+
+		job  - the started job, which is fetched by the last pop()
+		slots  - worker slots occupied by the job
+		"""
+		if self._shares is None:
+			return
+		group = job.group
+		self._running[job] = (slots, self._tpop)
+		self._slots[group] = self._slots.get(group, 0) + slots
+		self._tslots[group] = self._tslots.get(group, 0) + slots * self._tpop
+
+
+	def stopped(self, job, tstop):
+		"""Account the completed job in the virtual time of its group
+
+		job  - the completed job
+		tstop  - completion time of the job
+		"""
+		slots, tstart = self._running.pop(job, (None, None))
+		if slots is None:
+			return
+		group = job.group
+		self._used[group] = self._used.get(group, 0) + slots * (tstop - tstart)
+		self._slots[group] -= slots
+		if self._slots[group]:
+			self._tslots[group] -= slots * tstart
+		else:
+			# Note: the accumulated rounding errors are discarded
+			del self._slots[group]
+			del self._tslots[group]
+
+
+class ExecPool(object):
+	'''Execution Pool of workers for jobs
+
+	A worker in the pool executes only the one job, a new worker is created for
+	each subsequent job.
+	'''
+
+	def __init__(self, workers=cpu_count(), memlimit=0, affinity=None, numa=False, journal=None, resume=False
+	, preload=(), batch=1, cache=None, status=None, metrics=None
+	, sampling=0, trace=None, adaptive=0, shares=None, agents=(), staging=False, token=None):
+		"""Execution Pool constructor
+
+		workers  - number of the worker slots (cores), the executing jobs occupy Job.slots each
+		memlimit  - memory budget of the workers in Mb. The queued jobs are started only
+			while their reserved memory (Job.mem) together with the memory of the executing
+			jobs (max of the reserved and the observed RSS) fits the budget. Smaller jobs
+			are backfilled around the larger ones waiting for the memory.
+			Default: 0, means unlimited
+		affinity  - binding of the worker slots to the fixed sets of the logical CPUs,
+			each started job is bound to the cores of its slot to have reproducible timings:
+			None  - the workers are not bound, the kernel places and migrates them. Default
+			'cpu'  - a single logical CPU (hardware thread) per slot, the hardware threads
+				of the same physical core are assigned only when the cores are exhausted
+			'core'  - a physical core with all its hardware threads per slot
+			NOTE: the slots are interleaved over the NUMA nodes and reused cyclically
+			if the workers exceed the available cores
+		numa  - prefer memory allocation on the NUMA node of the slot using numactl,
+			applicable only with the affinity. Otherwise the memory is allocated by the default
+			(local on the first touch) policy of the kernel
+		journal  - file of the write-ahead journal of the jobs states to resume the interrupted
+			execution. Default: None, the journal is not maintained
+		resume  - resume the former execution according to the journal skipping the completed
+			jobs (see Journal.COMPLETED). Default: False, the journal is truncated
+		preload  - names of the modules to be imported by the pool to be shared by the jobs
+			executing Python callables instead of importing them in each job process
+		batch  - max number of the queued jobs having the same Job.batchkey to be executed
+			one by one by a single worker process. Default: 1, the jobs are not batched
+		cache  - directory of the content-addressed cache of the job results (see Cache)
+			to restore the results instead of the execution of the jobs having the same
+			executable, args and inputs. Default: None, the results are not cached
+		status  - JSON file of the live metrics of the pool (see stats()) rewritten periodically.
+			Default: None, the file is not maintained
+		metrics  - port of the HTTP endpoint on the localhost serving the live metrics in the
+			Prometheus text format (see Status). Default: None, the metrics are not served
+		sampling  - interval in sec of the sampling of the resources consumption time series
+			(CPU utilization, RSS, storage IO, threads) of the executing jobs including their
+			child processes. The series is written to the .rts file next to the log of the job
+			(its stderr or stdout file). Default: 0, the jobs are not sampled
+		trace  - Tracer of the timeline of the jobs execution, which can be shared by several
+			pools. Default: None, the execution is not traced
+		adaptive  - min number of the worker slots in the adaptive mode, where the limit of the
+			workers is adapted within [adaptive, workers] to the load of the host: the load
+			average, the pressure stall information (/proc/pressure) of the CPU, memory and IO
+			and the trend of the available memory. The workers are added one by one while the
+			host has spare resources and reduced by a quarter on the memory or IO thrashing
+			or the CPU overload. Default: 0, the limit of the workers is fixed
+		shares  - weights of the job groups (see Job.group) for the fair-share scheduling: {group: weight},
+			the unlisted groups have the weight 1. The next job is taken from the group having
+			the least virtual time, which is the slot-seconds consumed by the group divided by its
+			weight (see _JobQueue), so the groups are executed concurrently in proportion to their
+			weights regardless of the order of the scheduling and the fast groups are completed early.
+			Default: None, the jobs are started in the order of decreasing cost regardless of their groups
+		agents  - addresses of the remote worker agents (see mpeagent.py): 'host[:port]' or (host, port).
+			The executable jobs (not Python callables) are sent to the agents having free slots
+			when the local workers are occupied, the agents extend the worker slots of the pool.
+			Default: (), the jobs are executed only locally
+		staging  - stage the inputs (Job.inputs) of the jobs to the agents and fetch their outputs
+			(Job.outputs) back instead of the shared file system between the pool and the agents.
+			NOTE: the executables of the jobs should be available on the hosts of the agents
+			at the same paths relative to their root directories
+		token  - shared secret token authenticating the pool and the agents, the value of
+			the MPEAGENT_TOKEN environment variable by default
+		"""
+		assert workers >= 1 and memlimit >= 0, 'At least one worker should be managed by the pool'
+		assert 0 <= adaptive <= workers, 'Invalid min number of the workers: ' + str(adaptive)
+		assert not shares or min(shares.itervalues()) > 0, 'Weights of the groups should be positive'
+		assert batch >= 1, 'Invalid size of the batches: ' + str(batch)
+		assert sampling >= 0, 'Invalid sampling interval: ' + str(sampling)
+		assert affinity in (None, 'cpu', 'core'), 'Invalid affinity: ' + str(affinity)
+
+		self._workersLim = workers  # Max number of the worker slots occupied by the jobs
+		self._workersMax = workers  # Upper bound of the workers limit
+		self._workersMin = adaptive  # Lower bound of the adaptive workers limit, 0 if the limit is fixed
+		self._memlimit = memlimit  # Memory budget of the workers in Mb
+		self._slots = self.__slots(affinity) if affinity else None  # Slots of the workers: (cpus, node)
+		if adaptive:
+			# Note: the load of the host is formed by other processes before the execution
+			self._ncpus = len(cpuAffinity())  # Logical CPUs available for the workers
+			self._workersLim = max(adaptive, min(workers, int(round(self._ncpus - os.getloadavg()[0]))))
+			self._tadapt = time.time() + _ADAPTPERIOD  # Time of the next adaptation
+			self._memavail = None  # Former available memory: (time, Mb)
+		self._freeSlots = range(len(self._slots)) if self._slots else None  # Heap of the free slots
+		if numa and not _NUMACTL and affinity:
+			print('WARNING, numactl is not available, the memory of the jobs is allocated'
+				' by the default policy of the kernel', file=sys.stderr)
+		self._numa = numa and bool(_NUMACTL) and bool(affinity)  # Bind memory to the NUMA node of the slot
+		self._journal = Journal(journal, resume) if journal else None  # Journal of the jobs states
+		self.resume = bool(self._journal) and resume  # The former execution is resumed
+		self._batch = batch  # Max number of the jobs executed by a single worker
+		self._cache = Cache(cache) if cache else None  # Cache of the job results
+		self._status = Status(status, metrics)  # Live metrics of the pool
+		self._sampler = _Sampler(sampling) if sampling else None  # Sampler of the resources consumption of the jobs
+		self._shares = shares  # Weights of the job groups for the fair-share scheduling
+		self._groups = set()  # Groups of the lazily scheduled jobs
+		self._trace = trace  # Tracer of the execution timeline
+		self._agents = []  # Connections to the remote worker agents
+		if agents and not token:
+			token = os.environ.get(_AGENTTOKEN)
+		for address in agents:
+			try:
+				agent = _AgentLink(address, token, staging)
+			except (socket.error, ValueError) as err:
+				print('ERROR, the worker agent {} is not connected, it is skipped: {}'.format(address, err), file=sys.stderr)
+				continue
+			self._agents.append(agent)
+			print('The worker agent {}:{} is connected providing {} worker slots'.format(
+				agent.address[0], agent.address[1], agent.slots))
+		for modname in preload:
+			try:
+				importlib.import_module(modname)
+			except ImportError as err:
+				print('WARNING, "{}" module can not be preloaded: {}'
+					.format(modname, err), file=sys.stderr)
+		self._workers = {}  # Current workers: 'jname': <proc>; <proc>: timeout
+		# Scheduled jobs: (-cost, seqnum, job), the most costly jobs (of the least served group) are started first
+		self._jobs = _JobQueue(shares)
+		self._jobseq = itertools.count()  # Sequence numbers to preserve the order of the jobs having the same cost
+		self._pending = []  # Jobs waiting for the completion of their dependencies
+		self._delayed = []  # Failed jobs waiting for their retry, heap of: (time, seqnum, job)
+		self._sources = []  # Iterators of the jobs to be scheduled lazily
+		self._pipes = {}  # Captured output pipes of the workers: fd: (job, pipe, spool)
+		self._tstart = None  # Start time of the execution of the first task
+		# Predefined privte attributes
+		self._latency = 1  # Max wait time (1 sec) between the workers revisions
+		self._killCount = 3  # 3 cycles of self._latency, termination wait time
+		# Timeouts of the executing jobs, heap of: (deadline, seqnum, proc, job)
+		# Note: entries of the completed or restarted jobs are skipped lazily
+		self._deadlines = []
+		self._dlseq = itertools.count()  # Sequence numbers to order jobs having the same deadline
+		# Deadlines of the tasks of the scheduled jobs, heap of the time, and the set of them to skip duplicates
+		self._taskdls = []
+		self._taskdlset = set()
+		self._canceled = set()  # Canceled tasks of the scheduled jobs, which are dropped on the revision
+		# Self-pipe to wake up the execution cycle on the worker termination (SIGCHLD)
+		self._wakerd = None
+		self._wakewr = None
+		self._sigchld = None  # Former SIGCHLD handler, which is restored after the execution cycle
+		self._wakefd = -1  # Former wakeup fd of the signals
+		self._waking = False  # Whether SIGCHLD wakes up the execution cycle
+		self._wakerd, self._wakewr = os.pipe()
+		for fd in (self._wakerd, self._wakewr):
+			fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+			# Do not inherit the pipe by the workers
+			fcntl.fcntl(fd, fcntl.F_SETFD, fcntl.fcntl(fd, fcntl.F_GETFD) | fcntl.FD_CLOEXEC)
+
+
+	def __del__(self):
+		self.__terminate()
+		self.__unwatch()
+		for agent in self._agents:
+			agent.close()
+		if self._journal:
+			self._journal.close()
+		self._status.close()
+		for fd in (self._wakerd, self._wakewr):
+			if fd is not None:
+				os.close(fd)
+		self._wakerd = None
+		self._wakewr = None
+
+
+	def __finalize__(self):
+		self.__del__()
+
+
+	def __terminate(self):
+		"""Force termination of the pool"""
+		if not self.__active():
+			return
+
+		print('WARNING: terminating the workers pool ...')
+		for src in self._sources:
+			if hasattr(src, 'close'):
+				src.close()
+		del self._sources[:]
+		for job in itertools.chain((qjob[2] for qjob in self._jobs), self._pending, (djob[2] for djob in self._delayed)):
+			job.complete(False)
+			print('  Scheduled "{}" is removed'.format(job.name))
+		self._jobs.clear()
+		del self._pending[:]
+		del self._delayed[:]
+		while self._workers:
+			procs = self._workers.keys()
+			for proc in procs:
+				print('  Terminating "{}" #{} ...'.format(self._workers[proc].name, proc.pid), file=sys.stderr)
+				proc.terminate()
+			# Wait a few sec for the successful process termitaion before killing it
+			i = 0
+			active = True
+			while active and i < self._killCount:
+				active = False
+				for proc in procs:
+					if proc.poll() is None:
+						active = True
+						break
+				if active:
+					i += 1
+					time.sleep(self._latency)
+			# Kill nonterminated processes
+			if active:
+				for proc in procs:
+					if proc.poll() is None:
+						print('  Killing the worker #{} ...'.format(proc.pid), file=sys.stderr)
+						proc.kill()
+			# Tidy jobs
+			for job in self._workers.values():
+				self.__release(job)
+				if self._sampler:
+					self._sampler.close(job)
+				if self._trace:
+					self._trace.finished(job)
+				self.__drain(job)
+				if job._batch:
+					job._terminating = False
+					self.__finishBatch(job)
+				else:
+					job.complete(False)
+			self._workers.clear()
+		del self._deadlines[:]
+
+
+	def __slots(self, affinity):
+		"""Form the slots of the workers
+
+		affinity  - type of the slot: 'cpu' or 'core'
+
+		return  - list of the slots (cpus, node) of the length self._workersMax
+		"""
+		units = []  # Ranking key and the slot
+		ranks = {}  # Number of the cores ranked in each node
+		for node, package, core, cpus in cpuTopology():
+			rank = ranks.get(node, 0)
+			ranks[node] = rank + 1
+			if affinity == 'core':
+				units.append(((rank, node), (cpus, node)))
+			else:
+				# Hardware threads of each core are assigned only after the first threads of all cores
+				units.extend(((i, rank, node), ((cpu,), node)) for i, cpu in enumerate(cpus))
+		units.sort()
+		if DEBUG_TRACE:
+			print('Slots of the workers ({}): {}'.format(affinity, ', '.join(
+				str(unit[1][0]) for unit in units[:self._workersMax])), file=sys.stderr)
+		return [units[i % len(units)][1] for i in range(self._workersMax)]
+
+
+	def __allocate(self, job):
+		"""Allocate the free slots for the job preferring the slots of the same NUMA node
+
+		job  - the job to be started
+
+		return  - NUMA node of the allocated slots
+		"""
+		slot = heapq.heappop(self._freeSlots)
+		node = self._slots[slot][1]
+		job._slotids = [slot]
+		slotsnum = self.__slotsnum(job)
+		if slotsnum > 1:
+			# Take the free slots of the same node first in the order of their indexes
+			free = sorted(self._freeSlots, key=lambda slot: (self._slots[slot][1] != node, slot))
+			job._slotids.extend(free[:slotsnum - 1])
+			self._freeSlots = free[slotsnum - 1:]
+			heapq.heapify(self._freeSlots)
+		job._cpus = tuple(sorted(set(itertools.chain.from_iterable(self._slots[slot][0] for slot in job._slotids))))
+		return node
+
+
+	def __slotsnum(self, job):
+		"""Number of the worker slots occupied by the job"""
+		return max(min(job.slots, self._workersLim), 1)
+
+
+	def __busy(self, local=False):
+		"""Number of the worker slots occupied by the executing jobs
+
+		local  - count only the local worker slots excluding the slots of the agents
+		"""
+		busy = sum(self.__slotsnum(job) for job in self._workers.itervalues() if not job._agent)
+		if not local:
+			busy += sum(agent.busy for agent in self._agents)
+		return busy
+
+
+	def __capacity(self):
+		"""Number of the worker slots of the pool including the slots of the connected agents"""
+		return self._workersLim + sum(agent.slots for agent in self._agents)
+
+
+	def __agent(self, job):
+		"""Remote worker agent having the most free slots for the job
+
+		job  - the job to be executed
+
+		return  - the agent or None if the job can not be executed by any agent
+		"""
+		if not self._agents or not job.args or callable(job.args[0]):
+			return None
+		agents = [agent for agent in self._agents if agent.busy + max(min(job.slots, agent.slots), 1) <= agent.slots]
+		return max(agents, key=lambda agent: agent.slots - agent.busy) if agents else None
+
+
+	def __fits(self, job):
+		"""Whether the job fits the free local worker slots or the slots of the agents
+
+		job  - the job to be started
+		"""
+		return self.__busy(True) + self.__slotsnum(job) <= self._workersLim or self.__agent(job) is not None
+
+
+	def __release(self, job):
+		"""Release the slot of the job leaving the workers
+
+		job  - the executed job
+		"""
+		if job._slotids is not None:
+			for slot in job._slotids:
+				heapq.heappush(self._freeSlots, slot)
+			job._slotids = None
+			job._cpus = None
+
+
+	def __watch(self):
+		"""Wake up the execution cycle on the workers termination
+
+		SIGCHLD is intercepted and the self-pipe is written on it, so the completed
+		jobs are processed at once instead of the next polling of the workers.
+		NOTE: signals can be intercepted only in the main thread, otherwise the
+		workers are polled with self._latency.
+		"""
+		if self._waking:
+			return
+		try:
+			self._sigchld = signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+		except ValueError as err:  # Not the main thread
+			if DEBUG_TRACE:
+				print('SIGCHLD can not be intercepted, the workers are polled: {}'.format(err), file=sys.stderr)
+			return
+		# Restart interrupted system calls (file IO in the callbacks, etc.);
+		# the waiting is interrupted anyway by the wakeup fd
+		signal.siginterrupt(signal.SIGCHLD, False)
+		self._wakefd = signal.set_wakeup_fd(self._wakewr)
+		self._waking = True
+
+
+	def __unwatch(self):
+		"""Restore former handling of SIGCHLD"""
+		if not self._waking:
+			return
+		signal.set_wakeup_fd(self._wakefd)
+		signal.signal(signal.SIGCHLD, self._sigchld if self._sigchld is not None else signal.SIG_DFL)
+		self._sigchld = None
+		self._wakefd = -1
+		self._waking = False
+
+
+	def __wait(self, tlim=None):
+		"""Wait for the worker termination or the nearest job timeout
+
+		tlim  - max waiting time in sec, self._latency is used if omitted.
+			0 means capturing of the available output without waiting
+		"""
+		wait = self.timeout()
+		if wait is None or (tlim is not None and tlim < wait):
+			wait = max(tlim, 0) if tlim is not None else self._latency
+		# Capture the output of the workers while waiting
+		tlim = time.time() + wait
+		while True:
+			try:
+				ready = select.select(self.fds(), (), (), max(wait, 0))[0]
+			except select.error as err:
+				if err.args[0] != errno.EINTR:
+					raise
+				ready = ()
+			captured = False
+			completed = False  # A job executed by the agent is completed
+			agents = dict((agent.channel.fileno(), agent) for agent in self._agents if not agent.channel.closed)
+			for fd in ready:
+				if fd == self._status.fileno():
+					self._status.serve(self.stats)
+				elif fd in agents:
+					if agents[fd].receive():
+						completed = True
+					else:
+						captured = True
+				elif fd != self._wakerd:
+					self.__capture(fd)
+					captured = True
+			wait = tlim - time.time()
+			if completed or not captured or wait <= 0:
+				break
+		# Drain the self-pipe
+		try:
+			while os.read(self._wakerd, 512):
+				pass
+		except OSError as err:
+			if err.errno not in (errno.EAGAIN, errno.EWOULDBLOCK):
+				raise
+
+
+	def __capture(self, fd, block=False):
+		"""Capture the output of the worker pipe
+
+		fd  - file descriptor of the pipe
+		block  - read the pipe until EOF, otherwise only the available data
+
+		return  - whether the pipe is still open
+		"""
+		job, pipe, spool = self._pipes[fd]
+		while True:
+			try:
+				data = os.read(fd, 64 * 1024)
+			except OSError as err:
+				if err.errno in (errno.EAGAIN, errno.EWOULDBLOCK):
+					if not block:
+						return True
+					select.select((fd,), (), ())
+					continue
+				if err.errno == errno.EINTR:
+					continue
+				raise
+			if not data:
+				break
+			spool.write(data)
+			if not block:
+				return True
+		del self._pipes[fd]
+		pipe.close()
+		return False
+
+
+	def __drain(self, job, block=False):
+		"""Capture the remained output of the job and rewind it
+
+		job  - the job, which output is captured
+		block  - wait for the closing of the pipes by the job process, otherwise
+			read only the available data and close the pipes
+		"""
+		for fd in [fd for fd, (pjob, _, _) in self._pipes.iteritems() if pjob is job]:
+			pipe = self._pipes[fd][1]
+			# Note: the pipe can be held by the descendants of the completed job process
+			while self.__capture(fd, block) and not block:
+				try:
+					if not select.select((fd,), (), (), 0)[0]:
+						break
+				except select.error as err:
+					if err.args[0] != errno.EINTR:
+						raise
+			if fd in self._pipes:
+				del self._pipes[fd]
+				pipe.close()
+		for outp in (job.outp, job.errp):
+			if outp:
+				outp.seek(0)
+
+
+	def __prepare(self, job):
+		"""Prepare the job to be started, calling its onstart()
+
+		job  - the job to be started
+
+		return  - whether the job can be started
+		"""
+		if job._journal:
+			job._journal.log(job, 'started')
+		job._attempt += 1
+		job.tstart = time.time()
+		job.rusage = None
+		job.exectime = None
+		job.termcause = None
+		job._rss = 0
+		job._vmpeak = 0
+		job._vmdata = 0
+		job._forkrss = 0
+		job._hwm = 0
+		job._terminating = False
+		if job.onstart:
+			#print('Starting onstart() for job {}: {}'.format(job.name), file=sys.stderr)
+			try:
+				job.onstart()
+			except StandardError as err:
+				print('ERROR in onstart() callback of "{}": {}. {}'.format(
+					job.name, err, traceback.format_exc()), file=sys.stderr)
+				return False
+		return True
+
+
+	def __restore(self, job):
+		"""Complete the prepared job by its cached results if any
+
+		job  - the job to be started
+
+		return  - whether the job is completed from the cache
+		"""
+		job._cachekey = None
+		if not self._cache or not Cache.cacheable(job):
+			return False
+		try:
+			job._cachekey = self._cache.key(job)
+		except (IOError, OSError) as err:
+			print('WARNING, "{}" can not be identified in the cache: {}'.format(job.name, err), file=sys.stderr)
+			return False
+		if not self._cache.restore(job):
+			return False
+		if DEBUG_TRACE:
+			print('"{}" is restored from the cache'.format(job.name), file=sys.stderr)
+		# Note: the restored results are not cached again
+		job._cachekey = None
+		self.__complete(job)
+		return True
+
+
+	def __outputs(self, job):
+		"""Open the custom output channels of the job
+
+		job  - the job to be started
+
+		return
+			fstdout  - None or file object or PIPE for the output of the job process
+			fstderr  - None or file object or PIPE or STDOUT for the error output of the job process
+		"""
+		fstdout = None
+		fstderr = None
+		# Initialize fstdout, fstderr by the required output channel
+		for outcapt, joutp in (('stdout', job.stdout), ('stderr', job.stderr)):
+			if joutp and isinstance(joutp, str):
+				basedir = os.path.split(joutp)[0]
+				if basedir and not os.path.exists(basedir):
+					os.makedirs(basedir)
+				try:
+					if outcapt == 'stdout':
+						job._fstdout = open(joutp, 'a')
+						fstdout = job._fstdout
+					else:
+						job._fstderr = open(joutp, 'a')
+						fstderr = job._fstderr
+				except IOError as err:
+					print('ERROR on opening custom {} "{}" for "{}": {}. Default is used.'
+						.format(outcapt, joutp, job.name, err), file=sys.stderr)
+			elif outcapt == 'stdout':
+				fstdout = joutp
+			else:
+				fstderr = joutp
+		return fstdout, fstderr
+
+
+	def __startJob(self, job, async=True):
+		"""Start the specified job by one of workers
+
+		job  - the job to be executed, instance of Job
+		async  - async execution or wait intill execution completed
+		return  - 0 on successful execution, proc.returncode otherwise
+		"""
+		assert isinstance(job, Job), 'job type is invalid'
+		assert job.tstop is None, 'Only non-completed jobs should be started'
+		if async and not self.__fits(job):
+			raise AssertionError('Free workers must be available ({} busy workers of {})'
+				.format(self.__busy(), self.__capacity()))
+
+		if DEBUG_TRACE:
+			print('Starting "{}"{}...'.format(job.name, '' if async else ' in sync mode'), file=sys.stderr)
+		if not self.__prepare(job):
+			return -1
+		if self.__restore(job):
+			return 0
+		try:
+			fstdout, fstderr = self.__outputs(job)
+			if DEBUG_TRACE and (fstdout or fstderr):
+				print('"{}" output channels:\n\tstdout: {}\n\tstderr: {}'.format(job.name
+					, str(job.stdout), str(job.stderr)))
+			if(job.args):
+				args = job.args
+				# Bind the job to the cores of the free slots
+				pycall = callable(args[0])  # The job is executed in the forked pool process
+				# Execute the job by the remote agent when the local workers are occupied
+				job._agent = None
+				if async and self.__busy(True) + self.__slotsnum(job) > self._workersLim:
+					job._agent = self.__agent(job)
+				if async and self._slots and not job._agent:
+					node = self.__allocate(job)
+					# Note: the memory policy of the forked process is inherited from the pool
+					if self._numa and not pycall:
+						args = (_NUMACTL, '--preferred={}'.format(node)) + tuple(args)
+				# Limit the threads of the job by its slots
+				threads = str(self.__slotsnum(job))
+				job._forkrss = procRss(os.getpid())
+				if job._agent:
+					job.proc = _RemoteProc(job._agent, job, max(min(job.slots, job._agent.slots), 1), fstdout, fstderr)
+				elif pycall:
+					job.proc = _ForkProc(job, fstdout, fstderr, {'OMP_NUM_THREADS': threads}
+						, self.fds() + [self._wakewr])
+				else:
+					env = os.environ.copy()
+					env['OMP_NUM_THREADS'] = threads
+					#print('Opening proc with:\n\tjob.args: {},\n\tcwd: {}'.format(' '.join(job.args), job.workdir), file=sys.stderr)
+					job.proc = subprocess.Popen(args, bufsize=-1, cwd=job.workdir, stdout=fstdout, stderr=fstderr  # bufsize=-1 - use system default IO buffer size
+						, preexec_fn=job._preexec if job.vmemlim or job.datalim or job.cpulim or job._cpus else None, env=env)
+					# Note: Popen returns after the exec() of the process
+					job._hwm = procHwm(job.proc.pid)
+				# Capture the PIPE output
+				for pipe in (job.proc.stdout, job.proc.stderr):
+					if not pipe:
+						continue
+					spool = tempfile.SpooledTemporaryFile(_SPOOLSIZE)
+					if pipe is job.proc.stdout:
+						job.outp = spool
+					else:
+						job.errp = spool
+					fd = pipe.fileno()
+					fcntl.fcntl(fd, fcntl.F_SETFL, fcntl.fcntl(fd, fcntl.F_GETFL) | os.O_NONBLOCK)
+					self._pipes[fd] = (job, pipe, spool)
+				# Wait a little bit to start the process besides it's scheduling
+				if job.startdelay > 0:
+					time.sleep(job.startdelay)
+		except StandardError as err:  # Should not occur: subprocess.CalledProcessError
+			print('ERROR on "{}" execution occurred: {}, skipping the job. {}'.format(
+				job.name, err, traceback.format_exc()), file=sys.stderr)
+			self.__release(job)
+			# Note: process-associated file descriptors are closed in complete()
+			job.complete(False)
+		else:
+			if self._trace and job.proc:
+				self._trace.started(job)
+			if async:
+				self._workers[job.proc] = job
+				self._jobs.started(job, self.__slotsnum(job))
+				if job.timeout:
+					heapq.heappush(self._deadlines, (job.tstart + job.timeout, next(self._dlseq), job.proc, job))
+			else:
+				self.__drain(job, True)
+				_reap(job, True)
+				if self._trace:
+					self._trace.finished(job)
+				self.__complete(job, False)
+				return job.proc.returncode
+		return 0
+
+
+	def __batchable(self, job):
+		"""Whether the job can be executed by the batch worker
+
+		job  - the job to be executed
+		"""
+		return (self._batch >= 2 and job.batchkey is not None and bool(job.args)
+			and not callable(job.args[0]) and not job.ontimeout and job.attempts <= 1)
+
+
+	def __startBatch(self, job):
+		"""Start the job by the batch worker together with the queued jobs having the same batchkey
+
+		job  - the job to be executed, it is started by the ordinary worker if there are no
+			other batchable jobs in the queue
+		"""
+		jobs = [job]
+		queued = []  # Remained queued jobs
+		# Note: the batched jobs should fit the slots and memory reserved for the job
+		for qjob in self._jobs:
+			bjob = qjob[2]
+			if (len(jobs) < self._batch and bjob.batchkey == job.batchkey and self.__batchable(bjob)
+			and bjob.mem <= job.mem and self.__slotsnum(bjob) <= self.__slotsnum(job)):
+				jobs.append(bjob)
+			else:
+				queued.append(qjob)
+		if len(jobs) == 1:
+			self.__startJob(job)
+			return
+		self._jobs.retain(queued)
+
+		items = []  # Batched jobs with their output channels
+		for bjob in jobs:
+			if not self.__prepare(bjob):
+				bjob.complete(False)
+				continue
+			if self.__restore(bjob):
+				continue
+			try:
+				fstdout, fstderr = self.__outputs(bjob)
+				# Note: the PIPE output is written to the temporary files by the batch worker
+				if fstdout == PIPE:
+					bjob.outp = tempfile.TemporaryFile()
+					fstdout = bjob.outp
+				if fstderr == PIPE:
+					bjob.errp = tempfile.TemporaryFile()
+					fstderr = bjob.errp
+			except StandardError as err:
+				print('ERROR on "{}" execution occurred: {}, skipping the job. {}'.format(
+					bjob.name, err, traceback.format_exc()), file=sys.stderr)
+				bjob.complete(False)
+				continue
+			items.append((bjob, fstdout, fstderr))
+		if not items:
+			return
+		if DEBUG_TRACE:
+			print('Batching {} jobs: {}'.format(len(items), ', '.join(item[0].name for item in items)), file=sys.stderr)
+		grace = self._killCount * self._latency
+		timeout = 0
+		if all(item[0].timeout for item in items):
+			timeout = sum(item[0].timeout + grace for item in items)
+		resfd, wfd = os.pipe()
+		# Note: the batched job processes do not inherit the results pipe
+		fcntl.fcntl(wfd, fcntl.F_SETFD, fcntl.fcntl(wfd, fcntl.F_GETFD) | fcntl.FD_CLOEXEC)
+		fcntl.fcntl(resfd, fcntl.F_SETFL, fcntl.fcntl(resfd, fcntl.F_GETFL) | os.O_NONBLOCK)
+		batch = Job(name='{}+{}'.format(job.name, len(items) - 1), args=(_execBatch, items, wfd, grace)
+			, timeout=timeout, stdout=None, stderr=None, mem=job.mem, slots=job.slots, group=job.group)
+		batch._batch = [item[0] for item in items]
+		batch._results = _BatchResults()
+		# Note: the results pipe is registered before the forking to be closed in the batch worker
+		self._pipes[resfd] = (batch, os.fdopen(resfd, 'rb'), batch._results)
+		try:
+			self.__startJob(batch)
+		finally:
+			os.close(wfd)
+		if batch.tstop is not None:
+			# The batch worker is failed to be started
+			self.__drain(batch)
+			self.__finishBatch(batch)
+
+
+	def __batchResults(self, batch):
+		"""Complete the batched jobs having the reported results
+
+		batch  - the batch worker job
+		"""
+		results = batch._results.results
+		while results:
+			idx, pid, rcode, etime, rusage, termcause = results.pop(0)
+			job = batch._batch[idx]
+			job.proc = _DoneProc(pid, rcode)
+			job.exectime = etime
+			if pid:
+				job.rusage = rusage
+			for outp in (job.outp, job.errp):
+				if outp:
+					outp.seek(0)
+			if termcause == 'timeout':
+				self.__timedout(job)
+			elif termcause == 'error':
+				job.complete(False)
+			else:
+				self.__complete(job)
+
+
+	def __finishBatch(self, batch):
+		"""Complete the batch worker job and its batched jobs
+
+		batch  - the completed batch worker job
+		"""
+		self.__batchResults(batch)
+		for job in batch._batch:
+			if job.tstop is None:
+				if batch._terminating:
+					job.termcause = batch._canceled or 'timeout'
+				print('WARNING, "{}" is not executed by the terminated batch worker "{}"'
+					.format(job.name, batch.name), file=sys.stderr)
+				job.complete(False)
+		if batch.tstop is None:
+			batch.complete(not batch._terminating)
+
+
+	def __reviseWorkers(self):
+		"""Rewise the workers
+
+		Check for the comleted jobs and their timeous, update corresponding
+		workers and start the jobs if possible
+		"""
+		completed = []  # Completed workers
+		for proc, job in self._workers.items():
+			if _reap(job) is not None:
+				completed.append((proc, job))
+			elif job._batch:
+				self.__batchResults(job)
+		# Process completed jobs: execute callbacks and remove the workers
+		for proc, job in completed:
+			del self._workers[proc]
+			self._jobs.stopped(job, time.time())
+			self.__release(job)
+			if self._sampler:
+				self._sampler.close(job)
+			if self._trace:
+				self._trace.finished(job)
+			self.__drain(job)
+			if job._batch:
+				self.__finishBatch(job)
+			elif job._canceled:
+				self.__drop(job, job._canceled)
+			elif job._terminating:
+				self.__timedout(job)
+			else:
+				self.__complete(job)
+
+		# Terminate the jobs with expired timeouts asynchronously
+		while self._deadlines and self._deadlines[0][0] <= time.time():
+			deadline, _, proc, job = heapq.heappop(self._deadlines)
+			if self._workers.get(proc) is not job:
+				continue  # The job is already completed
+			if not job._terminating:
+				# Terminate the worker giving it a few latency cycles to complete before killing it
+				proc.terminate()
+				job._terminating = True
+				heapq.heappush(self._deadlines, (time.time() + self._killCount * self._latency
+					, next(self._dlseq), proc, job))
+			else:
+				# Kill the worker ignoring the termination, it is completed on the reaping
+				if DEBUG_TRACE:
+					print('Killing the worker #{} of "{}" ...'.format(proc.pid, job.name), file=sys.stderr)
+				proc.kill()
+
+		# Drop the jobs of the canceled and timed out tasks
+		expired = bool(self._canceled)
+		while self._taskdls and self._taskdls[0] <= time.time():
+			self._taskdlset.discard(heapq.heappop(self._taskdls))
+			expired = True
+		if expired:
+			self.__expire()
+
+		# Schedule the retries, fetch the lazily scheduled jobs and schedule the jobs having completed dependencies
+		while self._delayed and self._delayed[0][0] <= time.time():
+			job = heapq.heappop(self._delayed)[2]
+			self._jobs.push((-job.cost, next(self._jobseq), job))
+		if self._workersMin:
+			self.__adapt()
+		self.__pull()
+		self.__resolve()
+		# Start subsequent jobs, the most costly first, backfilling the jobs that fit the memory budget
+		for job in self._workers.itervalues():
+			if job._agent:
+				continue
+			if self._memlimit:
+				# Note: the process forked without the exec() shares the memory of the pool
+				job._rss = procRss(job.proc.pid)
+				if isinstance(job.proc, _ForkProc):
+					job._rss = max(job._rss - job._forkrss, 0)
+			if not job._batch and not isinstance(job.proc, _ForkProc):
+				job._hwm = max(job._hwm, procHwm(job.proc.pid))
+			if job.vmemlim or job.datalim:
+				vmpeak, vmdata = procVmPeak(job.proc.pid)
+				job._vmpeak = max(job._vmpeak, vmpeak)
+				job._vmdata = max(job._vmdata, vmdata)
+		skipped = []  # Queued jobs not fitting the free slots or the memory budget
+		busy = self.__busy()
+		now = time.time()
+		while self._jobs and busy < self.__capacity():
+			qjob = self._jobs.pop(now)
+			if not self.__fits(qjob[2]) or not self.__admissible(qjob[2]):
+				skipped.append(qjob)
+				continue
+			# Note: the batch worker is executed locally
+			if self.__batchable(qjob[2]) and self.__busy(True) + self.__slotsnum(qjob[2]) <= self._workersLim:
+				self.__startBatch(qjob[2])
+			else:
+				self.__startJob(qjob[2])
+			busy = self.__busy()
+		for qjob in skipped:
+			self._jobs.push(qjob, True)
+		if self._sampler and self._workers and time.time() >= self._sampler.tnext:
+			self._sampler.sample(job for job in self._workers.itervalues() if not job._agent)
+		if self._trace:
+			self._trace.counter(len(self._jobs) + len(self._pending), self.__busy())
+		self._status.update(self.stats)
+
+
+	def __adapt(self):
+		"""Adapt the limit of the workers to the load of the host
+
+		The workers are added one by one when the queued jobs exceed the free workers while the host has idle CPUs, low pressure of the resources and enough available memory.
+		The workers are reduced by a quarter on the memory or IO thrashing, the CPU overload or
+		the available memory running out. The executing jobs are not affected, the reduced
+		workers are released on their completion.
+		"""
+		now = time.time()
+		if now < self._tadapt:
+			return
+		self._tadapt = now + _ADAPTPERIOD
+		load = os.getloadavg()[0]
+		try:
+			with open('/proc/loadavg', 'r') as fload:
+				# Note: the instant number of the runnable tasks includes this process
+				runnable = int(fload.read().split()[3].split('/', 1)[0]) - 1
+		except (IOError, IndexError, ValueError):
+			runnable = load
+		cpu, mem, io = [procPressure(res) or (0, 0) for res in ('cpu', 'memory', 'io')]
+		memavail, memtotal = memAvailable() or (0, 0)
+		# Available memory expected by the next adaptation according to its trend
+		memexp = memavail
+		if memtotal and self._memavail:
+			memexp += min(memavail - self._memavail[1], 0) * _ADAPTPERIOD / max(now - self._memavail[0], 1)
+		self._memavail = (now, memavail)
+
+		limit = self._workersLim
+		busy = self.__busy(True)
+		cause = None  # Cause of the adaptation
+		if mem[1] >= _PSIMEMFULL:
+			cause = 'memory pressure {:.1f}%'.format(mem[1])
+		elif io[1] >= _PSIIOFULL:
+			cause = 'IO pressure {:.1f}%'.format(io[1])
+		elif memtotal and memexp < _MEMRESERVE * memtotal:
+			cause = 'available memory {:.0f} Mb'.format(memavail)
+		elif load > 1.5 * self._ncpus and runnable > self._ncpus:
+			cause = 'load {:.2f}'.format(load)
+		if cause:
+			limit = max(self._workersMin, limit - max(limit // 4, 1))
+		elif (busy + len(self._jobs) > limit and max(runnable, busy) < self._ncpus and load < self._ncpus
+		and cpu[0] < _PSICPUSOME and mem[0] < _PSIMEMSOME and io[0] < _PSIIOSOME
+		and (not memtotal or memexp >= _MEMSPARE * memtotal)):
+			cause = 'spare resources'
+			limit = min(self._workersMax, limit + 1)
+		if limit != self._workersLim:
+			print('The workers limit is {} from {} to {} by the {}'.format('reduced' if limit < self._workersLim
+				else 'increased', self._workersLim, limit, cause), file=sys.stderr)
+			self._workersLim = limit
+
+
+	def __timedout(self, job):
+		"""Complete the job, which process is terminated by the timeout, or restart it
+
+		job  - the terminated job
+		"""
+		print('WARNING, "{}" #{} is terminated by the timeout ({:.4f} sec): {:.4f} sec ({} h {} m {:.4f} s)'
+			.format(job.name, job.proc.pid, job.timeout, job.exectime, *secondsToHms(job.exectime)), file=sys.stderr)
+		# Restart the job if required unless its task is expired
+		expired = job.task.expired() if job.task else None
+		if job.ontimeout and not expired and (not job.attempts or job._attempt < job.attempts):
+			self.__startJob(job)
+		else:
+			job.termcause = expired or 'timeout'
+			if job.ontimeout and not expired:
+				self.__quarantine(job)
+			job.complete(False)
+
+
+	def __retry(self, job):
+		"""Schedule the failed job for the next attempt if its retry policy allows it
+
+		job  - the failed job
+
+		return  - whether the job is scheduled for the retry
+		"""
+		if job._attempt >= job.attempts or (job.retryon and job.proc.returncode not in job.retryon):
+			return False
+		delay = min(job.backoff * 2 ** (job._attempt - 1), _BACKOFFMAX)
+		print('WARNING, "{}" #{} is failed with the returncode {} on the attempt {} of {}, retrying in {:.1f} sec'
+			.format(job.name, job.proc.pid, job.proc.returncode, job._attempt, job.attempts, delay), file=sys.stderr)
+		if job._journal:
+			job._journal.log(job, 'retry')
+		heapq.heappush(self._delayed, (time.time() + delay, next(self._jobseq), job))
+		return True
+
+
+	def __quarantine(self, job):
+		"""Quarantine the job failed on all its attempts
+
+		job  - the failed job
+		"""
+		print('WARNING, "{}" is quarantined being failed ({}) on all its {} attempts'
+			.format(job.name, job.termcause or 'returncode {}'.format(job.proc.returncode), job._attempt), file=sys.stderr)
+		job.termcause = 'quarantined'
+
+
+	def __complete(self, job, retry=True):
+		"""Complete the job, which process is finished by itself or by its resources limits
+
+		job  - the job to be completed
+		retry  - retry the failed job according to its retry policy (see Job.attempts)
+		"""
+		job.termcause = job._limcause()
+		if not job.termcause:
+			rcode = job.proc.returncode
+			if job._cachekey and not rcode:
+				self._cache.store(job)
+			# Note: the jobs of the expired tasks are not retried
+			if rcode and retry and job.attempts > 1 and not (job.task and job.task.expired()):
+				if self.__retry(job):
+					return
+				if not job.retryon or rcode in job.retryon:
+					self.__quarantine(job)
+			job.complete()
+			return
+		print('WARNING, "{}" #{} is terminated by the {} limit: {:.4f} sec, RSS peak {:.3f} Mb, returncode {}'
+			.format(job.name, job.proc.pid, 'memory' if job.termcause == 'memout' else 'CPU'
+			, job.exectime or 0, job.rusage.ru_maxrss / 1024. if job.rusage else 0, job.proc.returncode), file=sys.stderr)
+		job.complete(False)
+
+
+	def __cancel(self, job, failed):
+		"""Cancel the job because of the failed dependency
+
+		job  - the job to be canceled
+		failed  - the failed dependency of the job
+		"""
+		print('WARNING, "{}" is canceled because of the failed dependency "{}"'
+			.format(job.name, failed.name), file=sys.stderr)
+		job.complete(False)
+
+
+	def __drop(self, job, cause):
+		"""Complete the job of the expired task without the execution or after the termination of its process
+
+		job  - the job to be dropped
+		cause  - expiration cause of the job task: 'canceled' or 'timeout'
+		"""
+		print('WARNING, "{}" is dropped, its task "{}" is {}'.format(job.name, job.task.name if job.task else ''
+			, 'canceled' if cause == 'canceled' else 'timed out'), file=sys.stderr)
+		job.termcause = cause
+		job.complete(False)
+
+
+	def __expire(self):
+		"""Drop the scheduled jobs and terminate the executing ones of the canceled and timed out tasks"""
+		self._canceled.clear()
+		def expired(job):
+			"""Expiration cause of the job task or None"""
+			return job.task.expired() if job.task else None
+
+		for jobs, item in ((self._jobs, lambda qjob: qjob[2]), (self._delayed, lambda djob: djob[2])
+		, (self._pending, lambda job: job)):
+			retained = []
+			for entry in list(jobs):
+				cause = expired(item(entry))
+				if cause:
+					self.__drop(item(entry), cause)
+				else:
+					retained.append(entry)
+			if len(retained) != len(jobs):
+				if jobs is self._jobs:
+					jobs.retain(retained)
+				else:
+					jobs[:] = retained
+					if jobs is not self._pending:
+						heapq.heapify(jobs)
+		# Terminate the workers giving them a few latency cycles to complete before killing them
+		for proc, job in self._workers.iteritems():
+			if job._terminating:
+				continue
+			if job._batch:
+				# Note: the batch worker is terminated only when all its remained jobs are expired
+				causes = [expired(bjob) for bjob in job._batch if bjob.tstop is None]
+				cause = causes[0] if causes and all(causes) else None
+			else:
+				cause = expired(job)
+			if cause:
+				proc.terminate()
+				job._terminating = True
+				job._canceled = cause
+				heapq.heappush(self._deadlines, (time.time() + self._killCount * self._latency
+					, next(self._dlseq), proc, job))
+
+
+	def __active(self):
+		"""Whether the pool has jobs to be executed"""
+		return bool(self._jobs or self._workers or self._pending or self._sources or self._delayed)
+
+
+	def __pull(self):
+		"""Fetch the jobs from the sources while the queue is shorter than the workers (or the batch)
+
+		On the fair-share scheduling the queue is extended (up to _FAIRPULL times) while all
+		the queued jobs belong to the groups occupying their share of the workers, so the jobs of
+		the fast groups are fetched ahead of the slow ones.
+		"""
+		window = max(self.__capacity(), self._batch)
+		fair = self._shares is not None
+		if fair:
+			queued = set(qjob[2].group for qjob in self._jobs)  # Groups of the queued jobs
+
+		def saturated():
+			"""Whether the groups of all the queued jobs occupy their shares of the workers"""
+			# Note: the fetched jobs can be started at once
+			occupied = {}  # Slots occupied by the groups
+			for job in self._workers.itervalues():
+				occupied[job.group] = occupied.get(job.group, 0) + self.__slotsnum(job)
+			# Note: the groups of the fetched jobs are retained to consider the groups which
+			# jobs are temporary absent in the queue
+			self._groups.update(queued, occupied)
+			weights = sum(self._shares.get(group, 1) for group in self._groups)
+			capacity = self.__capacity()
+			return all(occupied.get(group, 0) >= capacity * self._shares.get(group, 1) / float(weights)
+				for group in queued)
+
+		while self._sources and len(self._jobs) < (window * _FAIRPULL if fair else window):
+			if len(self._jobs) >= window and not saturated():
+				break
+			try:
+				job = next(self._sources[0])
+			except StopIteration:
+				self._sources.pop(0)
+				continue
+			except StandardError as err:
+				print('ERROR, the source of the jobs is interrupted by the exception: {}. {}'
+					.format(err, traceback.format_exc()), file=sys.stderr)
+				self._sources.pop(0)
+				continue
+			if job is not None:
+				self.execute(job)
+				if fair:
+					queued.add(job.group)
+			elif fair:
+				queued = set(qjob[2].group for qjob in self._jobs)
+
+
+	def __resolve(self):
+		"""Schedule the pending jobs having completed dependencies
+
+		The jobs dependent on the failed ones are canceled in cascade. The jobs having
+		dependencies which are not executed by the pool are canceled when nothing else
+		is executing.
+		"""
+		resolved = True
+		while resolved and self._pending:
+			resolved = False
+			pending = []
+			for job in self._pending:
+				ready, failed = _depsState(job)
+				if failed is not None:
+					self.__cancel(job, failed)
+					resolved = True
+				elif ready:
+					self._jobs.push((-job.cost, next(self._jobseq), job))
+					resolved = True
+				else:
+					pending.append(job)
+			self._pending = pending
+		if self._pending and not self._jobs and not self._workers and not self._sources and not self._delayed:
+			for job in self._pending:
+				print('ERROR, "{}" is canceled, its dependencies are not executed: {}'.format(job.name
+					, ', '.join(dep.name for dep in job.depends if dep.tstop is None)), file=sys.stderr)
+				job.complete(False)
+			self._pending = []
+
+
+	def __admissible(self, job):
+		"""Whether the job fits the memory budget of the pool
+
+		job  - the job to be started
+
+		return  - True if the job can be started
+		"""
+		# Note: the job is always admitted to the idle pool to not block the execution
+		if not self._memlimit or not self._workers:
+			return True
+		memused = sum(max(wjob.mem, wjob._rss) for wjob in self._workers.itervalues())
+		return memused + job.mem <= self._memlimit
+
+
+	def execute(self, job, async=True):
+		"""Schecule the job for the execution
+
+		job  - the job to be executed, instance of Job
+		async  - async execution or wait until execution completed
+		  NOTE: sync tasks are started at once
+		return  - 0 on successful execution, proc. returncode otherwise
+		"""
+		assert isinstance(job, Job), 'job type is invalid'
+		assert self.__busy(True) <= self._workersMax, 'Number of workers exceeds the limit'
+		assert job.name, "Job parameters must be defined"  #  and job.workdir and job.args
+
+		if DEBUG_TRACE:
+			print('Scheduling the job "{}" with timeout {}'.format(job.name, job.timeout))
+		if self._journal:
+			# Skip the job completed in the former execution
+			if self.resume and self._journal.completed(job):
+				if DEBUG_TRACE:
+					print('"{}" is skipped being completed in the former execution'.format(job.name), file=sys.stderr)
+				if job.task:
+					job.task = job.task.delJob(True)
+				job._succeeded = True
+				job.tstop = time.time()
+				return 0
+			job._journal = self._journal
+			self._journal.log(job, 'queued')
+		job._status = self._status
+		if job.task:
+			cause = job.task.expired()
+			if cause:
+				self.__drop(job, cause)
+				return -1
+			job.task._watch(self._canceled)
+			# Track the deadline of the task to drop its jobs on the timeout
+			deadline = job.task.deadline()
+			if deadline is not None and deadline not in self._taskdlset:
+				self._taskdlset.add(deadline)
+				heapq.heappush(self._taskdls, deadline)
+		if self._trace:
+			self._trace.queued(job)
+		# Hold the job until its dependencies are completed
+		if job.depends:
+			ready, failed = _depsState(job)
+			if failed is not None:
+				self.__cancel(job, failed)
+				return -1
+			if not ready:
+				assert async, 'Dependencies of the sync job should be completed'
+				if self._tstart is None:
+					self._tstart = time.time()
+				self._pending.append(job)
+				return 0
+		if async:
+			# Start the execution timer
+			if self._tstart is None:
+				self._tstart = time.time()
+			# Schedule the job, postpone it if already postponed jobs exist or no any free workers.
+			# The batchable jobs are postponed to be batched with the subsequently scheduled ones,
+			# all the jobs are postponed on the fair-share scheduling to be started by their groups
+			if (self._jobs or self._shares is not None or not self.__fits(job)
+			or not self.__admissible(job) or self.__batchable(job)):
+				self._jobs.push((-job.cost, next(self._jobseq), job))
+				#self.__reviseWorkers()  # Anyway the workers are revised if exist in the working cycle
+			else:
+				self.__startJob(job)
+		else:
+			return self.__startJob(job, False)
+		return  0
+
+
+
+	def stats(self):
+		"""Snapshot of the live metrics of the execution pool
+
+		return  - dict of the metrics:
+			time  - time of the snapshot
+			elapsed  - execution time of the pool in sec
+			workers  - max number of the worker slots
+			busy  - worker slots occupied by the executing jobs
+			utilization  - fraction of the occupied worker slots
+			avgutil  - average fraction of the occupied worker slots since the start
+			queued  - number of the jobs waiting for the free workers
+			delayed  - number of the failed jobs waiting for their retry
+			pending  - number of the jobs waiting for their dependencies
+			sources  - number of the lazy sources of the jobs being not exhausted (see feed())
+			running  - executing jobs: [{name, pid, elapsed, rss, timeout}, ...]
+				NOTE: the batch worker is represented by a single entry
+			succeeded, failed, timeouts  - number of the completed jobs by the outcome,
+				the timeouts are also counted as failed
+			rate  - completed jobs per hour
+			failratio  - fraction of the failed completed jobs
+			eta  - estimated remaining time in sec of the scheduled jobs or None if unknown.
+				NOTE: the jobs of the lazy sources are not accounted
+		"""
+		now = time.time()
+		elapsed = now - self._tstart if self._tstart is not None else 0
+		running = []
+		busytime = self._status.busytime
+		remained = len(self._jobs) + len(self._pending) + len(self._delayed)
+		for proc, job in self._workers.iteritems():
+			jelapsed = now - job.tstart if job.tstart is not None else 0
+			running.append({'name': job.name, 'pid': proc.pid, 'elapsed': round(jelapsed, 3)
+				, 'rss': round(procRss(proc.pid), 3) if not job._agent else 0, 'timeout': job.timeout})
+			busytime += jelapsed * self.__slotsnum(job)
+			remained += len(job._batch) if job._batch else 1
+		busy = self.__busy()
+		workers = self.__capacity()
+		completed = self._status.succeeded + self._status.failed
+		rate = completed / elapsed if elapsed else 0  # Completions per sec
+		return {'time': round(now, 3), 'elapsed': round(elapsed, 3), 'workers': workers, 'busy': busy
+			, 'utilization': round(float(busy) / workers, 4)
+			, 'avgutil': round(min(busytime / (elapsed * workers), 1), 4) if elapsed else 0
+			, 'queued': len(self._jobs), 'delayed': len(self._delayed), 'pending': len(self._pending)
+			, 'sources': len(self._sources)
+			, 'running': running, 'succeeded': self._status.succeeded, 'failed': self._status.failed
+			, 'timeouts': self._status.timeouts, 'rate': round(rate * 3600, 3)
+			, 'failratio': round(float(self._status.failed) / completed, 4) if completed else 0
+			, 'eta': round(remained / rate, 3) if rate else None}
+
+
+	def fds(self):
+		"""File descriptors of the execution pool to be watched by an external event loop
+
+		The pool should be processed (see process()) when any of them is ready for reading
+		or in timeout() sec.
+
+		return  - list of the file descriptors
+		"""
+		fds = [self._wakerd] + self._pipes.keys()
+		fds.extend(agent.channel.fileno() for agent in self._agents if not agent.channel.closed)
+		if self._status.fileno() is not None:
+			fds.append(self._status.fileno())
+		return fds
+
+
+	def timeout(self):
+		"""Max time to wait before the next processing of the execution pool
+
+		return  - time in sec till the nearest revision of the workers (the nearest job or task deadline,
+			retry, sampling of the jobs or the polling latency) or None if the pool has nothing to execute
+		"""
+		if not self.__active():
+			return None
+		wait = self._latency
+		if self._sampler and self._workers:
+			wait = min(wait, max(self._sampler.tnext - time.time(), 0))
+		if self._delayed:
+			wait = min(wait, max(self._delayed[0][0] - time.time(), 0))
+		if self._taskdls:
+			wait = min(wait, max(self._taskdls[0] - time.time(), 0))
+		# Consider the nearest job deadline skipping the outdated entries
+		while self._deadlines:
+			deadline, _, proc, job = self._deadlines[0]
+			if self._workers.get(proc) is not job:
+				heapq.heappop(self._deadlines)
+				continue
+			wait = min(wait, max(deadline - time.time(), 0))
+			break
+		return wait
+
+
+	def process(self):
+		"""Process the execution pool without blocking
+
+		Captures the available output of the workers, completes the finished jobs and
+		starts the queued ones. It is a step of the execution cycle to be called by an
+		external event loop on readiness of fds() or timeout() to execute the jobs
+		concurrently with other activities of the process, for example:
+			while pool.process():
+				try:
+					ready = select.select(pool.fds() + myfds, (), (), pool.timeout())[0]
+				except select.error:  # EINTR, interrupted by SIGCHLD of the completed worker
+					continue
+				...
+
+		return  - whether the pool has jobs to be executed
+		"""
+		if self._tstart is None:
+			return False
+		self.__watch()
+		self.__wait(0)
+		self.__reviseWorkers()
+		if self.__active():
+			return True
+		self.__unwatch()
+		self._status.update(self.stats, True)
+		self._tstart = None
+		return False
+
+
+	def wait(self, items, timeout=0):
+		"""Execute the pool until the specified jobs and tasks are completed
+
+		Other jobs of the pool are executed meanwhile and remain executing after the return.
+
+		items  - jobs and tasks to be waited for
+		timeout  - max waiting time in sec, 0 means infinity. The jobs are not terminated on the timeout
+
+		return  - True if all the items are completed, False on the timeout
+		"""
+		assert timeout >= 0, 'timeout valiadtion failed'
+		tlim = time.time() + timeout
+		self.__watch()
+		try:
+			self.__reviseWorkers()
+			while any(item.tstop is None for item in items):
+				if timeout and time.time() >= tlim:
+					return False
+				if not self.__active():
+					break  # The items are not executed by the pool
+				self.__wait(tlim - time.time() if timeout else None)
+				self.__reviseWorkers()
+		finally:
+			self.__unwatch()
+		if not self.__active():
+			self._tstart = None
+		return all(item.tstop is not None for item in items)
+
+
+	def feed(self, source):
+		"""Schedule the jobs of the source lazily for the async execution
+
+		The source is iterated only when the queue of the pool is shorter than the number
+		of workers (or the batch size), so the memory is bounded by the executing and a few
+		queued jobs instead of all the jobs.
+		NOTE: the jobs are started in the order of decreasing cost only within the queue
+
+		source  - iterable of the jobs to be executed. The iteration can also schedule the jobs
+			itself by execute() yielding None
+		"""
+		self._sources.append(iter(source))
+		# Start the execution timer
+		if self._tstart is None:
+			self._tstart = time.time()
+
+
+	def join(self, timeout=0):
+		"""Execution cycle
+
+		timeout  - execution timeout in seconds before the workers termination, >= 0.
+			0 means absebse of the timeout. The time is measured SINCE the first job
+			was scheduled UNTIL the completion of all scheduled jobs.
 		return  - True on graceful completion, Flase on termination by the specified timeout
 		"""
 		assert timeout >= 0, 'timeout valiadtion failed'
 		if self._tstart is None:
-			assert not self._jobs and not self._workers, \
+			assert not self.__active(), \
 				'Start time should be defined for the present jobs'
 			return
 
-		self.__reviseWorkers()
-		while self._jobs or self._workers:
-			if timeout and time.time() - self._tstart > timeout:
-				self.__terminate()
-				return False
-			time.sleep(self._latency)
+		self.__watch()
+		try:
 			self.__reviseWorkers()
+			while self.__active():
+				if timeout and time.time() - self._tstart > timeout:
+					self.__terminate()
+					return False
+				self.__wait(self._tstart + timeout - time.time() if timeout else None)
+				self.__reviseWorkers()
+		finally:
+			self.__unwatch()
+			self._status.update(self.stats, True)
 		self._tstart = None
 		return True
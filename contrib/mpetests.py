@@ -0,0 +1,765 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+\descr:  Tests of the Multi-Process Execution Pool (mpepool.py), a test case per feature of the pool,
+	including the doctests of the pool.
+	Executed from any directory: python contrib/mpetests.py
+
+\author: (c) Artem Lutov <artem@exascale.info>
+\organizations: eXascale Infolab <http://exascale.info/>, Lumais <http://www.lumais.com/>, ScienceWise <http://sciencewise.info/>
+\date: 2015-07
+"""
+
+from __future__ import print_function  # Required for stderr output, must be the first import
+import os
+import sys
+import time
+import json
+import signal
+import select
+import socket
+import subprocess
+import shutil
+import tempfile
+import unittest
+import doctest
+
+# Note: the pool is imported from the directory of the tests to be executed from any directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import mpepool
+from mpepool import ExecPool
+from mpepool import Job
+from mpepool import Task
+from mpepool import Tracer
+from mpepool import PIPE
+
+
+def _lines(path):
+	"""Number of the lines in the file, 0 if the file does not exist"""
+	try:
+		with open(path, 'r') as finp:
+			return sum(1 for ln in finp)
+	except IOError:
+		return 0
+
+
+class TestPool(unittest.TestCase):
+	"""Base of the pool tests executed in the temporary directory"""
+	def setUp(self):
+		self._cwd = os.getcwd()
+		self._tmpdir = tempfile.mkdtemp(prefix='mpetests_')
+		os.chdir(self._tmpdir)
+
+
+	def tearDown(self):
+		os.chdir(self._cwd)
+		shutil.rmtree(self._tmpdir)
+
+
+class TestWakeup(TestPool):
+	"""Wakeup of the execution cycle on the workers termination"""
+	def test_latency(self):
+		"""The subsequent jobs are started on the completion of the former ones without the polling latency"""
+		pool = ExecPool(1)
+		jobs = [Job('job{}'.format(i), args=('true',)) for i in range(5)]
+		tstart = time.time()
+		for job in jobs:
+			pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertTrue(all(job.proc.returncode == 0 for job in jobs))
+		# Note: the polling of the workers each second would take at least 4 sec
+		self.assertLess(time.time() - tstart, 2)
+
+
+class TestRcp(TestPool):
+	"""Resources consumption profile (.rcp) of the jobs"""
+	def test_profile(self):
+		"""The resources consumption of the completed jobs is appended to the profile,
+		the terminated jobs are commented out"""
+		pool = ExecPool(2)
+		done = Job('done', args=('sleep', '0.3'), rcpoutp='jobs.rcp', rcpname='net1')
+		killed = Job('killed', args=('sleep', '10'), timeout=0.3, rcpoutp='jobs.rcp', rcpname='net2')
+		for job in (done, killed):
+			pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertIsNotNone(done.rusage)
+		with open('jobs.rcp', 'r') as frcp:
+			rows = [ln.rstrip('\n').split('\t') for ln in frcp]
+		self.assertTrue(rows[0][0].startswith('# ExecTime'))
+		row = [row for row in rows if row[-1] == 'net1'][0]
+		self.assertEqual(len(row), 6)
+		self.assertTrue(0.3 <= float(row[0]) < 2, row)
+		row = [row for row in rows if row[-1] == 'net2'][0]
+		self.assertEqual(row[0], '# timeout')
+
+
+class TestAdmission(TestPool):
+	"""Admission of the jobs by the memory budget"""
+	@staticmethod
+	def __overlapped(mem):
+		"""Whether two jobs reserving the memory are executed concurrently by the pool having 100 Mb"""
+		pool = ExecPool(2, memlimit=100)
+		jobs = [Job('job{}'.format(i), args=('sleep', '0.3'), mem=mem) for i in range(2)]
+		for job in jobs:
+			pool.execute(job)
+		assert pool.join(10) and all(job.proc.returncode == 0 for job in jobs)
+		return max(job.tstart for job in jobs) < min(job.tstop for job in jobs)
+
+
+	def test_budget(self):
+		"""The jobs exceeding the memory budget together are executed one by one"""
+		self.assertFalse(self.__overlapped(80))
+		self.assertTrue(self.__overlapped(40))
+
+
+	def test_idle(self):
+		"""The job larger than the budget is executed by the idle pool"""
+		pool = ExecPool(2, memlimit=100)
+		job = Job('large', args=('true',), mem=200)
+		pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertEqual(job.proc.returncode, 0)
+
+
+class TestLimits(TestPool):
+	"""Memory and CPU limits of the jobs"""
+	def test_cpuout(self):
+		"""The job exceeding its CPU time limit is terminated with the cpuout cause"""
+		pool = ExecPool(1)
+		job = Job('spin', args=('sh', '-c', 'while :; do :; done'), cpulim=1, timeout=20)
+		tstart = time.time()
+		pool.execute(job)
+		self.assertTrue(pool.join(30))
+		self.assertLess(time.time() - tstart, 10)
+		self.assertNotEqual(job.proc.returncode, 0)
+		self.assertEqual(job.termcause, 'cpuout')
+
+
+	def test_memout(self):
+		"""The job failed on the allocation near its data segment limit is terminated with the memout cause"""
+		with open('alloc.py', 'w') as fscript:
+			fscript.write('\n'.join(('import time', 'chunks = []', 'try:', '	while True:'
+				, '		chunks.append(bytearray(8 * 1024 ** 2))', '		time.sleep(0.02)'
+				# Note: the memory is retained for a while to be observed by the pool
+				, 'except MemoryError:', '	time.sleep(1.5)', '	raise', '')))
+		pool = ExecPool(1)
+		job = Job('alloc', args=(sys.executable, 'alloc.py'), datalim=200, stderr=os.path.join(self._tmpdir, 'alloc.log'), timeout=20)
+		pool.execute(job)
+		self.assertTrue(pool.join(30))
+		self.assertNotEqual(job.proc.returncode, 0)
+		self.assertEqual(job.termcause, 'memout')
+
+
+class TestAffinity(TestPool):
+	"""Binding of the worker slots to the CPUs"""
+	def test_cpu(self):
+		"""Each job is bound to a single logical CPU available to the pool"""
+		pool = ExecPool(2, affinity='cpu')
+		for i in range(2):
+			pool.execute(Job('job{}'.format(i), args=('sh', '-c'
+				, 'grep Cpus_allowed_list /proc/self/status | cut -f 2 > cpus{}.txt'.format(i))))
+		self.assertTrue(pool.join(10))
+		cpus = [str(cpu) for cpu in mpepool.cpuAffinity()]
+		for i in range(2):
+			with open('cpus{}.txt'.format(i), 'r') as fcpus:
+				self.assertIn(fcpus.read().strip(), cpus)
+
+
+class TestCost(TestPool):
+	"""Ordering of the queued jobs by their cost"""
+	def test_order(self):
+		"""The most costly queued jobs are started first"""
+		pool = ExecPool(1)
+		pool.execute(Job('blocker', args=('sleep', '0.2')))
+		jobs = [Job('job{}'.format(cost), args=('true',), cost=cost) for cost in (1, 3, 2)]
+		for job in jobs:
+			pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertEqual([job.cost for job in sorted(jobs, key=lambda job: job.tstart)], [3, 2, 1])
+
+
+class TestJournal(TestPool):
+	"""Resumption of the interrupted execution by the journal"""
+	def __execute(self, resume, args=('sh', '-c', 'echo x >> runs.txt')):
+		"""Execute the job journaling its states
+
+		return  - the job
+		"""
+		pool = ExecPool(1, journal='jobs.jnl', resume=resume)
+		job = Job('job', args=args, inputs=('inp.txt',))
+		pool.execute(job)
+		# Note: join() returns None when all the jobs are skipped being completed in the former execution
+		self.assertIsNot(pool.join(10), False)
+		pool.__del__()  # Close the journal
+		return job
+
+
+	def test_resume(self):
+		"""The completed job is skipped on the resumed execution"""
+		with open('inp.txt', 'w') as finp:
+			finp.write('a\n')
+		self.__execute(False)
+		self.__execute(True)
+		self.assertEqual(_lines('runs.txt'), 1)
+		# Without the resumption the job is executed again
+		self.__execute(False)
+		self.assertEqual(_lines('runs.txt'), 2)
+
+
+	def test_changed(self):
+		"""The completed job is executed again on the resumed execution when its args or inputs are changed"""
+		with open('inp.txt', 'w') as finp:
+			finp.write('a\n')
+		self.__execute(False)
+		# Note: the modification time resolution of some file systems is a second
+		time.sleep(1)
+		with open('inp.txt', 'w') as finp:
+			finp.write('bb\n')
+		self.__execute(True)
+		self.assertEqual(_lines('runs.txt'), 2)
+		self.__execute(True, ('sh', '-c', 'echo y >> runs.txt'))
+		self.assertEqual(_lines('runs.txt'), 3)
+
+
+	def test_failed(self):
+		"""The failed job is executed again on the resumed execution"""
+		with open('inp.txt', 'w') as finp:
+			finp.write('a\n')
+		self.__execute(False, ('sh', '-c', 'echo x >> runs.txt; exit 1'))
+		self.__execute(True, ('sh', '-c', 'echo x >> runs.txt; exit 1'))
+		self.assertEqual(_lines('runs.txt'), 2)
+
+
+class TestTermination(TestPool):
+	"""Asynchronous termination of the timed out jobs"""
+	def test_async(self):
+		"""The job ignoring the termination is killed while other jobs are executed"""
+		pool = ExecPool(2)
+		stubborn = Job('stubborn', args=('sh', '-c', 'trap "" TERM; exec sleep 10'), timeout=0.5)
+		jobs = [Job('job{}'.format(i), args=('sleep', '0.5')) for i in range(3)]
+		tstart = time.time()
+		for job in [stubborn] + jobs:
+			pool.execute(job)
+		self.assertTrue(pool.join(20))
+		self.assertTrue(all(job.proc.returncode == 0 for job in jobs))
+		# Note: the stubborn job is killed a few latency cycles after its termination
+		self.assertLess(max(job.tstop for job in jobs) - tstart, 2.5)
+		self.assertLess(stubborn.tstop - tstart, 8)
+		self.assertEqual(stubborn.termcause, 'timeout')
+		self.assertEqual(stubborn.proc.returncode, -signal.SIGKILL)
+
+
+class TestDepends(TestPool):
+	"""Dependencies of the jobs"""
+	def test_chain(self):
+		"""The dependent job is started after the successful completion of its dependency"""
+		pool = ExecPool(2)
+		gen = Job('gen', args=('sh', '-c', 'sleep 0.2; echo x > net.txt'))
+		conv = Job('conv', args=('cp', 'net.txt', 'net.hig'), depends=(gen,))
+		pool.execute(conv)  # Note: the dependent job can be scheduled before its dependency
+		pool.execute(gen)
+		self.assertTrue(pool.join(10))
+		self.assertTrue(gen._succeeded and conv._succeeded)
+		self.assertTrue(os.path.exists('net.hig'))
+
+
+	def test_cancel(self):
+		"""The dependents of the failed job are canceled in cascade"""
+		pool = ExecPool(2)
+		failed = Job('failed', args=('false',))
+		dep = Job('dep', args=('touch', 'dep.txt'), depends=(failed,))
+		subdep = Job('subdep', args=('touch', 'subdep.txt'), depends=(dep,))
+		for job in (failed, dep, subdep):
+			pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertFalse(failed._succeeded or dep._succeeded or subdep._succeeded)
+		self.assertFalse(os.path.exists('dep.txt') or os.path.exists('subdep.txt'))
+		self.assertIsNone(dep.proc)
+
+
+class TestSlots(TestPool):
+	"""Jobs occupying multiple worker slots"""
+	@staticmethod
+	def __overlapped(slots):
+		"""Whether two jobs occupying the slots are executed concurrently by the pool having 4 slots"""
+		pool = ExecPool(4)
+		jobs = [Job('job{}'.format(i), args=('sleep', '0.3'), slots=slots[i]) for i in range(2)]
+		for job in jobs:
+			pool.execute(job)
+		assert pool.join(10) and all(job._succeeded for job in jobs)
+		return max(job.tstart for job in jobs) < min(job.tstop for job in jobs)
+
+
+	def test_slots(self):
+		"""The jobs exceeding the worker slots together are executed one by one"""
+		self.assertFalse(self.__overlapped((3, 2)))
+		self.assertTrue(self.__overlapped((2, 2)))
+
+
+	def test_threads(self):
+		"""The threads of the job are limited by its slots"""
+		pool = ExecPool(4)
+		pool.execute(Job('threads', args=('sh', '-c', 'echo $OMP_NUM_THREADS > threads.txt'), slots=3))
+		self.assertTrue(pool.join(10))
+		with open('threads.txt', 'r') as fthreads:
+			self.assertEqual(fthreads.read().strip(), '3')
+
+
+class TestSpool(TestPool):
+	"""Capturing of the PIPE output of the jobs"""
+	def test_large(self):
+		"""The output exceeding the pipe buffer and the in-memory spool is captured completely"""
+		sizes = []
+		pool = ExecPool(1)
+		pool.execute(Job('large', args=('head', '-c', '3000000', '/dev/zero'), stdout=PIPE
+			, ondone=lambda job: sizes.append(len(job.outp.read()))))
+		self.assertTrue(pool.join(10))
+		self.assertEqual(sizes, [3000000])
+
+
+def _touch(path, rcode=0):
+	"""Create the file recording the parent process and return the exit code"""
+	with open(path, 'w') as fout:
+		fout.write(str(os.getppid()))
+	return rcode
+
+
+def _fail():
+	"""Raise the exception"""
+	raise ValueError('failed')
+
+
+class TestFork(TestPool):
+	"""Python callable jobs executed in the processes forked from the pool"""
+	def test_callable(self):
+		"""The callable is executed by the process forked from the pool"""
+		pool = ExecPool(1)
+		job = Job('callable', args=(_touch, 'out.txt'))
+		pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertTrue(job._succeeded)
+		with open('out.txt', 'r') as fout:
+			self.assertEqual(fout.read(), str(os.getpid()))
+
+
+	def test_failure(self):
+		"""The exit code and the exception of the callable fail the job"""
+		pool = ExecPool(1)
+		jobs = (Job('rcode', args=(_touch, 'out.txt', 3)), Job('exception', args=(_fail,), stderr=os.devnull))
+		for job in jobs:
+			pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertFalse(any(job._succeeded for job in jobs))
+		self.assertEqual([job.proc.returncode for job in jobs], [3, 1])
+
+
+class TestBatch(TestPool):
+	"""Batching of the jobs having the same batch key"""
+	def test_batch(self):
+		"""The jobs having the same batch key are executed by a single batch worker"""
+		pool = ExecPool(1, batch=4)
+		jobs = [Job('job{}'.format(i), args=('sh', '-c', 'echo $PPID >> ppids.txt'), batchkey='key')
+			for i in range(4)]
+		for job in jobs:
+			pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertTrue(all(job._succeeded for job in jobs))
+		with open('ppids.txt', 'r') as fppids:
+			ppids = set(ln.strip() for ln in fppids)
+		self.assertEqual(len(ppids), 1)
+		self.assertNotIn(str(os.getpid()), ppids)
+
+
+class TestCache(TestPool):
+	"""Results cache of the jobs"""
+	def __execute(self, name='job'):
+		"""Execute the job counting its executions
+
+		return  - the completed job
+		"""
+		pool = ExecPool(1, cache='cache')
+		job = Job(name, args=('sh', '-c', 'echo x >> runs.txt; cat inp.txt > out.txt'), inputs=('inp.txt',)
+			, outputs=('out.txt',))
+		pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertTrue(job._succeeded)
+		return job
+
+
+	def test_hit(self):
+		"""The cached results are restored instead of the execution"""
+		with open('inp.txt', 'w') as finp:
+			finp.write('a\n')
+		self.__execute()
+		os.remove('out.txt')
+		self.__execute()
+		self.assertEqual(_lines('runs.txt'), 1)
+		with open('out.txt', 'r') as fout:
+			self.assertEqual(fout.read(), 'a\n')
+
+
+	def test_invalidation(self):
+		"""The job is executed again when its inputs are changed"""
+		with open('inp.txt', 'w') as finp:
+			finp.write('a\n')
+		self.__execute()
+		with open('inp.txt', 'w') as finp:
+			finp.write('b\n')
+		self.__execute()
+		self.assertEqual(_lines('runs.txt'), 2)
+		with open('out.txt', 'r') as fout:
+			self.assertEqual(fout.read(), 'b\n')
+
+
+	def test_pipe(self):
+		"""The captured PIPE output is cached"""
+		outputs = []
+		for i in range(2):
+			pool = ExecPool(1, cache='cache')
+			pool.execute(Job('piped', args=('sh', '-c', 'echo x >> runs.txt; echo result'), stdout=PIPE
+				, ondone=lambda job: outputs.append(job.outp.read())))
+			self.assertTrue(pool.join(10))
+		self.assertEqual(_lines('runs.txt'), 1)
+		self.assertEqual(outputs, ['result\n'] * 2)
+
+
+class TestFrontend(TestPool):
+	"""Execution of the pool by the external event loop"""
+	def test_process(self):
+		"""The jobs are executed by the non-blocking processing on the readiness of the pool descriptors"""
+		pool = ExecPool(1)
+		jobs = [Job('job{}'.format(i), args=('sleep', '0.3')) for i in range(2)]
+		for job in jobs:
+			pool.execute(job)
+		tstart = time.time()
+		while True:
+			tproc = time.time()
+			active = pool.process()
+			self.assertLess(time.time() - tproc, 0.2)
+			if not active:
+				break
+			try:
+				select.select(pool.fds(), (), (), pool.timeout())
+			except select.error:  # Interrupted by SIGCHLD of the completed worker
+				pass
+		self.assertTrue(all(job._succeeded for job in jobs))
+		self.assertLess(time.time() - tstart, 2)
+		self.assertIsNone(pool.timeout())
+
+
+class TestFeed(TestPool):
+	"""Lazy scheduling of the jobs"""
+	def test_bounded(self):
+		"""The jobs are fetched from the source only when the queue is shorter than the workers"""
+		pool = ExecPool(1)
+		done = []  # Completed jobs
+		pending = []  # Number of the fetched and not completed jobs on each fetching
+
+		def source():
+			"""Source of the jobs"""
+			for i in range(20):
+				pending.append(i - len(done))
+				yield Job('job{}'.format(i), args=('true',), ondone=done.append)
+
+		pool.feed(source())
+		self.assertTrue(pool.join(20))
+		self.assertEqual(len(done), 20)
+		# Note: only the executing job is pending on the fetching
+		self.assertLessEqual(max(pending), 1)
+
+
+class TestStatus(TestPool):
+	"""Live metrics of the pool"""
+	def test_status(self):
+		"""The status file and the HTTP endpoint of the metrics are served during the execution"""
+		sock = socket.socket()
+		sock.bind(('127.0.0.1', 0))
+		port = sock.getsockname()[1]
+		sock.close()
+		pool = ExecPool(1, status='status.json', metrics=port)
+		metrics = []
+		job = Job('client', args=(sys.executable, '-c', 'import urllib2; print(urllib2.urlopen('
+			'"http://127.0.0.1:{}/metrics", timeout=5).read())'.format(port)), stdout=PIPE
+			, ondone=lambda job: metrics.append(job.outp.read()))
+		pool.execute(job)
+		self.assertTrue(pool.join(20))
+		self.assertTrue(job._succeeded)
+		self.assertIn('execpool_busy_workers 1', metrics[0])
+		self.assertIn('execpool_job_elapsed_seconds{job="client"', metrics[0])
+		with open('status.json', 'r') as fstatus:
+			status = json.load(fstatus)
+		self.assertEqual((status['succeeded'], status['queued'], status['running']), (1, 0, []))
+		pool.__del__()  # Close the endpoint
+
+
+class TestSampler(TestPool):
+	"""Sampling of the resources consumption time series of the jobs"""
+	def test_series(self):
+		"""The time series is written next to the log of the job"""
+		pool = ExecPool(1, sampling=0.1)
+		job = Job('job', args=('sleep', '0.6'), stderr='job.log')
+		pool.execute(job)
+		self.assertTrue(pool.join(10))
+		with open('job.rts', 'r') as frts:
+			rows = [ln.split('\t') for ln in frts if not ln.startswith('#')]
+		self.assertGreaterEqual(len(rows), 2)
+		self.assertTrue(all(len(row) == 7 for row in rows))
+
+
+class TestTracer(TestPool):
+	"""Timeline of the execution"""
+	def test_timeline(self):
+		"""The spans of the stages and the jobs are traced"""
+		tracer = Tracer('trace.json')
+		pool = ExecPool(2, trace=tracer)
+		with tracer.span('stage'):
+			for i in range(2):
+				pool.execute(Job('job{}'.format(i), args=('sleep', '0.2')))
+			self.assertTrue(pool.join(10))
+		tracer.close()
+		with open('trace.json', 'r') as ftrace:
+			events = json.load(ftrace)
+		spans = [(event['ph'], event['name'], event['tid']) for event in events if event['ph'] in 'BE']
+		self.assertEqual(spans[0], ('B', 'stage', 0))
+		self.assertEqual(spans[-1], ('E', 'stage', 0))
+		# Note: the concurrently executing jobs are traced on the distinct tracks
+		tracks = set(tid for phase, name, tid in spans if name.startswith('job'))
+		self.assertEqual(len(tracks), 2)
+		self.assertNotIn(0, tracks)
+
+
+class TestAdaptive(TestPool):
+	"""Adaptation of the workers limit to the load of the host"""
+	def setUp(self):
+		super(TestAdaptive, self).setUp()
+		self._pressure = mpepool.procPressure
+		# Note: the memory thrashing is simulated
+		mpepool.procPressure = lambda res: (50, 50) if res == 'memory' else (0, 0)
+
+
+	def tearDown(self):
+		mpepool.procPressure = self._pressure
+		super(TestAdaptive, self).tearDown()
+
+
+	def __adapt(self, workers):
+		"""Execute the job adapting the workers limit of the pool on the memory pressure
+
+		workers  - initial limit of the workers
+
+		return  - adapted limit of the workers
+		"""
+		pool = ExecPool(4, adaptive=1)
+		pool._workersLim = workers
+		pool._tadapt = 0  # Adapt on the first revision
+		pool.execute(Job('job', args=('true',)))
+		self.assertTrue(pool.join(10))
+		return pool.stats()['workers']
+
+
+	def test_reduce(self):
+		"""The workers are reduced on the memory pressure within the bounds"""
+		self.assertEqual(self.__adapt(4), 3)
+		self.assertEqual(self.__adapt(1), 1)
+
+
+class TestFairShare(TestPool):
+	"""Fair-share scheduling of the job groups"""
+	def __execute(self, workers):
+		"""Execute the jobs of two groups scheduled one group after another
+
+		Each started job should not bring its group ahead of the other one by more than a job
+		per worker in the consumed slot-seconds, while the FIFO order would start all the jobs
+		of the first group before the second one.
+
+		return  - groups of the jobs in the order of their starting
+		"""
+		pool = ExecPool(workers, shares={})
+		jobs = [Job('{}{}'.format(group, i), args=('sleep', '0.1'), group=group) for group in 'ab' for i in range(12)]
+		for job in jobs:
+			pool.execute(job)
+		self.assertTrue(pool.join(20))
+		self.assertTrue(all(job._succeeded for job in jobs))
+		jobs.sort(key=lambda job: job.tstart)
+		margin = workers * 1.5 * max(job.tstop - job.tstart for job in jobs)
+		for job in jobs:
+			used = [sum(min(gjob.tstop, job.tstart) - gjob.tstart for gjob in jobs
+				if gjob.group == group and gjob.tstart < job.tstart) for group in 'ab']
+			self.assertLess(abs(used[0] - used[1]), margin, (job.name, used))
+		return [job.group for job in jobs]
+
+
+	def test_single(self):
+		"""The groups are interleaved by the single worker"""
+		groups = self.__execute(1)
+		self.assertEqual(groups[:2], ['a', 'b'])
+
+
+	def test_workers(self):
+		"""The groups share the workers evenly"""
+		groups = self.__execute(4)
+		self.assertEqual(groups[:4], ['a', 'b', 'a', 'b'])
+
+
+class TestRetry(TestPool):
+	"""Retries and quarantine of the failed jobs"""
+	def test_quarantine(self):
+		"""The job failed on all its attempts is quarantined"""
+		pool = ExecPool(1)
+		job = Job('failing', args=('sh', '-c', 'echo x >> tries.txt; exit 3'), attempts=3, backoff=0.1)
+		pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertEqual(_lines('tries.txt'), 3)
+		self.assertEqual(job.termcause, 'quarantined')
+		self.assertFalse(job._succeeded)
+
+
+	def test_recover(self):
+		"""The job succeeded on the retry is completed successfully"""
+		pool = ExecPool(1)
+		job = Job('flaky', args=('sh', '-c', 'echo x >> tries.txt; test $(wc -l < tries.txt) -ge 2')
+			, attempts=3, backoff=0.1)
+		pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertEqual(_lines('tries.txt'), 2)
+		self.assertTrue(job._succeeded)
+		self.assertIsNone(job.termcause)
+
+
+	def test_retryon(self):
+		"""The job is retried only on the specified return codes"""
+		pool = ExecPool(1)
+		job = Job('failing', args=('sh', '-c', 'echo x >> tries.txt; exit 3'), attempts=3, backoff=0.1
+			, retryon=(4,))
+		pool.execute(job)
+		self.assertTrue(pool.join(10))
+		self.assertEqual(_lines('tries.txt'), 1)
+		self.assertNotEqual(job.termcause, 'quarantined')
+		self.assertFalse(job._succeeded)
+
+
+class TestTask(TestPool):
+	"""Timeouts and cancellation of the tasks"""
+	def test_timeout(self):
+		"""The jobs of the timed out task are terminated and the queued ones are dropped"""
+		pool = ExecPool(1)
+		task = Task('task', timeout=1)
+		running = Job('running', args=('sleep', '10'), task=task)
+		queued = Job('queued', args=('touch', 'queued.txt'), task=task)
+		tstart = time.time()
+		pool.execute(running)
+		pool.execute(queued)
+		self.assertTrue(pool.join(10))
+		self.assertLess(time.time() - tstart, 5)
+		self.assertFalse(running._succeeded or queued._succeeded)
+		self.assertEqual(queued.termcause, 'timeout')
+		self.assertFalse(os.path.exists('queued.txt'))
+		self.assertIsNotNone(task.tstop)
+
+
+	def test_cancel(self):
+		"""The queued jobs of the canceled task are dropped"""
+		pool = ExecPool(1)
+		task = Task('task')
+		first = Job('first', args=('sleep', '0.5'), task=task, ondone=lambda job: task.cancel())
+		second = Job('second', args=('touch', 'second.txt'), task=task)
+		pool.execute(first)
+		pool.execute(second)
+		self.assertTrue(pool.join(10))
+		self.assertTrue(first._succeeded)
+		self.assertEqual(second.termcause, 'canceled')
+		self.assertFalse(os.path.exists('second.txt'))
+
+
+	def test_supertask(self):
+		"""The queued jobs of the subtasks of the canceled task are dropped by the pools executing them"""
+		pools = (ExecPool(1), ExecPool(1))
+		task = Task('task')
+		subtasks = [Task('sub{}'.format(i), task=task) for i in range(2)]
+		first = Job('first', args=('sleep', '0.5'), task=subtasks[0], ondone=lambda job: task.cancel())
+		seconds = [Job('second{}'.format(i), args=('touch', 'second{}.txt'.format(i)), task=subtasks[i])
+			for i in range(2)]
+		pools[0].execute(first)
+		pools[0].execute(seconds[0])
+		pools[1].execute(Job('blocker', args=('sleep', '1')))
+		pools[1].execute(seconds[1])
+		self.assertTrue(pools[0].join(10))
+		self.assertTrue(pools[1].join(10))
+		self.assertEqual([job.termcause for job in seconds], ['canceled'] * 2)
+		self.assertFalse(os.path.exists('second0.txt') or os.path.exists('second1.txt'))
+
+
+class TestAgent(TestPool):
+	"""Execution of the jobs by the authenticated remote worker agents"""
+	def setUp(self):
+		super(TestAgent, self).setUp()
+		sock = socket.socket()
+		sock.bind(('127.0.0.1', 0))
+		self._port = sock.getsockname()[1]
+		sock.close()
+		with open('token.txt', 'w') as ftoken:
+			ftoken.write('secret\n')
+		self._agent = subprocess.Popen((sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__))
+			, 'mpeagent.py'), '-w=1', '-p={}'.format(self._port), '-k=token.txt'), stdout=open(os.devnull, 'w'))
+		# Wait for the listening of the agent
+		for i in range(50):
+			try:
+				socket.create_connection(('127.0.0.1', self._port), 1).close()
+				break
+			except socket.error:
+				time.sleep(0.1)
+
+
+	def tearDown(self):
+		self._agent.terminate()
+		self._agent.wait()
+		super(TestAgent, self).tearDown()
+
+
+	def test_remote(self):
+		"""The jobs are executed by the agent when the local workers are occupied"""
+		pool = ExecPool(1, agents=('127.0.0.1:{}'.format(self._port),), token='secret')
+		jobs = [Job('job{}'.format(i), args=('sh', '-c', 'sleep 0.3; touch job{}.txt'.format(i))) for i in range(2)]
+		for job in jobs:
+			pool.execute(job)
+		self.assertTrue(pool.join(20))
+		self.assertTrue(all(job._succeeded for job in jobs))
+		self.assertTrue(all(os.path.exists('job{}.txt'.format(i)) for i in range(2)))
+		self.assertEqual(len([job for job in jobs if job._agent]), 1)
+		pool.__del__()  # Disconnect the agent
+
+
+	def test_token(self):
+		"""The pool having the invalid token is rejected by the agent"""
+		pool = ExecPool(1, agents=('127.0.0.1:{}'.format(self._port),), token='invalid')
+		self.assertEqual(pool.stats()['workers'], 1)
+		self.assertFalse(pool._agents)
+
+
+	def test_unauthenticated(self):
+		"""The jobs of the unauthenticated peer are not executed"""
+		sock = socket.create_connection(('127.0.0.1', self._port), 5)
+		sock.settimeout(5)
+		sock.sendall(json.dumps({'op': 'start', 'id': 1, 'name': 'job', 'workdir': None
+			, 'args': ['touch', 'job.txt'], 'timeout': 0, 'slots': 1}) + '\n')
+		data = sock.recv(4096)
+		while data and not data.endswith('\n'):
+			data += sock.recv(4096)
+		# Note: only the challenge of the agent is received before the disconnection
+		self.assertEqual(json.loads(data)['op'], 'hello')
+		self.assertEqual(sock.recv(4096), '')
+		sock.close()
+		time.sleep(0.3)
+		self.assertFalse(os.path.exists('job.txt'))
+
+
+def load_tests(loader, tests, ignore):
+	"""Include the doctests of the pool"""
+	tests.addTests(doctest.DocTestSuite(mpepool))
+	return tests
+
+
+if __name__ == '__main__':
+	unittest.main()